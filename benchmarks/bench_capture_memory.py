@@ -0,0 +1,94 @@
+"""Memory held for buffered audio: legacy list capture vs float32 vs int16 buffers.
+
+For each recording length the script replays 20 ms blocks of synthetic
+16 kHz mono audio through three capture strategies and reports, via
+``tracemalloc`` (which sees NumPy's data allocations):
+
+* ``held``: memory retained for the recording when the user stops, and
+* ``peak``: the high-water mark up to and including the float32 hand-off
+  to ``ParakeetManager.transcribe``.
+
+Strategies:
+
+* ``list+concat``: the original ``AudioCapture``: one float32 copy per block
+  in a list, then ``np.concatenate`` at stop.
+* ``buffer-f32``: ``CaptureBuffer`` with float32 samples (zero-copy hand-off
+  within one 60 s chunk, one join beyond it).
+* ``buffer-i16``: ``CaptureBuffer`` with int16 samples, converted once with
+  ``pcm.to_float32`` at hand-off.
+
+Run with ``uv run python benchmarks/bench_capture_memory.py [--minutes 1 10 120]``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tracemalloc
+
+import numpy as np
+
+from chirp.audio_capture import CaptureBuffer
+from chirp.pcm import to_float32
+
+SAMPLE_RATE = 16_000
+BLOCK = SAMPLE_RATE // 50
+
+
+def _blocks(dtype: str):
+    block = np.zeros((BLOCK, 1), dtype=dtype)  # content does not affect allocation size
+    return block
+
+
+def _list_concat(frames: int) -> tuple[int, int]:
+    block = _blocks("float32")
+    chunks = []
+    for _ in range(frames // BLOCK):
+        chunks.append(block.copy())
+    held = tracemalloc.get_traced_memory()[0]
+    audio = np.concatenate(chunks, axis=0).reshape(-1)
+    chunks.clear()
+    to_float32(audio)
+    return held, tracemalloc.get_traced_memory()[1]
+
+
+def _buffer(frames: int, dtype: str) -> tuple[int, int]:
+    block = _blocks(dtype)
+    buffer = CaptureBuffer(channels=1, dtype=dtype, reserve_frames=frames, chunk_frames=60 * SAMPLE_RATE)
+    for _ in range(frames // BLOCK):
+        buffer.append(block)
+    held = tracemalloc.get_traced_memory()[0]
+    waveform = to_float32(buffer.view().reshape(-1))
+    del waveform
+    return held, tracemalloc.get_traced_memory()[1]
+
+
+def _measure(strategy, frames: int) -> tuple[int, int]:
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        held, peak = strategy(frames)
+        return held - baseline, peak - baseline
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, nargs="+", default=[1, 10, 120])
+    args = parser.parse_args()
+
+    strategies = {
+        "list+concat": _list_concat,
+        "buffer-f32": lambda frames: _buffer(frames, "float32"),
+        "buffer-i16": lambda frames: _buffer(frames, "int16"),
+    }
+    print(f"{'length':>8} {'strategy':>12} {'held MB':>9} {'peak MB':>9}")
+    for minutes in args.minutes:
+        frames = int(minutes * 60 * SAMPLE_RATE)
+        for name, strategy in strategies.items():
+            held, peak = _measure(strategy, frames)
+            print(f"{minutes:>6g} m {name:>12} {held / 2**20:>9.1f} {peak / 2**20:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
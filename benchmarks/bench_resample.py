@@ -0,0 +1,100 @@
+"""Throughput and CPU cost of converting native-rate capture to 16 kHz.
+
+The previous path asked PortAudio / the host API to deliver 16 kHz directly;
+that conversion happens inside the audio driver and cannot be timed from
+Python, and some devices simply refuse the rate. This benchmark compares
+Chirp's cached polyphase resampler with two in-process alternatives:
+
+* ``fir-gather``: the same filter bank, but each output sample gathers its
+  own input window (fancy indexing in chunks) instead of one strided
+  matrix-vector product per phase.
+* ``linear``: ``np.interp`` linear interpolation, the cheapest option, which
+  has no anti-aliasing filter.
+
+Run with ``uv run python benchmarks/bench_resample.py [--seconds 60]``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from math import gcd
+
+import numpy as np
+
+from numpy.lib.stride_tricks import sliding_window_view
+
+from chirp.resampler import HALF_WIDTH, filter_bank, resample
+
+TARGET_RATE = 16_000
+CHUNK = 32_768
+
+
+def _fir_gather(audio: np.ndarray, source_rate: int) -> np.ndarray:
+    divisor = gcd(source_rate, TARGET_RATE)
+    up, down = TARGET_RATE // divisor, source_rate // divisor
+    bank = filter_bank(up, down)
+    per_phase = bank.shape[1]
+    padded = np.zeros(audio.size + 2 * per_phase, dtype=np.float32)
+    padded[per_phase - 1 : per_phase - 1 + audio.size] = audio
+    windows = sliding_window_view(padded, per_phase)
+    count = -(-audio.size * up // down)
+    output = np.empty(count, dtype=np.float32)
+    for start in range(0, count, CHUNK):
+        position = np.arange(start, min(count, start + CHUNK)) * down + HALF_WIDTH * max(up, down)
+        bases, phases = np.divmod(position, up)
+        output[start : start + bases.size] = np.einsum("ij,ij->i", windows[bases], bank[phases])
+    return output
+
+
+def _linear(audio: np.ndarray, source_rate: int) -> np.ndarray:
+    count = -(-audio.size * TARGET_RATE // source_rate)
+    positions = np.arange(count) * (source_rate / TARGET_RATE)
+    return np.interp(positions, np.arange(audio.size), audio).astype(np.float32)
+
+
+def _alias_rms(method, source_rate: int) -> float:
+    t = np.arange(source_rate) / source_rate
+    tone = np.sin(2 * np.pi * 10_000 * t).astype(np.float32)  # above the 8 kHz output Nyquist
+    output = method(tone, source_rate)
+    return float(np.sqrt(np.mean(output[500:-500] ** 2)))
+
+
+def _time(method, audio: np.ndarray, source_rate: int, repeats: int) -> tuple[float, float]:
+    method(audio[:source_rate], source_rate)  # warm caches and the filter bank
+    wall = cpu = float("inf")
+    for _ in range(repeats):
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        method(audio, source_rate)
+        wall = min(wall, time.perf_counter() - start_wall)
+        cpu = min(cpu, time.process_time() - start_cpu)
+    return wall, cpu
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=60.0, help="Length of synthetic audio per run")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    methods = {
+        "polyphase": lambda audio, rate: resample(audio, rate, TARGET_RATE),
+        "fir-gather": _fir_gather,
+        "linear": _linear,
+    }
+
+    print(f"{'rate':>6} {'method':>11} {'wall ms':>9} {'cpu ms':>9} {'x realtime':>11} {'alias rms':>10}")
+    for rate in (44_100, 48_000):
+        audio = (0.1 * rng.standard_normal(int(args.seconds * rate))).astype(np.float32)
+        for name, method in methods.items():
+            wall, cpu = _time(method, audio, rate, args.repeats)
+            print(
+                f"{rate:>6} {name:>11} {wall * 1000:>9.1f} {cpu * 1000:>9.1f} "
+                f"{args.seconds / wall:>11.0f} {_alias_rms(method, rate):>10.2e}"
+            )
+    filter_bank.cache_clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any
+
+try:
+    import onnxruntime as ort
+except ImportError:  # pragma: no cover - optional dependency
+    ort = None  # type: ignore[assignment]
+
+SHRINK_RUN_ENTRY = "memory.enable_memory_arena_shrinkage"
+USE_ENV_ALLOCATORS = "session.use_env_allocators"
+# Sessions fed raw audio: the encoder, whose activations scale with utterance length.
+AUDIO_INPUT = "audio_signal"
+
+_register_lock = threading.Lock()
+_registered = False
+
+
+def register_shrinkable_arena(logger: logging.Logger) -> bool:
+    """Register a process-wide CPU arena that grows by exactly what is requested.
+
+    With the default power-of-two growth a long utterance leaves oversized
+    regions that shrinking cannot return; same-as-requested regions can be
+    released as soon as they are empty. Sessions opt in via USE_ENV_ALLOCATORS.
+    """
+    global _registered
+    with _register_lock:
+        if _registered:
+            return True
+        try:
+            memory_info = ort.OrtMemoryInfo("Cpu", ort.OrtAllocatorType.ORT_ARENA_ALLOCATOR, 0, ort.OrtMemType.DEFAULT)
+            ort.create_and_register_allocator(memory_info, ort.OrtArenaCfg({"arena_extend_strategy": 1}))
+        except Exception as exc:  # pragma: no cover - depends on the ORT build
+            logger.warning("Could not register a shrinkable CPU arena: %s", exc)
+            return False
+        _registered = True
+        return True
+
+
+class ShrinkingSession:
+    """InferenceSession proxy whose runs end by shrinking the CPU arena.
+
+    Only ``run`` changes; everything else is delegated to the wrapped session.
+    """
+
+    def __init__(self, session: Any) -> None:
+        self._session = session
+        self._run_options = ort.RunOptions()
+        self._run_options.add_run_config_entry(SHRINK_RUN_ENTRY, "cpu:0")
+
+    def run(self, output_names, input_feed, run_options=None):
+        return self._session.run(output_names, input_feed, run_options or self._run_options)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session, name)
+
+
+def install_arena_shrink(model: Any) -> int:
+    """Wrap the audio-input sessions of an onnx_asr model; returns how many were wrapped.
+
+    Per-token decoder sessions are left alone: their activations are small and
+    shrinking after every step would cost more than it frees.
+    """
+    wrapped = 0
+    asr = getattr(model, "asr", model)
+    for name, value in list(vars(asr).items()):
+        if isinstance(value, ort.InferenceSession) and AUDIO_INPUT in {i.name for i in value.get_inputs()}:
+            setattr(asr, name, ShrinkingSession(value))
+            wrapped += 1
+    return wrapped
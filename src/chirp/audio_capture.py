@@ -1,60 +1,518 @@
 from __future__ import annotations
 
+import bisect
+import queue
+import tempfile
 import threading
-from typing import Callable, Optional
+from typing import IO, Callable, List, Optional
 
 import numpy as np
 import sounddevice as sd
 
+from .pcm import full_scale, to_float32
+from .resampler import resample
+
+
+class CaptureBuffer:
+    """Frame buffer made of fixed-size chunks, so appending never moves captured audio.
+
+    The PortAudio callback is the only writer. It slice-assigns each block
+    into the current chunk, starts a new chunk once that one is full, and
+    then publishes the new length, so a reader that takes ``frames()``
+    always sees fully written frames without taking a lock. ``view()`` joins
+    the chunks once capture has stopped; a recording that fits in one chunk
+    comes back as a zero-copy view.
+
+    When ``spill_bytes`` is set and the chunks would grow past it, completed
+    chunks are handed to a writer thread that appends them to an anonymous
+    temporary file and replaces each with an ``np.memmap`` view of it, so the
+    callback never waits on the disk. ``view()`` then maps the whole file, so
+    views handed downstream are file-backed and resident memory stays bounded
+    by what the reader touches. If the disk fails, chunks simply stay in RAM.
+    Call ``view()`` or ``close()`` when done to stop the writer.
+    """
+
+    def __init__(
+        self,
+        *,
+        channels: int,
+        dtype: str,
+        reserve_frames: int,
+        chunk_frames: int,
+        spill_bytes: int = 0,
+        spill_dir: Optional[str] = None,
+    ) -> None:
+        self._channels = channels
+        self._dtype = np.dtype(dtype)
+        self._frame_bytes = channels * self._dtype.itemsize
+        self._chunk_frames = max(1, chunk_frames)
+        self._spill_bytes = spill_bytes
+        self._spill_dir = spill_dir
+        self._spill_file: Optional[IO[bytes]] = None
+        self._spilling = False
+        self._spill_failed = False
+        # Chunks handed to the writer, and chunks it has on disk; both grow in order.
+        self._queued = 0
+        self._written = 0
+        self._finished: Optional[np.ndarray] = None
+        self._writes: Optional[queue.SimpleQueue] = None
+        self._writer: Optional[threading.Thread] = None
+        if spill_bytes > 0:
+            # Started here rather than from the callback once the threshold is crossed.
+            self._writes = queue.SimpleQueue()
+            self._writer = threading.Thread(target=self._write_loop, name="CaptureSpill", daemon=True)
+            self._writer.start()
+        # Linux commits pages lazily, but Windows charges np.empty against the commit
+        # limit at once, so the first chunk is no bigger than the recording can get.
+        first = min(max(1, reserve_frames), self._chunk_frames)
+        self._chunks: List[np.ndarray] = [np.empty((first, channels), dtype=self._dtype)]
+        self._starts: List[int] = [0]
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def spilled(self) -> bool:
+        return self._spilling
+
+    def append(self, block: np.ndarray) -> None:
+        offset = 0
+        while offset < block.shape[0]:
+            chunk = self._chunks[-1]
+            used = self._length - self._starts[-1]
+            if used == chunk.shape[0]:
+                self._next_chunk()
+                continue
+            count = min(chunk.shape[0] - used, block.shape[0] - offset)
+            chunk[used : used + count] = block[offset : offset + count]
+            offset += count
+            self._length += count
+
+    def frames(self, start: int, end: int) -> np.ndarray:
+        """Frames ``start:end``: a view within one chunk, otherwise a copy of just that range."""
+        first = bisect.bisect_right(self._starts, start) - 1
+        pieces = []
+        for index in range(first, len(self._chunks)):
+            offset = self._starts[index]
+            if offset >= end and pieces:
+                break
+            pieces.append(self._chunks[index][max(0, start - offset) : max(0, end - offset)])
+        return pieces[0] if len(pieces) == 1 else np.concatenate(pieces)
+
+    def view(self, start: int = 0) -> np.ndarray:
+        """Frames from ``start`` to the end as one array; call once the last block is appended."""
+        self.close()
+        if self._finished is None and self._spill_file is not None and not self._spill_failed:
+            try:
+                self._finished = self._map_spill_file()
+            except OSError:
+                self._spill_failed = True
+        if self._finished is not None:
+            return self._finished[start:]
+        return self.frames(start, self._length)
+
+    def close(self) -> None:
+        """Wait for queued spill writes and stop the writer thread."""
+        if self._writer is None:
+            return
+        self._writes.put(None)
+        self._writer.join()
+        self._writer = None
+
+    def _next_chunk(self) -> None:
+        if self._writes is not None and (self._length + self._chunk_frames) * self._frame_bytes > self._spill_bytes:
+            self._spilling = True
+        self._starts.append(self._length)
+        self._chunks.append(np.empty((self._chunk_frames, self._channels), dtype=self._dtype))
+        if self._spilling:
+            # Only indices cross to the writer; the first spill queues every chunk so far at once.
+            while self._queued < len(self._chunks) - 1:
+                self._writes.put(self._queued)
+                self._queued += 1
+
+    def _write_loop(self) -> None:
+        while True:
+            index = self._writes.get()
+            if index is None:
+                return
+            if self._spill_failed:
+                continue
+            try:
+                self._spill_chunk(index)
+            except OSError:
+                # Later chunks would land at the wrong offset; keep them all in RAM instead.
+                self._spill_failed = True
+            else:
+                self._written = index + 1
+
+    def _spill_chunk(self, index: int) -> None:
+        chunk = self._chunks[index]
+        if self._spill_file is None:
+            # Unlinked on POSIX and delete-on-close on Windows: dictation audio
+            # never outlives the process, and only the owner can open it.
+            self._spill_file = tempfile.TemporaryFile(prefix="chirp-", suffix=".pcm", dir=self._spill_dir)
+        self._spill_file.write(chunk.data)
+        self._spill_file.flush()
+        # The file only ever grows by appending; each chunk is mapped once it is
+        # complete on disk, since resizing a mapped file is not reliable on Windows.
+        self._chunks[index] = np.memmap(
+            self._spill_file,
+            dtype=self._dtype,
+            mode="r+",
+            offset=self._starts[index] * self._frame_bytes,
+            shape=chunk.shape,
+        )
+
+    def _map_spill_file(self) -> np.ndarray:
+        for index in range(self._written, len(self._chunks)):
+            self._spill_file.write(self._chunks[index][: self._length - self._starts[index]].data)
+        self._spill_file.flush()
+        self._written = len(self._chunks)
+        return np.memmap(self._spill_file, dtype=self._dtype, mode="r+", shape=(self._length, self._channels))
+
+
+class PauseSegmenter:
+    """Cuts a recording into speech segments at pauses.
+
+    Fed one block at a time from the capture callback; when a run of quiet
+    blocks reaches ``pause_frames`` after some speech, the frames up to the
+    middle of that pause are handed to ``on_segment`` as a buffer view.
+    """
+
+    def __init__(
+        self,
+        *,
+        threshold: float,
+        pause_frames: int,
+        min_segment_frames: int,
+        on_segment: Callable[[np.ndarray], None],
+    ) -> None:
+        self._threshold = threshold
+        self._pause_frames = max(1, pause_frames)
+        self._min_segment_frames = min_segment_frames
+        self._on_segment = on_segment
+        self.segment_start = 0
+        self._silent_frames = 0
+        self._heard_speech = False
+
+    def feed(self, buffer: CaptureBuffer, frames: int, level: float) -> None:
+        if level >= self._threshold:
+            self._heard_speech = True
+            self._silent_frames = 0
+            return
+        self._silent_frames += frames
+        if not self._heard_speech or self._silent_frames < self._pause_frames:
+            return
+        cut = len(buffer) - self._silent_frames // 2
+        if cut - self.segment_start < self._min_segment_frames:
+            return
+        segment = buffer.frames(self.segment_start, cut)
+        self.segment_start = cut
+        self._heard_speech = False
+        self._on_segment(segment.reshape(-1) if segment.shape[1] == 1 else segment)
+
+
+class SilenceEndpointer:
+    """Signals once when speech is followed by ``silence_frames`` of quiet."""
+
+    def __init__(self, *, threshold: float, silence_frames: int, on_endpoint: Callable[[], None]) -> None:
+        self._threshold = threshold
+        self._silence_frames = max(1, silence_frames)
+        self._on_endpoint = on_endpoint
+        self._silent_frames = 0
+        self._heard_speech = False
+        self._fired = False
+
+    def feed(self, frames: int, level: float) -> None:
+        if self._fired:
+            return
+        if level >= self._threshold:
+            self._heard_speech = True
+            self._silent_frames = 0
+            return
+        self._silent_frames += frames
+        if self._heard_speech and self._silent_frames >= self._silence_frames:
+            self._fired = True
+            self._on_endpoint()
+
+
+class PreRollBuffer:
+    """Fixed-size circular buffer holding the most recent frames."""
+
+    def __init__(self, *, channels: int, dtype: str, frames: int) -> None:
+        self._data = np.zeros((max(1, frames), channels), dtype=dtype)
+        self._position = 0
+        self._filled = 0
+
+    def append(self, block: np.ndarray) -> None:
+        capacity = self._data.shape[0]
+        if block.shape[0] >= capacity:
+            self._data[:] = block[-capacity:]
+            self._position = 0
+            self._filled = capacity
+            return
+        end = self._position + block.shape[0]
+        if end <= capacity:
+            self._data[self._position : end] = block
+        else:
+            split = capacity - self._position
+            self._data[self._position :] = block[:split]
+            self._data[: end - capacity] = block[split:]
+        self._position = end % capacity
+        self._filled = min(capacity, self._filled + block.shape[0])
+
+    def clear(self) -> None:
+        self._position = 0
+        self._filled = 0
+
+    def snapshot(self) -> np.ndarray:
+        """Return the buffered frames in chronological order (a copy)."""
+        if self._filled < self._data.shape[0]:
+            return self._data[: self._filled].copy()
+        return np.concatenate((self._data[self._position :], self._data[: self._position]))
+
+
+class _Recording:
+    """Per-recording state fed from the capture callback."""
+
+    def __init__(
+        self,
+        buffer: CaptureBuffer,
+        segmenter: Optional[PauseSegmenter],
+        endpointer: Optional[SilenceEndpointer],
+    ) -> None:
+        self.buffer = buffer
+        self._segmenter = segmenter
+        self._endpointer = endpointer
+        self.closed = False
+
+    @property
+    def segmented_frames(self) -> int:
+        """Frames already handed out as segments."""
+        return self._segmenter.segment_start if self._segmenter is not None else 0
+
+    def feed(self, block: np.ndarray, frames: int) -> None:
+        if self.closed:
+            return
+        self.buffer.append(block)
+        if self._segmenter is None and self._endpointer is None:
+            return
+        level = block_rms(block)
+        if self._segmenter is not None:
+            self._segmenter.feed(self.buffer, frames, level)
+        if self._endpointer is not None:
+            self._endpointer.feed(frames, level)
+
+
+def block_rms(block: np.ndarray) -> float:
+    """RMS level of a block relative to full scale (0.0 to 1.0 for any dtype)."""
+    samples = block.reshape(-1)
+    if not samples.size:
+        return 0.0
+    energy = np.einsum("i,i->", samples, samples, dtype=np.float64)
+    return float(np.sqrt(energy / samples.size)) / full_scale(samples.dtype)
+
 
 class AudioCapture:
     def __init__(
         self,
         *,
-        sample_rate: int = 16_000,
+        sample_rate: Optional[int] = 16_000,
+        target_rate: int = 16_000,
         channels: int = 1,
         dtype: str = "float32",
+        reserve_seconds: float = 60.0,
+        silence_threshold: float = 0.01,
+        segment_pause: float = 0.0,
+        min_segment_seconds: float = 1.0,
+        segment_callback: Optional[Callable[[np.ndarray], None]] = None,
+        endpoint_silence: float = 0.0,
+        endpoint_callback: Optional[Callable[[], None]] = None,
+        warm: bool = False,
+        pre_roll_seconds: float = 0.3,
+        spill_bytes: int = 0,
+        spill_dir: Optional[str] = None,
         status_callback: Optional[Callable[[str], None]] = None,
     ) -> None:
-        self.sample_rate = sample_rate
+        # None captures at the input device's native rate; audio is resampled to
+        # target_rate in bulk at stop time. Streamed segments reach segment_callback
+        # as captured, on the callback thread: pass them through to_target_rate elsewhere.
+        self.sample_rate = sample_rate or self._native_sample_rate()
+        self.target_rate = target_rate
         self.channels = channels
         self.dtype = dtype
+        self._reserve_frames = int(max(1.0, reserve_seconds) * self.sample_rate)
+        self._chunk_frames = 60 * self.sample_rate
+        self._silence_threshold = silence_threshold
+        self._segment_pause = segment_pause
+        self._min_segment_seconds = min_segment_seconds
+        self._segment_callback = segment_callback
+        self._endpoint_silence = endpoint_silence
+        self._endpoint_callback = endpoint_callback
+        self._warm = warm
+        self._pre_roll_frames = int(max(0.0, pre_roll_seconds) * self.sample_rate)
+        self._spill_bytes = spill_bytes
+        self._spill_dir = spill_dir
         self._status_callback = status_callback
         self._stream: Optional[sd.InputStream] = None
-        self._frames: list[np.ndarray] = []
-        self._lock = threading.Lock()
+        self._recording: Optional[_Recording] = None
+        # Warm mode: the always-on stream fills the pre-roll until start() arms a
+        # recording, which the callback then picks up on its next block.
+        self._pre_roll: Optional[PreRollBuffer] = None
+        self._pending: Optional[_Recording] = None
+        self._handoff_lock = threading.Lock()
+
+    @staticmethod
+    def _native_sample_rate() -> int:
+        device = sd.query_devices(kind="input")
+        return int(device["default_samplerate"])
+
+    def open(self) -> None:
+        """Open the input stream ahead of time (warm mode only)."""
+        if not self._warm or self._stream is not None:
+            return
+        self._pre_roll = PreRollBuffer(channels=self.channels, dtype=self.dtype, frames=self._pre_roll_frames)
+        self._stream = self._open_stream(self._warm_callback)
+
+    def close(self) -> None:
+        if self._stream is None:
+            return
+        self._stream.stop()
+        self._stream.close()
+        self._stream = None
+        for recording in (self._recording, self._pending):
+            if recording is not None:
+                recording.buffer.close()
+        self._recording = None
+        self._pending = None
 
     def start(self) -> None:
+        if self._warm:
+            self.open()
+            if self._recording is None and self._pending is None:
+                self._pending = self._new_recording()
+            return
         if self._stream is not None:
             return
 
-        def _callback(indata: np.ndarray, _frames: int, _time, status) -> None:  # type: ignore[name-defined]
+        # A fresh recording per start: the previous buffer may still be referenced
+        # by the zero-copy view handed to the transcriber.
+        recording = self._new_recording()
+
+        def _callback(indata: np.ndarray, frames: int, _time, status) -> None:  # type: ignore[name-defined]
             if status and self._status_callback:
                 self._status_callback(str(status))
-            with self._lock:
-                self._frames.append(indata.copy())
+            recording.feed(indata, frames)
+
+        self._recording = recording
+        self._stream = self._open_stream(_callback)
 
-        self._frames.clear()
-        self._stream = sd.InputStream(
+    def _open_stream(self, callback) -> sd.InputStream:
+        stream = sd.InputStream(
             samplerate=self.sample_rate,
             channels=self.channels,
             dtype=self.dtype,
-            callback=_callback,
+            callback=callback,
         )
-        self._stream.start()
+        stream.start()
+        return stream
 
-    def stop(self) -> np.ndarray:
-        if self._stream is None:
-            return np.empty(0, dtype=self.dtype)
-        self._stream.stop()
-        self._stream.close()
-        self._stream = None
-        with self._lock:
-            if not self._frames:
-                return np.empty(0, dtype=self.dtype)
-            audio = np.concatenate(self._frames, axis=0)
-            self._frames.clear()
+    def _warm_callback(self, indata: np.ndarray, frames: int, _time, status) -> None:  # type: ignore[name-defined]
+        if status and self._status_callback:
+            self._status_callback(str(status))
+        # Held while feeding so stop() cannot detach the recording mid-block:
+        # every segment emitted from a block is covered by the tail boundary.
+        with self._handoff_lock:
+            if self._pending is not None:
+                self._arm_pending()
+            recording = self._recording
+            if recording is not None:
+                recording.feed(indata, frames)
+            elif self._pre_roll is not None:
+                self._pre_roll.append(indata)
+
+    def _arm_pending(self) -> None:
+        pending, self._pending = self._pending, None
+        if pending is None:
+            return
+        if self._pre_roll is not None:
+            pending.buffer.append(self._pre_roll.snapshot())
+        self._recording = pending
+
+    def _new_recording(self) -> _Recording:
+        return _Recording(
+            CaptureBuffer(
+                channels=self.channels,
+                dtype=self.dtype,
+                reserve_frames=self._reserve_frames + self._pre_roll_frames,
+                chunk_frames=self._chunk_frames,
+                spill_bytes=self._spill_bytes,
+                spill_dir=self._spill_dir,
+            ),
+            self._build_segmenter(),
+            self._build_endpointer(),
+        )
+
+    def _build_segmenter(self) -> Optional[PauseSegmenter]:
+        if self._segment_callback is None or self._segment_pause <= 0:
+            return None
+        return PauseSegmenter(
+            threshold=self._silence_threshold,
+            pause_frames=int(self._segment_pause * self.sample_rate),
+            min_segment_frames=int(self._min_segment_seconds * self.sample_rate),
+            on_segment=self._segment_callback,
+        )
+
+    def _build_endpointer(self) -> Optional[SilenceEndpointer]:
+        if self._endpoint_callback is None or self._endpoint_silence <= 0:
+            return None
+        return SilenceEndpointer(
+            threshold=self._silence_threshold,
+            silence_frames=int(self._endpoint_silence * self.sample_rate),
+            on_endpoint=self._endpoint_callback,
+        )
+
+    def to_target_rate(self, audio: np.ndarray) -> np.ndarray:
+        """Mono audio at ``target_rate``; float32 if it had to be resampled."""
         if self.channels == 1:
             audio = audio.reshape(-1)
-        return audio.astype(np.float32, copy=False)
+        if self.sample_rate != self.target_rate:
+            audio = to_float32(audio)
+            if audio.ndim > 1:
+                audio = audio.mean(axis=1)
+            return resample(audio, self.sample_rate, self.target_rate)
+        return audio
+
+    def stop(self, *, tail: bool = False) -> np.ndarray:
+        """Stop recording and return mono audio at ``target_rate``.
 
+        Samples keep the capture dtype (a zero-copy view) unless resampling was
+        needed, in which case they are float32; use ``pcm.to_float32`` before
+        inference. With ``tail=True`` only the audio after the last streamed
+        segment is returned (all of it if none was emitted); no further
+        segment is emitted for this recording once ``stop`` returns.
+        """
+        if self._warm:
+            with self._handoff_lock:
+                # A stop that lands before the callback picked up the recording
+                # still returns the pre-roll.
+                self._arm_pending()
+                recording, self._recording = self._recording, None
+                if self._pre_roll is not None:
+                    # Audio from before this recording must not leak into the next one.
+                    self._pre_roll.clear()
+        else:
+            if self._stream is None:
+                return np.empty(0, dtype=self.dtype)
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+            recording, self._recording = self._recording, None
+        if recording is None:
+            return np.empty(0, dtype=self.dtype)
+        recording.closed = True
+        audio = recording.buffer.view(recording.segmented_frames if tail else 0)
+        if not len(audio):
+            return np.empty(0, dtype=self.dtype)
+        return self.to_target_rate(audio)
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from .config_manager import ChirpConfig, ConfigManager
+from .long_audio import ChunkedTranscriber
+from .model_router import ACCURATE, FAST, ModelTier, TieredModelRouter
+from .parakeet_manager import DEFAULT_WARMUP_SECONDS, ParakeetManager
+from .stt_backend import SttBackend, SyntheticBackend
+from .unload_policy import IdleTimeoutPolicy, MemoryAwarePolicy, UnloadPolicy
+
+# factory(config, config_manager, logger) -> backend, loading in the background where it can.
+BackendFactory = Callable[[ChirpConfig, ConfigManager, logging.Logger], SttBackend]
+
+_BACKENDS: Dict[str, BackendFactory] = {}
+
+
+def register_backend(name: str, factory: BackendFactory) -> None:
+    """Make ``factory`` selectable with ``stt_backend = "<name>"``; a later registration replaces an earlier one."""
+    _BACKENDS[name.lower()] = factory
+
+
+def backend_names() -> List[str]:
+    return sorted(_BACKENDS)
+
+
+def create_backend(config: ChirpConfig, config_manager: ConfigManager, logger: logging.Logger) -> SttBackend:
+    """Build the backend named by ``config.stt_backend``.
+
+    Raises ValueError for an unknown name; engine errors such as
+    ModelNotPreparedError propagate unchanged.
+    """
+    factory = _BACKENDS.get(config.stt_backend)
+    if factory is None:
+        raise ValueError(
+            f"Unknown stt_backend {config.stt_backend!r}; available: {', '.join(backend_names())}"
+        )
+    logger.debug("Using %s speech-to-text backend", config.stt_backend)
+    return factory(config, config_manager, logger)
+
+
+def parakeet_options(config: ChirpConfig, model_dir) -> Dict[str, Any]:
+    """ParakeetManager keyword arguments (minus the logger) for this config."""
+    return {
+        "model_name": config.parakeet_model,
+        "quantization": config.parakeet_quantization,
+        "provider_key": config.onnx_providers,
+        "threads": config.threads,
+        "model_dir": model_dir,
+        "timeout": config.model_timeout,
+        "optimized_cache": config.optimized_model_cache,
+        "mmap_weights": config.mmap_weights,
+        "warmup_seconds": DEFAULT_WARMUP_SECONDS if config.model_warmup else (),
+        "shrink_arena": config.arena_shrink,
+    }
+
+
+def _unload_policy(config: ChirpConfig) -> UnloadPolicy:
+    if config.unload_policy == "adaptive":
+        return MemoryAwarePolicy(
+            timeout=config.model_timeout,
+            low_water=int(config.unload_low_memory_mb * 1024 * 1024),
+            high_water=int(config.unload_high_memory_mb * 1024 * 1024),
+        )
+    return IdleTimeoutPolicy(config.model_timeout)
+
+
+def _parakeet_backend(config: ChirpConfig, config_manager: ConfigManager, logger: logging.Logger) -> SttBackend:
+    """One ParakeetManager, or a router over two tiers when ``tiered_models`` is on."""
+    model_dir = config_manager.model_dir(config.parakeet_model, config.parakeet_quantization)
+    options = dict(parakeet_options(config, model_dir), unload_policy=_unload_policy(config))
+    if not config.tiered_models:
+        return ParakeetManager(logger=logger, background_load=True, **options)
+    tiers = [
+        ModelTier(name, quant or None, config_manager.model_dir(config.parakeet_model, quant or None))
+        for name, quant in ((FAST, config.fast_quantization), (ACCURATE, config.accurate_quantization))
+    ]
+    logger.info(
+        "Routing dictation up to %.1fs to %s and longer dictation to %s",
+        config.tier_threshold_seconds,
+        tiers[0].quantization or "full precision",
+        tiers[1].quantization or "full precision",
+    )
+    return TieredModelRouter(
+        tiers=tiers,
+        manager_options=options,
+        logger=logger,
+        threshold_seconds=config.tier_threshold_seconds,
+        latency_budget_ms=config.tier_latency_budget_ms,
+        max_resident=config.max_resident_models,
+    )
+
+
+def _synthetic_backend(config: ChirpConfig, config_manager: ConfigManager, logger: logging.Logger) -> SttBackend:
+    logger.info(
+        "Using the synthetic backend (%.0f ms + %.0f ms per second of audio); transcripts are placeholder text",
+        config.synthetic_latency_ms,
+        config.synthetic_ms_per_audio_second,
+    )
+    return SyntheticBackend(
+        latency_ms=config.synthetic_latency_ms,
+        ms_per_audio_second=config.synthetic_ms_per_audio_second,
+    )
+
+
+def long_audio_transcriber(
+    config: ChirpConfig, config_manager: ConfigManager, fallback: SttBackend, logger: logging.Logger
+) -> Optional[ChunkedTranscriber]:
+    """Chunked decoding for long recordings; its workers run ParakeetManager, so only that backend has it."""
+    if config.long_audio_threshold <= 0 or config.stt_backend != "parakeet":
+        return None
+    model_dir = config_manager.model_dir(config.parakeet_model, config.parakeet_quantization)
+    return ChunkedTranscriber(
+        manager_options=parakeet_options(config, model_dir),
+        fallback=fallback,
+        logger=logger,
+        workers=config.long_audio_workers,
+        chunk_seconds=config.long_audio_chunk,
+        overlap_seconds=config.long_audio_overlap,
+        threshold=config.silence_threshold,
+    )
+
+
+register_backend("parakeet", _parakeet_backend)
+register_backend("synthetic", _synthetic_backend)
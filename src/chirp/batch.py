@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import concurrent.futures
+import hashlib
+import json
+import logging
+import struct
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO, Tuple
+
+import numpy as np
+
+from .long_audio import merge_texts, plan_chunks
+from .parakeet_manager import ParakeetManager
+from .pcm import full_scale, to_float32
+from .resampler import resample
+from .workers import init_worker, resolve_workers, worker_manager
+
+TARGET_RATE = 16_000
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+# (format tag, bits per sample) -> little-endian sample dtype.
+_SAMPLE_DTYPES = {
+    (WAVE_FORMAT_PCM, 16): "<i2",
+    (WAVE_FORMAT_PCM, 32): "<i4",
+    (WAVE_FORMAT_IEEE_FLOAT, 32): "<f4",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class WavAudio:
+    samples: np.ndarray
+    sample_rate: int
+
+    @property
+    def duration(self) -> float:
+        return self.samples.shape[0] / self.sample_rate
+
+
+def read_wav(path: Path) -> WavAudio:
+    """Memory-map the sample data of a WAV file without reading it.
+
+    Only the RIFF headers are parsed; samples stay on disk and are paged in as
+    chunks are decoded. Returns ``(frames,)`` for mono, else ``(frames, channels)``.
+    """
+    with open(path, "rb") as handle:
+        riff, _, wave_id = struct.unpack("<4sI4s", handle.read(12))
+        if riff != b"RIFF" or wave_id != b"WAVE":
+            raise ValueError(f"{path} is not a RIFF/WAVE file")
+        fmt: Optional[Tuple[int, int, int, int]] = None
+        while True:
+            header = handle.read(8)
+            if len(header) < 8:
+                raise ValueError(f"{path} has no data chunk")
+            chunk_id, size = struct.unpack("<4sI", header)
+            if chunk_id == b"fmt ":
+                body = handle.read(size)
+                tag, channels, rate, _, _, bits = struct.unpack("<HHIIHH", body[:16])
+                if tag == WAVE_FORMAT_EXTENSIBLE and len(body) >= 26:
+                    tag = struct.unpack("<H", body[24:26])[0]
+                fmt = (tag, channels, rate, bits)
+            elif chunk_id == b"data":
+                offset = handle.tell()
+                break
+            else:
+                handle.seek(size, 1)
+            if size % 2:
+                handle.seek(1, 1)
+    if fmt is None:
+        raise ValueError(f"{path} has no fmt chunk before its data")
+    tag, channels, rate, bits = fmt
+    dtype = _SAMPLE_DTYPES.get((tag, bits))
+    if dtype is None:
+        raise ValueError(f"{path}: unsupported WAV encoding (format={tag}, bits={bits})")
+    frame_bytes = channels * np.dtype(dtype).itemsize
+    # Writers that stream their output may leave the data size at 0 or 0xFFFFFFFF.
+    available = (path.stat().st_size - offset) // frame_bytes
+    frames = min(size // frame_bytes, available) if 0 < size < 0xFFFFFFFF else available
+    if frames == 0:
+        return WavAudio(np.zeros(0, dtype=dtype), rate)
+    shape = (frames,) if channels == 1 else (frames, channels)
+    return WavAudio(np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape), rate)
+
+
+def file_sha256(path: Path) -> str:
+    with open(path, "rb") as handle:
+        return hashlib.file_digest(handle, "sha256").hexdigest()
+
+
+def collect_wav_files(paths: Iterable[str | Path]) -> List[Path]:
+    """Expand directories to the ``.wav`` files below them, sorted by path."""
+    files: List[Path] = []
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob("*") if p.is_file() and p.suffix.lower() == ".wav"))
+        else:
+            files.append(path)
+    return files
+
+
+def _mono(samples: np.ndarray) -> np.ndarray:
+    if samples.ndim == 1:
+        return samples
+    # Mixing down needs one float pass over the file; mono input stays mapped.
+    mixed = samples.mean(axis=1, dtype=np.float32)
+    mixed *= np.float32(1.0 / full_scale(samples.dtype))
+    return mixed
+
+
+def load_wav(path: Path) -> np.ndarray:
+    """Read a whole WAV file as mono float32 at 16 kHz (for short clips)."""
+    wav = read_wav(path)
+    audio = to_float32(_mono(wav.samples))
+    if wav.sample_rate != TARGET_RATE:
+        audio = resample(audio, wav.sample_rate, TARGET_RATE)
+    return np.array(audio, dtype=np.float32)
+
+
+def transcribe_wav(
+    manager: ParakeetManager,
+    path: Path,
+    *,
+    language: Optional[str] = None,
+    chunk_seconds: float = 30.0,
+    overlap_seconds: float = 1.0,
+    threshold: float = 0.01,
+) -> Tuple[str, float, float]:
+    """Decode one WAV file chunk by chunk; returns ``(text, duration, elapsed)``.
+
+    Each chunk is converted to float32 and resampled to 16 kHz only when it is
+    decoded, so memory stays bounded by the chunk size, not the file size.
+    """
+    started = time.perf_counter()
+    wav = read_wav(path)
+    samples = _mono(wav.samples)
+    chunks = plan_chunks(
+        samples,
+        sample_rate=wav.sample_rate,
+        chunk_seconds=chunk_seconds,
+        overlap_seconds=overlap_seconds,
+        threshold=threshold,
+    )
+    parts = []
+    for chunk in chunks:
+        audio = to_float32(samples[chunk.start : chunk.end])
+        if wav.sample_rate != TARGET_RATE:
+            audio = resample(audio, wav.sample_rate, TARGET_RATE)
+        text = manager.transcribe(audio, sample_rate=TARGET_RATE, language=language)
+        parts.append((text, chunk.overlaps_previous))
+    return merge_texts(parts), wav.duration, time.perf_counter() - started
+
+
+def _decode_file(path: Path, options: Dict[str, Any]) -> Tuple[str, float, float]:
+    return transcribe_wav(worker_manager(), path, **options)
+
+
+class BatchTranscriber:
+    """Transcribes WAV files across worker processes and writes JSONL records.
+
+    Files with identical content (by SHA-256) are decoded once; later copies
+    get the first copy's text and a ``duplicate_of`` field. Records are written
+    in input order as soon as each file and everything before it is done.
+    """
+
+    def __init__(
+        self,
+        *,
+        manager_options: Dict[str, Any],
+        post_process: Callable[[str], str],
+        logger: logging.Logger,
+        workers: int = 0,
+        language: Optional[str] = None,
+        chunk_seconds: float = 30.0,
+        overlap_seconds: float = 1.0,
+        threshold: float = 0.01,
+    ) -> None:
+        self._workers, threads = resolve_workers(workers)
+        # A single in-process manager keeps the configured thread count.
+        self._local_options = dict(manager_options, timeout=0, warmup_seconds=())
+        self._worker_options = dict(manager_options, threads=threads, timeout=0, warmup_seconds=())
+        self._post_process = post_process
+        self._logger = logger
+        self._decode_options = {
+            "language": language,
+            "chunk_seconds": chunk_seconds,
+            "overlap_seconds": overlap_seconds,
+            "threshold": threshold,
+        }
+
+    def run(self, paths: Iterable[str | Path], output: TextIO) -> Dict[str, float]:
+        files = collect_wav_files(paths)
+        jobs: List[Tuple[Path, Optional[str], Optional[Path]]] = []
+        first_seen: Dict[str, Path] = {}
+        for path in files:
+            try:
+                digest = file_sha256(path)
+            except OSError as exc:
+                self._logger.error("Cannot read %s: %s", path, exc)
+                jobs.append((path, None, None))
+                continue
+            jobs.append((path, digest, first_seen.get(digest)))
+            first_seen.setdefault(digest, path)
+        unique = len(first_seen)
+        workers = min(self._workers, unique) if unique > 1 else 1
+        self._logger.info("Transcribing %s file(s) (%s unique) on %s worker(s)", len(files), unique, workers)
+
+        started = time.perf_counter()
+        if workers == 1:
+            manager = ParakeetManager(logger=self._logger, **self._local_options)
+            results = self._emit(
+                jobs, lambda path: transcribe_wav(manager, path, **self._decode_options), output
+            )
+        else:
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=init_worker,
+                initargs=(self._worker_options,),
+            ) as pool:
+                # Submit every unique file up front; records are still emitted in input order.
+                futures = {
+                    path: pool.submit(_decode_file, path, self._decode_options)
+                    for path, digest, duplicate_of in jobs
+                    if digest is not None and duplicate_of is None
+                }
+                results = self._emit(jobs, lambda path: futures[path].result(), output)
+        wall = time.perf_counter() - started
+
+        audio_seconds, failed = results
+        summary = {
+            "files": len(files),
+            "unique": unique,
+            "failed": failed,
+            "audio_seconds": audio_seconds,
+            "wall_seconds": wall,
+            "rtf": wall / audio_seconds if audio_seconds else 0.0,
+        }
+        self._logger.info(
+            "Transcribed %.1fs of audio in %.1fs (RTF %.3f, %s failed)",
+            audio_seconds,
+            wall,
+            summary["rtf"],
+            failed,
+        )
+        return summary
+
+    def _emit(
+        self,
+        jobs: List[Tuple[Path, Optional[str], Optional[Path]]],
+        decode: Callable[[Path], Tuple[str, float, float]],
+        output: TextIO,
+    ) -> Tuple[float, int]:
+        done: Dict[Path, Dict[str, Any]] = {}
+        audio_seconds, failed = 0.0, 0
+        for path, digest, duplicate_of in jobs:
+            record: Dict[str, Any] = {"path": str(path), "sha256": digest}
+            if digest is None:
+                record["error"] = "unreadable"
+                failed += 1
+            elif duplicate_of is not None:
+                original = done[duplicate_of]
+                record.update(
+                    {key: original[key] for key in ("duration", "text", "error") if key in original},
+                    duplicate_of=str(duplicate_of),
+                )
+            else:
+                try:
+                    raw, duration, elapsed = decode(path)
+                except Exception as exc:
+                    # One bad file (or a crashed worker) must not cost the records after it.
+                    self._logger.error("Failed to transcribe %s: %s", path, exc)
+                    record["error"] = str(exc)
+                    failed += 1
+                else:
+                    audio_seconds += duration
+                    record.update(
+                        duration=round(duration, 3),
+                        text=self._post_process(raw),
+                        elapsed=round(elapsed, 3),
+                        rtf=round(elapsed / duration, 4) if duration else None,
+                    )
+                done[path] = record
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+        return audio_seconds, failed
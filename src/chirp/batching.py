@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# transcribe_batch(waveforms, sample_rate, language) -> one text per waveform
+BatchFn = Callable[[Sequence[np.ndarray], int, Optional[str]], List[str]]
+
+
+@dataclass(slots=True, eq=False)
+class _Request:
+    client: int
+    audio: np.ndarray
+    sample_rate: int
+    language: Optional[str]
+    arrived: float
+    future: concurrent.futures.Future = field(default_factory=concurrent.futures.Future)
+
+
+@dataclass(slots=True)
+class BatchStats:
+    batches: int = 0
+    requests: int = 0
+    over_budget: int = 0
+    largest: int = 0
+
+    @property
+    def mean_size(self) -> float:
+        return self.requests / self.batches if self.batches else 0.0
+
+
+class DynamicBatcher:
+    """Gathers requests from many clients into padded batches for one model.
+
+    A batch is dispatched when ``max_batch`` requests are waiting, when the
+    first of them has waited ``window_ms``, or sooner if waiting the full
+    window would push the oldest request past ``max_latency_ms``. Requests
+    are taken round-robin from per-client queues so one busy client cannot
+    starve the others; requests already over budget go first. Only requests
+    with the same sample rate and language share a batch, and a batch stops
+    growing once padding it to its longest clip would exceed
+    ``max_batch_seconds`` of audio.
+    """
+
+    def __init__(
+        self,
+        *,
+        transcribe_batch: BatchFn,
+        logger: logging.Logger,
+        window_ms: float = 15.0,
+        max_batch: int = 8,
+        max_latency_ms: float = 500.0,
+        max_batch_seconds: float = 120.0,
+    ) -> None:
+        self._transcribe_batch = transcribe_batch
+        self._logger = logger
+        self._window = window_ms / 1000
+        self._max_batch = max(1, max_batch)
+        self._budget = max_latency_ms / 1000
+        self._max_batch_seconds = max_batch_seconds
+        self._cond = threading.Condition()
+        self._queues: Dict[int, Deque[_Request]] = collections.OrderedDict()
+        self._closing = False
+        self.stats = BatchStats()
+        self._thread = threading.Thread(target=self._dispatch_loop, name="Batcher", daemon=True)
+        self._thread.start()
+
+    def submit(
+        self, client: int, audio: np.ndarray, *, sample_rate: int = 16_000, language: Optional[str] = None
+    ) -> concurrent.futures.Future:
+        request = _Request(client, audio, sample_rate, language, time.perf_counter())
+        with self._cond:
+            if self._closing:
+                raise RuntimeError("batcher is closed")
+            self._queues.setdefault(client, collections.deque()).append(request)
+            self._cond.notify()
+        return request.future
+
+    def close(self) -> None:
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join()
+        if self.stats.batches:
+            self._logger.debug(
+                "Batcher: %s request(s) in %s batch(es), mean size %.1f, largest %s, %s over the latency budget",
+                self.stats.requests,
+                self.stats.batches,
+                self.stats.mean_size,
+                self.stats.largest,
+                self.stats.over_budget,
+            )
+
+    def _pending(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _oldest(self) -> float:
+        return min(queue[0].arrived for queue in self._queues.values() if queue)
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending() and not self._closing:
+                    self._cond.wait()
+                if not self._pending():
+                    return
+                # Hold the window open for more requests, but never past the oldest one's budget.
+                first = self._oldest()
+                deadline = min(first + self._window, first + self._budget)
+                while self._pending() < self._max_batch and not self._closing:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._take_batch_locked(time.perf_counter())
+            self._run(batch)
+
+    def _take_batch_locked(self, now: float) -> List[_Request]:
+        queued = [request for queue in self._queues.values() for request in queue]
+        late = sorted((r for r in queued if now - r.arrived >= self._budget), key=lambda r: r.arrived)
+        # Round-robin: each client's oldest request, then each client's second, and so on.
+        fair = [
+            request
+            for round_ in itertools.zip_longest(*self._queues.values())
+            for request in round_
+            if request is not None and request not in late
+        ]
+        batch: List[_Request] = []
+        longest = 0
+        for request in late + fair:
+            if len(batch) == self._max_batch:
+                break
+            if batch and (request.sample_rate, request.language) != (batch[0].sample_rate, batch[0].language):
+                continue
+            padded = max(longest, request.audio.shape[0]) * (len(batch) + 1) / request.sample_rate
+            if batch and padded > self._max_batch_seconds:
+                continue
+            batch.append(request)
+            longest = max(longest, request.audio.shape[0])
+        for request in batch:
+            queue = self._queues[request.client]
+            queue.remove(request)
+            if not queue:
+                del self._queues[request.client]
+        # Rotate so the next batch starts with a different client.
+        if self._queues:
+            client, queue = next(iter(self._queues.items()))
+            del self._queues[client]
+            self._queues[client] = queue
+        self.stats.over_budget += len([r for r in batch if r in late])
+        return batch
+
+    def _run(self, batch: List[_Request]) -> None:
+        self.stats.batches += 1
+        self.stats.requests += len(batch)
+        self.stats.largest = max(self.stats.largest, len(batch))
+        started = time.perf_counter()
+        try:
+            texts = self._transcribe_batch([r.audio for r in batch], batch[0].sample_rate, batch[0].language)
+        except Exception as exc:
+            for request in batch:
+                request.future.set_exception(exc)
+            return
+        self._logger.debug(
+            "Decoded batch of %s from %s client(s) in %.0f ms",
+            len(batch),
+            len({r.client for r in batch}),
+            (time.perf_counter() - started) * 1000,
+        )
+        for request, text in zip(batch, texts):
+            request.future.set_result(text)
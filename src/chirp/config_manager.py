@@ -18,11 +18,27 @@ MAX_ALLOWED_DURATION = 7200.0  # 2 hours
 @dataclass(kw_only=True, slots=True)
 class ChirpConfig:
     primary_shortcut: str = "ctrl+shift"
+    cancel_shortcut: str = ""
     stt_backend: str = "parakeet"
     parakeet_model: str = "nemo-parakeet-tdt-0.6b-v3"
     parakeet_quantization: Optional[str] = None
+    tiered_models: bool = False
+    fast_quantization: str = "int8"
+    accurate_quantization: str = ""
+    tier_threshold_seconds: float = 8.0
+    tier_latency_budget_ms: float = 0.0
+    max_resident_models: int = 2
+    synthetic_latency_ms: float = 50.0
+    synthetic_ms_per_audio_second: float = 0.0
     onnx_providers: str = "cpu"
     threads: Optional[int] = None
+    optimized_model_cache: bool = True
+    mmap_weights: bool = False
+    use_daemon: bool = False
+    daemon_address: str = ""
+    daemon_batch_window_ms: float = 0.0
+    daemon_max_batch: int = 8
+    daemon_max_latency_ms: float = 500.0
     language: Optional[str] = None
     word_overrides: Dict[str, str] = field(default_factory=dict)
     post_processing: str = ""
@@ -30,12 +46,35 @@ class ChirpConfig:
     clipboard_behavior: bool = True
     clipboard_clear_delay: float = 0.75
     model_timeout: float = 300.0
+    model_warmup: bool = True
+    arena_shrink: bool = False
+    unload_policy: str = "idle"
+    unload_low_memory_mb: float = 1024.0
+    unload_high_memory_mb: float = 8192.0
     audio_feedback: bool = True
     audio_feedback_volume: float = 1.0
     start_sound_path: Optional[str] = None
     stop_sound_path: Optional[str] = None
     error_sound_path: Optional[str] = None
     max_recording_duration: float = 45.0
+    capture_sample_rate: int = 16_000
+    capture_dtype: str = "float32"
+    spill_threshold_mb: float = 256.0
+    silence_threshold: float = 0.01
+    vad_trim: bool = True
+    auto_stop_silence: float = 0.0
+    warm_stream: bool = False
+    pre_roll: float = 0.3
+    streaming_transcription: bool = False
+    segment_pause: float = 0.6
+    long_audio_threshold: float = 0.0
+    long_audio_workers: int = 0
+    long_audio_chunk: float = 30.0
+    long_audio_overlap: float = 1.0
+    max_queue_backlog: int = 3
+    queue_overflow: str = "merge"
+    latency_summary_interval: float = 300.0
+    latency_log_path: Optional[str] = None
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ChirpConfig":
@@ -47,8 +86,21 @@ class ChirpConfig:
 
         if "primary_shortcut" in merged:
             merged["primary_shortcut"] = str(merged["primary_shortcut"]).lower()
+        if "cancel_shortcut" in merged:
+            merged["cancel_shortcut"] = str(merged["cancel_shortcut"]).lower()
+        if "stt_backend" in merged:
+            merged["stt_backend"] = str(merged["stt_backend"]).lower()
+        for key in ("fast_quantization", "accurate_quantization"):
+            if key in merged:
+                merged[key] = str(merged[key]).lower()
+        if "queue_overflow" in merged:
+            merged["queue_overflow"] = str(merged["queue_overflow"]).lower()
         if "paste_mode" in merged:
             merged["paste_mode"] = str(merged["paste_mode"]).lower()
+        if "unload_policy" in merged:
+            merged["unload_policy"] = str(merged["unload_policy"]).lower()
+        if "capture_dtype" in merged:
+            merged["capture_dtype"] = str(merged["capture_dtype"]).lower()
         if "onnx_providers" in merged:
             merged["onnx_providers"] = str(merged["onnx_providers"]).lower()
 
@@ -81,9 +133,37 @@ class ChirpConfig:
                 f"paste_mode must be 'ctrl' or 'ctrl+shift', got {self.paste_mode!r}"
             )
 
+        if self.tiered_models:
+            if self.fast_quantization == self.accurate_quantization:
+                raise ValueError(
+                    "fast_quantization and accurate_quantization must differ when tiered_models is enabled, "
+                    f"got {self.fast_quantization!r} for both"
+                )
+            if self.tier_threshold_seconds <= 0:
+                raise ValueError(f"tier_threshold_seconds must be positive, got {self.tier_threshold_seconds}")
+            if self.tier_latency_budget_ms < 0:
+                raise ValueError(f"tier_latency_budget_ms must be non-negative, got {self.tier_latency_budget_ms}")
+            if self.max_resident_models < 1:
+                raise ValueError(f"max_resident_models must be at least 1, got {self.max_resident_models}")
+
+        for key in ("synthetic_latency_ms", "synthetic_ms_per_audio_second"):
+            if getattr(self, key) < 0:
+                raise ValueError(f"{key} must be non-negative, got {getattr(self, key)}")
+
         if self.model_timeout < 0:
             raise ValueError(f"model_timeout must be non-negative, got {self.model_timeout}")
 
+        if self.unload_policy not in ("idle", "adaptive"):
+            raise ValueError(
+                f"unload_policy must be 'idle' or 'adaptive', got {self.unload_policy!r}"
+            )
+
+        if not (0 <= self.unload_low_memory_mb < self.unload_high_memory_mb):
+            raise ValueError(
+                "unload_low_memory_mb must be non-negative and less than unload_high_memory_mb, "
+                f"got {self.unload_low_memory_mb} and {self.unload_high_memory_mb}"
+            )
+
         if self.max_recording_duration < 0:
             raise ValueError(
                 f"max_recording_duration must be non-negative, got {self.max_recording_duration}"
@@ -94,6 +174,80 @@ class ChirpConfig:
                 f"max_recording_duration must be <= {MAX_ALLOWED_DURATION}, got {self.max_recording_duration}"
             )
 
+        if self.capture_sample_rate and not (8_000 <= self.capture_sample_rate <= 192_000):
+            raise ValueError(
+                "capture_sample_rate must be 0 (device native) or between 8000 and 192000, "
+                f"got {self.capture_sample_rate}"
+            )
+
+        if self.capture_dtype not in ("float32", "int16"):
+            raise ValueError(
+                f"capture_dtype must be 'float32' or 'int16', got {self.capture_dtype!r}"
+            )
+
+        if self.spill_threshold_mb < 0:
+            raise ValueError(
+                f"spill_threshold_mb must be non-negative, got {self.spill_threshold_mb}"
+            )
+
+        if not (0.0 <= self.silence_threshold <= 1.0):
+            raise ValueError(
+                f"silence_threshold must be between 0.0 and 1.0, got {self.silence_threshold}"
+            )
+
+        if self.auto_stop_silence < 0:
+            raise ValueError(f"auto_stop_silence must be non-negative, got {self.auto_stop_silence}")
+
+        if not (0.0 <= self.pre_roll <= 5.0):
+            raise ValueError(f"pre_roll must be between 0.0 and 5.0 seconds, got {self.pre_roll}")
+
+        if self.segment_pause <= 0:
+            raise ValueError(f"segment_pause must be positive, got {self.segment_pause}")
+
+        if self.long_audio_threshold < 0:
+            raise ValueError(
+                f"long_audio_threshold must be non-negative, got {self.long_audio_threshold}"
+            )
+
+        if self.long_audio_workers < 0:
+            raise ValueError(f"long_audio_workers must be non-negative, got {self.long_audio_workers}")
+
+        if self.long_audio_chunk < 5:
+            raise ValueError(f"long_audio_chunk must be at least 5 seconds, got {self.long_audio_chunk}")
+
+        if not (0 <= self.long_audio_overlap < self.long_audio_chunk / 2):
+            raise ValueError(
+                "long_audio_overlap must be non-negative and less than half of long_audio_chunk, "
+                f"got {self.long_audio_overlap}"
+            )
+
+        if self.daemon_batch_window_ms < 0:
+            raise ValueError(f"daemon_batch_window_ms must be non-negative, got {self.daemon_batch_window_ms}")
+
+        if self.daemon_max_batch < 1:
+            raise ValueError(f"daemon_max_batch must be at least 1, got {self.daemon_max_batch}")
+
+        if self.daemon_max_latency_ms <= 0:
+            raise ValueError(f"daemon_max_latency_ms must be positive, got {self.daemon_max_latency_ms}")
+
+        if self.max_queue_backlog < 0:
+            raise ValueError(f"max_queue_backlog must be non-negative, got {self.max_queue_backlog}")
+
+        if self.queue_overflow not in ("merge", "drop"):
+            raise ValueError(
+                f"queue_overflow must be 'merge' or 'drop', got {self.queue_overflow!r}"
+            )
+
+        if self.latency_summary_interval < 0:
+            raise ValueError(
+                f"latency_summary_interval must be non-negative, got {self.latency_summary_interval}"
+            )
+
+        if self.latency_log_path:
+            path = Path(self.latency_log_path).expanduser()
+            if not path.parent.is_dir():
+                raise ValueError(f"latency_log_path directory does not exist: {path.parent}")
+
         if self.start_sound_path:
             path = Path(self.start_sound_path)
             if not path.is_file():
@@ -145,7 +299,9 @@ class ConfigManager:
         raise NotImplementedError("Saving config.toml is not supported; edit the file manually.")
 
     def model_dir(self, model_name: str, quantization: Optional[str]) -> Path:
-        suffix = "-int8" if (quantization or "").lower() == "int8" else ""
+        quant = (quantization or "").lower()
+        # Locally quantized variants (`chirp quantize`) get their own directory too.
+        suffix = f"-{quant}" if quant == "int8" or quant.startswith("local-") else ""
         safe = re.sub(r"[^A-Za-z0-9._-]+", "-", model_name.lower()).strip("-")
         # Collapse multiple dots to prevent path traversal
         safe = re.sub(r"\.+", ".", safe).strip(".")
@@ -0,0 +1,417 @@
+from __future__ import annotations
+
+import concurrent.futures
+import getpass
+import itertools
+import logging
+import os
+import secrets
+import stat
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+from multiprocessing.connection import Client, Connection, Listener
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .batching import DynamicBatcher
+from .stt_backend import SttBackend
+
+# Waveform dtypes accepted over shared memory (float32 capture and compact int16 capture).
+AUDIO_DTYPES = ("<f4", "<i2")
+
+
+def default_address() -> str:
+    """Per-user Unix socket (named pipe on Windows) used by ``chirp serve``."""
+    if sys.platform == "win32":
+        return rf"\\.\pipe\chirp-{getpass.getuser()}"
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return os.path.join(runtime, f"chirp-{os.getuid()}.sock")
+    # The temp directory is shared by every local user: use a private subdirectory.
+    return os.path.join(tempfile.gettempdir(), f"chirp-{os.getuid()}", "chirp.sock")
+
+
+def key_path(address: str) -> Path:
+    """File holding the connection secret; readable only by the user running the daemon."""
+    if sys.platform == "win32":
+        root = Path(os.environ.get("LOCALAPPDATA") or Path.home()) / "chirp"
+        return root / (address.rsplit("\\", 1)[-1] + ".key")
+    return Path(address + ".key")
+
+
+def _family(address: str) -> str:
+    return "AF_PIPE" if address.startswith("\\\\") else "AF_UNIX"
+
+
+def _check_owner(path: Path) -> os.stat_result:
+    """Refuse a path another local user could have planted (a fake key or socket)."""
+    info = os.lstat(path)
+    if sys.platform != "win32" and info.st_uid != os.getuid():
+        raise PermissionError(f"{path} is owned by another user; refusing to use it")
+    return info
+
+
+def _secure_directory(directory: Path) -> None:
+    """Create the socket directory private to this user, or check an existing one.
+
+    An existing directory must be ours and not writable by others, or a
+    sticky shared directory such as /tmp owned by root.
+    """
+    if not directory.exists():
+        directory.mkdir(mode=0o700, parents=True)
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode):
+        raise PermissionError(f"{directory} is not a directory")
+    if info.st_uid == os.getuid():
+        if info.st_mode & 0o022:
+            raise PermissionError(f"{directory} is writable by other users; use a private directory")
+    elif not (info.st_uid == 0 and info.st_mode & stat.S_ISVTX):
+        raise PermissionError(f"{directory} is owned by another user; refusing to use it")
+
+
+def _write_key(path: Path) -> bytes:
+    key = secrets.token_bytes(32)
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    if os.path.lexists(path):
+        _check_owner(path)
+        path.unlink()
+    # O_EXCL: never write the secret into a file (or symlink) someone else created.
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as handle:
+        handle.write(key)
+    return key
+
+
+def _read_key(address: str) -> bytes:
+    path = key_path(address)
+    _check_owner(path)
+    if _family(address) == "AF_UNIX":
+        _check_owner(Path(address))
+    return path.read_bytes()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Open a client's block without letting this process's resource tracker unlink it."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+    except TypeError:  # Python < 3.13 registers every attachment with the tracker
+        block = shared_memory.SharedMemory(name=name)
+        if os.name == "posix":
+            resource_tracker.unregister(block._name, "shared_memory")  # type: ignore[attr-defined]
+        return block
+
+
+class InferenceServer:
+    """Serves one ParakeetManager to Chirp clients over a local socket or named pipe.
+
+    Requests are small pickled dicts; the waveform itself stays in a shared
+    memory block owned by the client and is read in place. Decodes are
+    serialized so concurrent clients do not oversubscribe the ORT thread pool.
+    With ``batch_window_ms`` set, requests from different clients arriving
+    close together are decoded as one padded batch (see DynamicBatcher).
+    """
+
+    def __init__(
+        self,
+        *,
+        manager: Any,
+        logger: logging.Logger,
+        address: Optional[str] = None,
+        long_audio: Any = None,
+        long_audio_threshold: float = 0.0,
+        batch_window_ms: float = 0.0,
+        max_batch: int = 8,
+        max_latency_ms: float = 500.0,
+    ) -> None:
+        self._manager = manager
+        self._logger = logger
+        self.address = address or default_address()
+        self._long_audio = long_audio
+        self._long_audio_threshold = long_audio_threshold
+        self._decode_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._listener: Optional[Listener] = None
+        self._clients = itertools.count(1)
+        self._batcher: Optional[DynamicBatcher] = None
+        if batch_window_ms > 0:
+            self._batcher = DynamicBatcher(
+                transcribe_batch=self._decode_batch,
+                logger=logger,
+                window_ms=batch_window_ms,
+                max_batch=max_batch,
+                max_latency_ms=max_latency_ms,
+            )
+
+    def start(self) -> None:
+        if _family(self.address) == "AF_UNIX":
+            _secure_directory(Path(self.address).parent)
+        if _family(self.address) == "AF_UNIX" and os.path.lexists(self.address):
+            _check_owner(Path(self.address))
+            if DaemonClient.connect(self.address, logger=self._logger, quiet=True) is not None:
+                raise RuntimeError(f"A Chirp daemon is already listening on {self.address}")
+            os.unlink(self.address)  # left behind by a daemon that did not shut down cleanly
+        authkey = _write_key(key_path(self.address))
+        previous = os.umask(0o077)
+        try:
+            self._listener = Listener(self.address, family=_family(self.address), authkey=authkey)
+        finally:
+            os.umask(previous)
+        threading.Thread(target=self._accept_loop, name="DaemonAccept", daemon=True).start()
+        self._logger.info("Chirp daemon listening on %s", self.address)
+
+    def serve_forever(self) -> None:
+        self.start()
+        try:
+            # Wait in short steps so Ctrl+C is handled on every platform.
+            while not self._stop.wait(0.5):
+                pass
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+        if self._batcher is not None:
+            self._batcher.close()
+            self._batcher = None
+        key_path(self.address).unlink(missing_ok=True)
+
+    def _accept_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                conn = self._listener.accept()
+            except OSError:
+                return  # listener closed
+            except Exception as exc:  # AuthenticationError, broken handshakes
+                self._logger.warning("Rejected daemon connection: %s", exc)
+                continue
+            threading.Thread(target=self._serve_client, args=(conn,), name="DaemonClient", daemon=True).start()
+
+    def _serve_client(self, conn: Connection) -> None:
+        blocks: Dict[str, shared_memory.SharedMemory] = {}
+        client = next(self._clients)
+        self._logger.debug("Client %s connected", client)
+        try:
+            while True:
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    break
+                try:
+                    response = self.handle(request, blocks, client=client)
+                except Exception as exc:
+                    self._logger.exception("Daemon request failed: %s", exc)
+                    response = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+                conn.send(response)
+        finally:
+            for block in blocks.values():
+                block.close()
+            conn.close()
+            self._logger.debug("Client %s disconnected", client)
+
+    def handle(
+        self, request: Dict[str, Any], blocks: Dict[str, shared_memory.SharedMemory], *, client: int = 0
+    ) -> Dict[str, Any]:
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True, "ready": self._manager.ready, "pid": os.getpid()}
+        if op == "prefetch":
+            self._manager.prefetch()
+            return {"ok": True}
+        if op == "stats":
+            return {"ok": True, "stats": self._manager.stats()}
+        if op != "transcribe":
+            return {"ok": False, "error": f"unknown op {op!r}"}
+        if request["dtype"] not in AUDIO_DTYPES:
+            return {"ok": False, "error": f"unsupported dtype {request['dtype']!r}"}
+        if "audio" in request:
+            audio = np.frombuffer(request["audio"], dtype=request["dtype"])
+        else:
+            name = request["shm"]
+            if name not in blocks:
+                # Clients reuse one block until a longer recording needs a bigger one.
+                for old in blocks.values():
+                    old.close()
+                blocks.clear()
+                try:
+                    blocks[name] = _attach(name)
+                except OSError as exc:
+                    # Another user's or session's block: the client resends the samples inline.
+                    return {"ok": False, "error": f"cannot open shared memory: {exc}", "inline": True}
+            audio = np.ndarray((request["samples"],), dtype=request["dtype"], buffer=blocks[name].buf)
+        started = time.perf_counter()
+        try:
+            text = self._transcribe(audio, request.get("sample_rate", 16_000), request.get("language"), client)
+        finally:
+            del audio  # the block cannot be closed while a view is exported
+        return {"ok": True, "text": text, "seconds": time.perf_counter() - started}
+
+    def _transcribe(self, audio: np.ndarray, sample_rate: int, language: Optional[str], client: int) -> str:
+        if self._long_audio is not None and audio.shape[0] > self._long_audio_threshold * sample_rate:
+            with self._decode_lock:
+                return self._long_audio.transcribe(audio, sample_rate=sample_rate, language=language)
+        if self._batcher is not None:
+            return self._batcher.submit(client, audio, sample_rate=sample_rate, language=language).result()
+        with self._decode_lock:
+            return self._manager.transcribe(audio, sample_rate=sample_rate, language=language)
+
+    def _decode_batch(self, audios, sample_rate: int, language: Optional[str]):
+        with self._decode_lock:
+            if len(audios) == 1:
+                return [self._manager.transcribe(audios[0], sample_rate=sample_rate, language=language)]
+            return self._manager.transcribe_batch(audios, sample_rate=sample_rate, language=language)
+
+
+class DaemonClient(SttBackend):
+    """Backend for ChirpApp that forwards work to ``chirp serve`` and whatever backend it runs."""
+
+    name = "daemon"
+
+    def __init__(self, conn: Connection, *, address: str, authkey: bytes, logger: logging.Logger) -> None:
+        self._conn: Optional[Connection] = conn
+        self._address = address
+        self._authkey = authkey
+        self._logger = logger
+        self._lock = threading.Lock()
+        self._block: Optional[shared_memory.SharedMemory] = None
+        # Set once the daemon reports it cannot open our shared memory (e.g. it runs as another user).
+        self._inline = False
+
+    @classmethod
+    def connect(
+        cls, address: Optional[str] = None, *, logger: logging.Logger, quiet: bool = False
+    ) -> Optional["DaemonClient"]:
+        """Connect to a running daemon, or return None if none is listening."""
+        address = address or default_address()
+        try:
+            authkey = _read_key(address)
+            conn = Client(address, family=_family(address), authkey=authkey)
+        except PermissionError as exc:
+            logger.warning("Not connecting to the Chirp daemon: %s", exc)
+            return None
+        except (OSError, EOFError) as exc:
+            if not quiet:
+                logger.debug("No Chirp daemon at %s: %s", address, exc)
+            return None
+        return cls(conn, address=address, authkey=authkey, logger=logger)
+
+    @property
+    def ready(self) -> bool:
+        # The daemon loads its own model; waiting for it counts as recognition here,
+        # and asking would cost a round trip per recording.
+        return True
+
+    def load(self) -> concurrent.futures.Future:
+        """The daemon owns the model; report it ready once it answers."""
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        try:
+            self._request({"op": "ping"})
+        except Exception as exc:
+            future.set_exception(exc)
+        else:
+            future.set_result(self)
+        return future
+
+    def prefetch(self) -> None:
+        try:
+            self._request({"op": "prefetch"})
+        except Exception as exc:
+            self._logger.warning("Chirp daemon prefetch failed: %s", exc)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "address": self._address, "server": self._request({"op": "stats"})["stats"]}
+
+    def transcribe(self, audio: np.ndarray, *, sample_rate: int = 16_000, language: Optional[str] = None) -> str:
+        audio = np.ascontiguousarray(audio)
+        if audio.dtype.str not in AUDIO_DTYPES:
+            audio = audio.astype(np.float32)
+        with self._lock:
+            if not self._inline:
+                response = self._send_shared_locked(audio, sample_rate, language)
+                if response is not None:
+                    return self._finish(response, audio, sample_rate)
+                self._logger.info("Chirp daemon cannot read shared memory; sending audio inline")
+                self._inline = True
+            response = self._request_locked(
+                {
+                    "op": "transcribe",
+                    "audio": audio.tobytes(),
+                    "dtype": audio.dtype.str,
+                    "sample_rate": sample_rate,
+                    "language": language,
+                }
+            )
+        return self._finish(response, audio, sample_rate)
+
+    def _finish(self, response: Dict[str, Any], audio: np.ndarray, sample_rate: int) -> str:
+        self._logger.debug("Daemon decoded %.1fs of audio in %.2fs", audio.shape[0] / sample_rate, response["seconds"])
+        return response["text"]
+
+    def _send_shared_locked(
+        self, audio: np.ndarray, sample_rate: int, language: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Send via the shared block; None if the daemon could not open it."""
+        block = self._block
+        if block is None or block.size < audio.nbytes:
+            if block is not None:
+                block.close()
+                block.unlink()
+            # Grow in whole seconds of float32 audio so most recordings reuse the block.
+            size = max(audio.nbytes, -(-audio.nbytes // (4 * sample_rate)) * 4 * sample_rate, 1)
+            block = self._block = shared_memory.SharedMemory(create=True, size=size)
+        np.ndarray(audio.shape, dtype=audio.dtype, buffer=block.buf)[:] = audio
+        return self._request_locked(
+            {
+                "op": "transcribe",
+                "shm": block.name,
+                "samples": audio.shape[0],
+                "dtype": audio.dtype.str,
+                "sample_rate": sample_rate,
+                "language": language,
+            },
+            allow_inline=True,
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            if self._block is not None:
+                self._block.close()
+                self._block.unlink()
+                self._block = None
+
+    def _request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            return self._request_locked(request)
+
+    def _request_locked(self, request: Dict[str, Any], *, allow_inline: bool = False) -> Optional[Dict[str, Any]]:
+        for attempt in (1, 2):
+            try:
+                if self._conn is None:
+                    # A restarted daemon writes a new secret.
+                    self._authkey = _read_key(self._address)
+                    self._conn = Client(self._address, family=_family(self._address), authkey=self._authkey)
+                self._conn.send(request)
+                response = self._conn.recv()
+                break
+            except (OSError, EOFError) as exc:
+                if self._conn is not None:
+                    self._conn.close()
+                    self._conn = None
+                if attempt == 2:
+                    raise RuntimeError(f"Lost connection to the Chirp daemon at {self._address}: {exc}") from exc
+                self._logger.debug("Reconnecting to the Chirp daemon after: %s", exc)
+        if not response.get("ok"):
+            if allow_inline and response.get("inline"):
+                return None
+            raise RuntimeError(f"Chirp daemon error: {response.get('error')}")
+        return response
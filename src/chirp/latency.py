@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, TextIO
+
+# Summary order; stages missing from a dictation (e.g. model_load) are simply not recorded for it.
+STAGES = (
+    "start_hotkey",
+    "capture_start",
+    "stop_hotkey",
+    "capture_stop",
+    "queue_wait",
+    "model_load",
+    "recognize",
+    "post_process",
+    "clipboard",
+    "type",
+    "paste",
+    "stop_to_paste",
+)
+
+# HDR-style buckets: 2**SUB_BUCKET_BITS linear steps per power of two of microseconds,
+# so any recorded value is off by at most 1/128 (< 1%) whatever its magnitude.
+SUB_BUCKET_BITS = 7
+_SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+_HALF = _SUB_BUCKETS >> 1
+
+
+class Histogram:
+    """Log-linear latency histogram with bounded relative error and constant memory per magnitude."""
+
+    def __init__(self) -> None:
+        self._counts: Dict[int, int] = {}
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms: float) -> None:
+        index = self._index(max(0, int(ms * 1000)))
+        self._counts[index] = self._counts.get(index, 0) + 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Value in milliseconds at or below which ``q`` percent of recordings fall."""
+        if not self.count:
+            return 0.0
+        rank = max(1, -(-self.count * q // 100))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= rank:
+                return min(self._value(index), self.max_ms)
+        return self.max_ms
+
+    @staticmethod
+    def _index(us: int) -> int:
+        if us < _SUB_BUCKETS:
+            return us
+        shift = us.bit_length() - SUB_BUCKET_BITS
+        return _SUB_BUCKETS + (shift - 1) * _HALF + ((us >> shift) - _HALF)
+
+    @staticmethod
+    def _value(index: int) -> float:
+        """Upper edge of the bucket, in milliseconds."""
+        if index < _SUB_BUCKETS:
+            return index / 1000
+        shift, offset = divmod(index - _SUB_BUCKETS, _HALF)
+        shift += 1
+        return (((offset + _HALF) << shift) + (1 << shift) - 1) / 1000
+
+
+@dataclass(frozen=True, slots=True)
+class Span:
+    stage: str
+    start: float
+    end: float
+
+    @property
+    def ms(self) -> float:
+        return (self.end - self.start) * 1000
+
+
+class Trace:
+    """Stage timings (``perf_counter`` stamps) for one dictation, from the start hotkey to the paste."""
+
+    def __init__(self, tracker: "LatencyTracker", origin: float) -> None:
+        self._tracker = tracker
+        self.origin = origin
+        self.spans: List[Span] = []
+        self.stopped_at: Optional[float] = None
+
+    def add(self, stage: str, start: float, end: float) -> None:
+        self.spans.append(Span(stage, start, end))
+
+    @contextlib.contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, started, time.perf_counter())
+
+    def mark_stop(self, at: Optional[float] = None) -> None:
+        self.stopped_at = time.perf_counter() if at is None else at
+
+    def finish(self) -> None:
+        """The text was pasted: record this dictation. Unfinished traces are simply dropped."""
+        self._tracker.record(self, time.perf_counter())
+
+
+_active = threading.local()
+
+
+@contextlib.contextmanager
+def activate(*traces: Optional[Trace]) -> Iterator[None]:
+    """Make ``traces`` the targets of ``span()`` on this thread for the duration of the block.
+
+    Several traces are active at once when merged recordings are decoded and pasted together.
+    """
+    previous = getattr(_active, "traces", ())
+    _active.traces = tuple(trace for trace in traces if trace is not None)
+    try:
+        yield
+    finally:
+        _active.traces = previous
+
+
+@contextlib.contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Time the block into this thread's active traces; a no-op when there are none."""
+    traces = getattr(_active, "traces", ())
+    if not traces:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        ended = time.perf_counter()
+        for trace in traces:
+            trace.add(stage, started, ended)
+
+
+class LatencyTracker:
+    """Collects finished dictation traces into per-stage histograms.
+
+    Logs a p50/p95/p99 summary at most every ``summary_interval`` seconds
+    (checked as dictations finish, and once more on close) and, with
+    ``sink_path``, appends one JSON line per dictation with its spans.
+    No transcript text is recorded.
+    """
+
+    def __init__(
+        self,
+        *,
+        logger: logging.Logger,
+        summary_interval: float = 300.0,
+        sink_path: Optional[Path] = None,
+    ) -> None:
+        self._logger = logger
+        self._summary_interval = summary_interval
+        self._lock = threading.Lock()
+        self.histograms: Dict[str, Histogram] = {}
+        self.dictations = 0
+        self._unreported = 0
+        self._last_summary = time.monotonic()
+        self._sink: Optional[TextIO] = None
+        if sink_path is not None:
+            try:
+                self._sink = open(sink_path, "a", encoding="utf-8")
+            except OSError as exc:
+                logger.warning("Cannot write latency log %s: %s", sink_path, exc)
+
+    def start(self, at: Optional[float] = None) -> Trace:
+        return Trace(self, time.perf_counter() if at is None else at)
+
+    def record(self, trace: Trace, finished: float) -> None:
+        durations = [(span.stage, span.ms) for span in trace.spans]
+        if trace.stopped_at is not None:
+            durations.append(("stop_to_paste", (finished - trace.stopped_at) * 1000))
+        with self._lock:
+            self.dictations += 1
+            self._unreported += 1
+            for stage, ms in durations:
+                self.histograms.setdefault(stage, Histogram()).record(ms)
+            if self._sink is not None:
+                self._write_locked(trace, dict(durations).get("stop_to_paste"))
+            due = self._summary_interval > 0 and time.monotonic() - self._last_summary >= self._summary_interval
+        if due:
+            self.log_summary()
+
+    def _write_locked(self, trace: Trace, stop_to_paste: Optional[float]) -> None:
+        record = {
+            "time": round(time.time(), 3),
+            "dictation": self.dictations,
+            "stop_to_paste_ms": None if stop_to_paste is None else round(stop_to_paste, 3),
+            "spans": [
+                {"stage": span.stage, "start_ms": round((span.start - trace.origin) * 1000, 3), "ms": round(span.ms, 3)}
+                for span in trace.spans
+            ],
+        }
+        try:
+            self._sink.write(json.dumps(record) + "\n")
+            self._sink.flush()
+        except OSError as exc:
+            self._logger.warning("Latency log write failed; disabling it: %s", exc)
+            self._sink = None
+
+    def log_summary(self) -> None:
+        with self._lock:
+            self._last_summary = time.monotonic()
+            self._unreported = 0
+            rows = [
+                (stage, self.histograms[stage])
+                for stage in [*STAGES, *sorted(set(self.histograms) - set(STAGES))]
+                if stage in self.histograms
+            ]
+            if not rows:
+                return
+            self._logger.info("Latency over %s dictation(s):", self.dictations)
+            self._logger.info("%-14s %7s %9s %9s %9s %9s", "stage", "count", "p50 ms", "p95 ms", "p99 ms", "max ms")
+            for stage, histogram in rows:
+                self._logger.info(
+                    "%-14s %7s %9.1f %9.1f %9.1f %9.1f",
+                    stage,
+                    histogram.count,
+                    histogram.percentile(50),
+                    histogram.percentile(95),
+                    histogram.percentile(99),
+                    histogram.max_ms,
+                )
+
+    def close(self) -> None:
+        if self._unreported:
+            self.log_summary()
+        with self._lock:
+            if self._sink is not None:
+                self._sink.close()
+                self._sink = None
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Sequence
+
+import numpy as np
+
+from .daemon import DaemonClient, InferenceServer
+from .stt_backend import SyntheticBackend
+
+
+@dataclass(slots=True)
+class LoadReport:
+    label: str
+    requests: int
+    errors: int
+    wall_seconds: float
+    latencies_ms: List[float]
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.wall_seconds if self.wall_seconds else 0.0
+
+    def percentile(self, q: float) -> float:
+        return float(np.percentile(self.latencies_ms, q)) if self.latencies_ms else 0.0
+
+
+def run_load(
+    address: str,
+    *,
+    label: str,
+    clients: int,
+    requests: int,
+    clip_seconds: float,
+    think_ms: float,
+    logger: logging.Logger,
+) -> LoadReport:
+    """Drive the daemon at ``address`` from ``clients`` threads, each with its own connection."""
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    start = threading.Barrier(clients + 1)
+
+    def client(index: int) -> None:
+        rng = random.Random(index)
+        conn = DaemonClient.connect(address, logger=logger)
+        if conn is None:
+            with lock:
+                errors[0] += requests
+            # Release the other threads instead of leaving them at the barrier forever.
+            start.abort()
+            return
+        try:
+            try:
+                start.wait()
+            except threading.BrokenBarrierError:
+                return
+            for _ in range(requests):
+                # Vary clip length so batches need padding, as real dictation would.
+                samples = int(16_000 * clip_seconds * rng.uniform(0.5, 1.5))
+                audio = np.zeros(samples, dtype=np.float32)
+                began = time.perf_counter()
+                try:
+                    conn.transcribe(audio)
+                except RuntimeError:
+                    with lock:
+                        errors[0] += 1
+                    continue
+                with lock:
+                    latencies.append((time.perf_counter() - began) * 1000)
+                time.sleep(rng.expovariate(1000 / think_ms) if think_ms > 0 else 0)
+        finally:
+            conn.close()
+
+    threads = [threading.Thread(target=client, args=(i,), daemon=True) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    try:
+        start.wait()
+    except threading.BrokenBarrierError:
+        for thread in threads:
+            thread.join()
+        logger.warning("%s: a client could not connect to %s; run aborted", label, address)
+        return LoadReport(label, 0, errors[0], 0.0, [])
+    began = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return LoadReport(label, len(latencies), errors[0], time.perf_counter() - began, latencies)
+
+
+def _serve_synthetic(address: str, batch_window_ms: float, max_batch: int, max_latency_ms: float) -> None:
+    server = InferenceServer(
+        manager=SyntheticBackend(latency_ms=40.0, ms_per_audio_second=20.0),
+        logger=logging.getLogger("chirp.loadgen"),
+        address=address,
+        batch_window_ms=batch_window_ms,
+        max_batch=max_batch,
+        max_latency_ms=max_latency_ms,
+    )
+    server.serve_forever()
+
+
+def benchmark(
+    *,
+    logger: logging.Logger,
+    clients: int = 8,
+    requests: int = 20,
+    clip_seconds: float = 4.0,
+    think_ms: float = 200.0,
+    batch_window_ms: float = 15.0,
+    max_batch: int = 8,
+    max_latency_ms: float = 500.0,
+) -> List[LoadReport]:
+    """Load-test a synthetic-backend daemon process with batching off, then on, and log the comparison."""
+    reports = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, window in (("batching off", 0.0), ("batching on", batch_window_ms)):
+            if sys.platform == "win32":
+                address = rf"\\.\pipe\chirp-loadgen-{os.getpid()}-{len(reports)}"
+            else:
+                address = os.path.join(tmp, f"loadgen-{len(reports)}.sock")
+            # A separate interpreter, like `chirp serve`: it must not share this
+            # process's shared-memory resource tracker.
+            server = subprocess.Popen(
+                [sys.executable, "-m", "chirp.loadgen", address, str(window), str(max_batch), str(max_latency_ms)]
+            )
+            try:
+                for _ in range(100):
+                    probe = DaemonClient.connect(address, logger=logger, quiet=True)
+                    if probe is not None:
+                        probe.close()
+                        break
+                    time.sleep(0.05)
+                else:
+                    raise RuntimeError("synthetic daemon did not start")
+                report = run_load(
+                    address,
+                    label=label,
+                    clients=clients,
+                    requests=requests,
+                    clip_seconds=clip_seconds,
+                    think_ms=think_ms,
+                    logger=logger,
+                )
+            finally:
+                server.terminate()
+                server.wait()
+            reports.append(report)
+    log_reports(reports, logger)
+    return reports
+
+
+def log_reports(reports: Sequence[LoadReport], logger: logging.Logger) -> None:
+    logger.info("%-14s %9s %7s %9s %9s %9s %9s", "mode", "requests", "errors", "req/s", "p50 ms", "p95 ms", "p99 ms")
+    for report in reports:
+        logger.info(
+            "%-14s %9s %7s %9.1f %9.0f %9.0f %9.0f",
+            report.label,
+            report.requests,
+            report.errors,
+            report.throughput,
+            report.percentile(50),
+            report.percentile(95),
+            report.percentile(99),
+        )
+
+
+if __name__ == "__main__":
+    _serve_synthetic(sys.argv[1], float(sys.argv[2]), int(sys.argv[3]), float(sys.argv[4]))
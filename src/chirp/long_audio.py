@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .parakeet_manager import ParakeetManager
+from .vad import speech_frames
+from .workers import init_worker, resolve_workers, worker_manager
+
+# Frame used when looking for a quiet place to cut.
+FRAME_MS = 20.0
+# Longest run of words compared when stitching overlapping chunk texts.
+MAX_OVERLAP_WORDS = 12
+
+
+@dataclass(frozen=True, slots=True)
+class Chunk:
+    start: int
+    end: int
+    overlaps_previous: bool
+
+
+def plan_chunks(
+    audio: np.ndarray,
+    *,
+    sample_rate: int = 16_000,
+    chunk_seconds: float = 30.0,
+    overlap_seconds: float = 1.0,
+    search_seconds: float = 5.0,
+    threshold: float = 0.01,
+) -> List[Chunk]:
+    """Split ``audio`` into chunks of at most ``chunk_seconds``.
+
+    Each cut is placed at the first silent frame found searching back from the
+    chunk limit over ``search_seconds``. If the window has no silence, the cut
+    is made at the limit and the next chunk starts ``overlap_seconds`` earlier
+    so a word straddling the boundary is decoded whole at least once.
+    """
+    total = audio.shape[0]
+    limit = int(chunk_seconds * sample_rate)
+    if total <= limit:
+        return [Chunk(0, total, False)]
+    frame = int(sample_rate * FRAME_MS / 1000)
+    search = min(int(search_seconds * sample_rate), limit // 2)
+    overlap = min(int(overlap_seconds * sample_rate), limit // 2)
+    chunks: List[Chunk] = []
+    start, overlapped = 0, False
+    while total - start > limit:
+        window_start = start + limit - search
+        voiced = speech_frames(audio[window_start : start + limit], frame_length=frame, threshold=threshold)
+        quiet = np.flatnonzero(~voiced[::-1])
+        if quiet.size:
+            # Cut in the middle of the latest quiet frame; no overlap needed.
+            cut = window_start + (voiced.size - 1 - int(quiet[0])) * frame + frame // 2
+            chunks.append(Chunk(start, cut, overlapped))
+            start, overlapped = cut, False
+        else:
+            cut = start + limit
+            chunks.append(Chunk(start, cut, overlapped))
+            start, overlapped = cut - overlap, True
+    chunks.append(Chunk(start, total, overlapped))
+    return chunks
+
+
+def _normalize(word: str) -> str:
+    return re.sub(r"[^\w']", "", word.lower())
+
+
+def merge_texts(parts: Sequence[tuple[str, bool]]) -> str:
+    """Join chunk transcripts, dropping words repeated across an overlap.
+
+    ``parts`` holds ``(text, overlaps_previous)`` pairs. Words at a hard cut
+    can come out clipped, so the match may ignore one word at either edge.
+    """
+    words: List[str] = []
+    for text, overlaps_previous in parts:
+        incoming = text.split()
+        if overlaps_previous and words and incoming:
+            words, incoming = _stitch(words, incoming)
+        words.extend(incoming)
+    return " ".join(words)
+
+
+def _stitch(previous: List[str], incoming: List[str]) -> tuple[List[str], List[str]]:
+    tail = [_normalize(word) for word in previous[-MAX_OVERLAP_WORDS - 1 :]]
+    head = [_normalize(word) for word in incoming[: MAX_OVERLAP_WORDS + 1]]
+    for size in range(min(MAX_OVERLAP_WORDS, len(tail), len(head)), 0, -1):
+        for drop_tail in (0, 1):
+            for drop_head in (0, 1):
+                end = len(tail) - drop_tail
+                if end - size < 0 or drop_head + size > len(head):
+                    continue
+                if tail[end - size : end] == head[drop_head : drop_head + size]:
+                    kept = previous[: len(previous) - drop_tail]
+                    return kept, incoming[drop_head + size :]
+    return previous, incoming
+
+
+def _decode_chunk(audio: np.ndarray, sample_rate: int, language: Optional[str]) -> str:
+    return worker_manager().transcribe(audio, sample_rate=sample_rate, language=language)
+
+
+class ChunkedTranscriber:
+    """Decodes long recordings as chunks spread across worker processes.
+
+    Each worker owns a ``ParakeetManager`` built from ``manager_options`` with
+    ``intra_op_num_threads`` set to its share of the CPU cores. With a single
+    worker, chunks are decoded in-process by ``fallback`` instead; chunking
+    still keeps the float32 conversion and encoder activations per chunk.
+    """
+
+    def __init__(
+        self,
+        *,
+        manager_options: Dict[str, Any],
+        fallback: ParakeetManager,
+        logger: logging.Logger,
+        workers: int = 0,
+        chunk_seconds: float = 30.0,
+        overlap_seconds: float = 1.0,
+        threshold: float = 0.01,
+    ) -> None:
+        self._workers, self._threads = resolve_workers(workers)
+        # Workers start while a recording waits on them, so skip their warm-up.
+        self._manager_options = dict(manager_options, threads=self._threads, timeout=0, warmup_seconds=())
+        self._fallback = fallback
+        self._logger = logger
+        self._chunk_seconds = chunk_seconds
+        self._overlap_seconds = overlap_seconds
+        self._threshold = threshold
+        self._pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+    def transcribe(self, audio: np.ndarray, *, sample_rate: int = 16_000, language: Optional[str] = None) -> str:
+        samples = audio.reshape(-1)
+        chunks = plan_chunks(
+            samples,
+            sample_rate=sample_rate,
+            chunk_seconds=self._chunk_seconds,
+            overlap_seconds=self._overlap_seconds,
+            threshold=self._threshold,
+        )
+        self._logger.debug(
+            "Decoding %.1fs of audio as %s chunk(s) on %s worker(s)",
+            samples.size / sample_rate,
+            len(chunks),
+            self._workers,
+        )
+        if self._workers == 1 or len(chunks) == 1:
+            texts = [
+                self._fallback.transcribe(samples[chunk.start : chunk.end], sample_rate=sample_rate, language=language)
+                for chunk in chunks
+            ]
+        else:
+            pool = self._ensure_pool()
+            futures = [
+                pool.submit(_decode_chunk, samples[chunk.start : chunk.end], sample_rate, language)
+                for chunk in chunks
+            ]
+            texts = [future.result() for future in futures]
+        return merge_texts([(text, chunk.overlaps_previous) for text, chunk in zip(texts, chunks)])
+
+    def _ensure_pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        if self._pool is None:
+            self._logger.info(
+                "Starting %s decoding worker(s) with %s thread(s) each", self._workers, self._threads
+            )
+            self._pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self._workers,
+                initializer=init_worker,
+                initargs=(self._manager_options,),
+            )
+        return self._pool
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
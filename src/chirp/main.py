@@ -4,31 +4,40 @@ import argparse
 import concurrent.futures
 import logging
 import platform
+import sys
 import threading
 import time
-from typing import Optional, Sequence
+from pathlib import Path
+from typing import List, Optional, Sequence
 
 import numpy as np
 
-from rich.console import Console
-from rich.logging import RichHandler
-
 from .audio_capture import AudioCapture
 from .audio_feedback import AudioFeedback
+from .backends import create_backend, long_audio_transcriber, parakeet_options
+from .batch import BatchTranscriber, load_wav
 from .config_manager import ConfigManager
+from .daemon import DaemonClient, InferenceServer
 from .keyboard_shortcuts import KeyboardShortcutManager
+from .latency import LatencyTracker, Trace, span
+from .loadgen import benchmark
 from .logger import get_logger
-from .parakeet_manager import ModelNotPreparedError, ParakeetManager
+from .long_audio import ChunkedTranscriber
+from .parakeet_manager import ModelNotPreparedError
+from .quantize import benchmark_variant, local_quantization, log_comparison, quantize_model
 from .text_injector import TextInjector
+from .transcription_queue import TranscriptionQueue
+from .tuning import synthetic_clips, tune
+from .vad import trim_silence
 
 
 class ChirpApp:
     def __init__(self, *, verbose: bool = False) -> None:
+        self._started = time.perf_counter()
         level = logging.DEBUG if verbose else logging.INFO
         self.logger = get_logger(level=level)
         self.config_manager = ConfigManager()
         self.config = self.config_manager.load()
-        model_dir = self.config_manager.model_dir(self.config.parakeet_model, self.config.parakeet_quantization)
         self.logger.debug(
             "Environment: platform=%s python=%s config=%s models=%s",
             platform.platform(),
@@ -37,7 +46,8 @@ class ChirpApp:
             self.config_manager.models_root,
         )
         self.logger.debug(
-            "Config summary: model=%s quantization=%s provider=%s threads=%s paste_mode=%s",
+            "Config summary: backend=%s model=%s quantization=%s provider=%s threads=%s paste_mode=%s",
+            self.config.stt_backend,
             self.config.parakeet_model,
             self.config.parakeet_quantization or "none",
             self.config.onnx_providers,
@@ -46,35 +56,47 @@ class ChirpApp:
         )
 
         self.keyboard = KeyboardShortcutManager(logger=self.logger)
-        self.audio_capture = AudioCapture(status_callback=self._log_capture_status)
+        streaming = self.config.streaming_transcription
+        self.audio_capture = AudioCapture(
+            sample_rate=self.config.capture_sample_rate or None,
+            dtype=self.config.capture_dtype,
+            reserve_seconds=self.config.max_recording_duration or 60.0,
+            silence_threshold=self.config.silence_threshold,
+            segment_pause=self.config.segment_pause if streaming else 0.0,
+            segment_callback=self._handle_segment if streaming else None,
+            endpoint_silence=self.config.auto_stop_silence,
+            endpoint_callback=self._handle_endpoint,
+            warm=self.config.warm_stream,
+            pre_roll_seconds=self.config.pre_roll,
+            spill_bytes=int(self.config.spill_threshold_mb * 1024 * 1024),
+            status_callback=self._log_capture_status,
+        )
         self.audio_feedback = AudioFeedback(
             logger=self.logger,
             enabled=self.config.audio_feedback,
             volume=self.config.audio_feedback_volume,
         )
 
-        console = None
-        for handler in self.logger.handlers:
-            if isinstance(handler, RichHandler):
-                console = handler.console
-                break
-        if not console:
-            console = Console(stderr=True)
-
-        try:
-            with console.status("[bold green]Initializing Parakeet model...[/bold green]", spinner="dots"):
-                self.parakeet = ParakeetManager(
-                    model_name=self.config.parakeet_model,
-                    quantization=self.config.parakeet_quantization,
-                    provider_key=self.config.onnx_providers,
-                    threads=self.config.threads,
-                    logger=self.logger,
-                    model_dir=model_dir,
-                    timeout=self.config.model_timeout,
-                )
-        except ModelNotPreparedError as exc:
-            self.logger.error(str(exc))
-            raise SystemExit(1) from exc
+        daemon = None
+        if self.config.use_daemon:
+            daemon = DaemonClient.connect(self.config.daemon_address or None, logger=self.logger)
+            if daemon is None:
+                self.logger.warning("No `chirp serve` daemon is running; loading the model in this process")
+        self.long_audio: Optional[ChunkedTranscriber] = None
+        if daemon is not None:
+            # The daemon owns the model (and long-recording chunking); this process only captures and pastes.
+            self.logger.info("Using the Chirp daemon for transcription")
+            self.stt = daemon
+        else:
+            try:
+                # Models load on a background thread; recordings made before
+                # they are ready wait on the load future in transcribe().
+                self.stt = create_backend(self.config, self.config_manager, self.logger)
+            except (ModelNotPreparedError, ValueError) as exc:
+                self.logger.error(str(exc))
+                raise SystemExit(1) from exc
+            self.long_audio = long_audio_transcriber(self.config, self.config_manager, self.stt, self.logger)
+        self.stt.load().add_done_callback(self._log_model_ready)
         self.text_injector = TextInjector(
             keyboard_manager=self.keyboard,
             logger=self.logger,
@@ -86,17 +108,54 @@ class ChirpApp:
         )
 
         self._recording = False
+        self._recording_id = 0
         self._lock = threading.Lock()
         self._stop_timer: Optional[threading.Timer] = None
-        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="Transcriber")
+        self._segments: List[concurrent.futures.Future[str]] = []
+        log_path = self.config.latency_log_path
+        self.latency = LatencyTracker(
+            logger=self.logger,
+            summary_interval=self.config.latency_summary_interval,
+            sink_path=Path(log_path).expanduser() if log_path else None,
+        )
+        # Spans of the recording in progress; handed to the queue when it stops.
+        self._trace: Optional[Trace] = None
+        self._queue = TranscriptionQueue(
+            transcribe=self._transcribe,
+            inject=self._inject,
+            on_error=self._handle_transcription_error,
+            logger=self.logger,
+            max_backlog=self.config.max_queue_backlog,
+            overflow=self.config.queue_overflow,
+        )
 
     def run(self) -> None:
         try:
+            if self.config.warm_stream:
+                self.logger.debug("Opening warm input stream (pre-roll=%.2fs)", self.config.pre_roll)
+                self.audio_capture.open()
             self._register_hotkey()
             self.logger.info("Chirp ready. Toggle recording with %s", self.config.primary_shortcut)
+            self.logger.debug("Time to hotkey ready: %.2fs", time.perf_counter() - self._started)
             self.keyboard.wait()
         except KeyboardInterrupt:
             self.logger.info("Interrupted, exiting.")
+        finally:
+            self.audio_capture.close()
+            self._queue.close()
+            self.latency.close()
+            self.stt.close()
+            if self.long_audio is not None:
+                self.long_audio.shutdown()
+
+    def _log_model_ready(self, future: concurrent.futures.Future) -> None:
+        elapsed = time.perf_counter() - self._started
+        exc = future.exception()
+        if exc is not None:
+            self.logger.error("Speech model failed to load after %.2fs: %s", elapsed, exc)
+            return
+        self.logger.info("Speech model ready")
+        self.logger.debug("Time to model ready: %.2fs", elapsed)
 
     def _register_hotkey(self) -> None:
         self.logger.debug("Registering hotkey: %s", self.config.primary_shortcut)
@@ -105,23 +164,40 @@ class ChirpApp:
         except Exception:
             self.logger.error("Unable to register primary shortcut. Run as Administrator on Windows.")
             raise
+        if self.config.cancel_shortcut:
+            self.logger.debug("Registering cancel hotkey: %s", self.config.cancel_shortcut)
+            self.keyboard.register(self.config.cancel_shortcut, self.cancel_transcription)
 
     def toggle_recording(self) -> None:
+        received = time.perf_counter()
         with self._lock:
             if not self._recording:
-                self._start_recording()
+                self._start_recording(received)
             else:
-                self._stop_recording()
+                self._stop_recording(received)
 
-    def _start_recording(self) -> None:
+    def cancel_transcription(self) -> None:
+        if not self._queue.cancel_current():
+            self.logger.info("Nothing to cancel")
+
+    def _start_recording(self, received: Optional[float] = None) -> None:
         self.logger.debug("Starting audio capture")
+        self._segments = []
+        trace = self.latency.start(received)
+        if received is not None:
+            trace.add("start_hotkey", received, time.perf_counter())
         try:
-            self.audio_capture.start()
+            with trace.span("capture_start"):
+                self.audio_capture.start()
         except Exception as exc:
             self.logger.error("Audio capture start failed: %s", exc)
             self.audio_feedback.play_error(self.config.error_sound_path)
             return
         self._recording = True
+        self._recording_id += 1
+        self._trace = trace
+        # If the idle timeout unloaded the model, reload it while the user speaks.
+        self.stt.prefetch()
         self.audio_feedback.play_start(self.config.start_sound_path)
         self.logger.info("Recording started")
 
@@ -135,37 +211,85 @@ class ChirpApp:
         self.logger.info("Maximum recording duration reached.")
         self.toggle_recording()
 
-    def _stop_recording(self) -> None:
+    def _handle_endpoint(self) -> None:
+        # Called from the PortAudio callback, which cannot stop its own stream.
+        recording_id = self._recording_id
+        threading.Thread(
+            target=self._auto_stop, args=(recording_id,), name="AutoStop", daemon=True
+        ).start()
+
+    def _auto_stop(self, recording_id: int) -> None:
+        with self._lock:
+            if not self._recording or self._recording_id != recording_id:
+                return
+            self.logger.info("Silence detected; stopping recording.")
+            self._stop_recording()
+
+    def _stop_recording(self, received: Optional[float] = None) -> None:
+        trace, self._trace = self._trace or self.latency.start(received), None
+        trace.mark_stop(received)
+        if received is not None:
+            trace.add("stop_hotkey", received, time.perf_counter())
         if self._stop_timer:
             self._stop_timer.cancel()
             self._stop_timer = None
 
         self.logger.debug("Stopping audio capture")
-        waveform = self.audio_capture.stop()
+        # Only the audio after the last streamed segment (all of it if none was
+        # emitted). Once stop() returns the callback emits no more segments, so
+        # the list taken below matches that boundary.
+        with trace.span("capture_stop"):
+            waveform = self.audio_capture.stop(tail=True)
+        segments, self._segments = self._segments, []
         self._recording = False
         self.audio_feedback.play_stop(self.config.stop_sound_path)
         self.logger.info("Recording stopped (%s samples)", waveform.size)
-        self._executor.submit(self._transcribe_and_inject, waveform)
-
-    def _transcribe_and_inject(self, waveform) -> None:
-        start_time = time.perf_counter()
-        if waveform.size == 0:
+        if waveform.size == 0 and not segments:
             self.logger.warning("No audio samples captured")
             return
-        try:
-            text = self.parakeet.transcribe(waveform, sample_rate=16_000, language=self.config.language)
-        except Exception as exc:
-            self.logger.exception("Transcription failed: %s", exc)
-            self.audio_feedback.play_error(self.config.error_sound_path)
-            return
-        duration = time.perf_counter() - start_time
-        self.logger.debug("Transcription finished in %.2fs (chars=%s)", duration, len(text))
+        if segments:
+            self.logger.debug("Decoding trailing segment after %s streamed segment(s)", len(segments))
+        self._queue.submit(waveform, segments, trace=trace)
+
+    def _handle_segment(self, segment: np.ndarray) -> None:
+        # Runs on the PortAudio callback thread: only queue work here, resampling included.
+        self._segments.append(self._queue.submit_segment(segment, prepare=self.audio_capture.to_target_rate))
+
+    def _transcribe(self, waveform: np.ndarray) -> str:
+        if self.config.vad_trim:
+            trimmed = trim_silence(waveform, sample_rate=16_000, threshold=self.config.silence_threshold)
+            self.logger.debug(
+                "VAD removed %s of %s samples", trimmed.removed_samples, waveform.shape[0]
+            )
+            if trimmed.is_silent:
+                # A quiet microphone can sit entirely below the threshold; say so rather than drop it silently.
+                self.logger.warning(
+                    "No speech above silence_threshold %.3f in %.1fs of audio; skipping transcription",
+                    self.config.silence_threshold,
+                    waveform.shape[0] / 16_000,
+                )
+                return ""
+            waveform = trimmed.audio
+        # Timed apart from recognition so reloads after an idle unload show up on their own.
+        if not self.stt.ready:
+            with span("model_load"):
+                self.stt.load().result()
+        with span("recognize"):
+            if self.long_audio is not None and waveform.shape[0] > self.config.long_audio_threshold * 16_000:
+                return self.long_audio.transcribe(waveform, sample_rate=16_000, language=self.config.language)
+            return self.stt.transcribe(waveform, sample_rate=16_000, language=self.config.language)
+
+    def _inject(self, text: str) -> None:
         if not text.strip():
             self.logger.info("Transcription empty; skipping paste")
             return
         self.logger.debug("Transcription: %s", text)
         self.text_injector.inject(text)
 
+    def _handle_transcription_error(self, exc: BaseException) -> None:
+        self.logger.error("Transcription failed: %s", exc, exc_info=exc)
+        self.audio_feedback.play_error(self.config.error_sound_path)
+
     def _log_capture_status(self, message: str) -> None:
         self.logger.debug("Audio status: %s", message)
 
@@ -193,11 +317,125 @@ def _build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Smoke-test the pipeline without registering hotkeys or capturing audio",
     )
+    subparsers = parser.add_subparsers(dest="command")
+    transcribe = subparsers.add_parser(
+        "transcribe",
+        help="Transcribe WAV files or folders of WAV files offline and write JSONL",
+        description=(
+            "Transcribe recorded WAV files (16-bit or 32-bit PCM, or 32-bit float) "
+            "and write one JSON object per file with the post-processed text and "
+            "real-time factor. Identical files are decoded once."
+        ),
+    )
+    transcribe.add_argument("paths", nargs="+", help="WAV files or directories to search for *.wav")
+    transcribe.add_argument(
+        "-o",
+        "--output",
+        default="transcripts.jsonl",
+        help="JSONL output file, or '-' for stdout (default: transcripts.jsonl)",
+    )
+    transcribe.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="Decoding processes (default: long_audio_workers from config.toml; 0 = auto)",
+    )
+    tune_parser = subparsers.add_parser(
+        "tune",
+        help="Find the fastest ONNX Runtime session settings for this machine",
+        description=(
+            "Time the model across intra-op thread counts, spin-wait, execution mode and "
+            "graph optimization level, then save the fastest settings to a profile next to "
+            "the model directory. Chirp applies the profile automatically; an explicit "
+            "`threads` value in config.toml still takes precedence."
+        ),
+    )
+    tune_parser.add_argument("clips", nargs="*", help="WAV clips to time (default: built-in synthetic clips)")
+    tune_parser.add_argument("--repeats", type=int, default=3, help="Timed passes per setting (default: 3)")
+    tune_parser.add_argument(
+        "--exhaustive",
+        action="store_true",
+        help="Try every combination instead of tuning one setting at a time",
+    )
+    quantize_parser = subparsers.add_parser(
+        "quantize",
+        help="Build a dynamic int8 model from the local fp32 model and compare it",
+        description=(
+            "Quantize the fp32 encoder/decoder already on disk to int8 with ONNX Runtime's "
+            "dynamic quantizer, write them to a new model directory, then compare size, "
+            "load time, latency and transcripts against the fp32 model. Requires the `onnx` package."
+        ),
+    )
+    quantize_parser.add_argument("clips", nargs="*", help="WAV clips for the comparison (default: synthetic clips)")
+    quantize_parser.add_argument(
+        "--per-channel",
+        action="store_true",
+        help="Quantize weights per output channel (slower to build, usually more accurate)",
+    )
+    quantize_parser.add_argument("--repeats", type=int, default=3, help="Timed passes per model (default: 3)")
+    quantize_parser.add_argument("--no-compare", action="store_true", help="Skip the latency/size comparison")
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Run the model in a background daemon shared by Chirp instances",
+        description=(
+            "Load the model once and serve transcription requests over a per-user Unix socket "
+            "(named pipe on Windows). Chirp instances with `use_daemon = true` hand their audio "
+            "over through shared memory instead of loading their own copy of the model."
+        ),
+    )
+    serve_parser.add_argument(
+        "--address",
+        default=None,
+        help="Socket path or pipe name (default: daemon_address from config.toml, else a per-user default)",
+    )
+    loadtest_parser = subparsers.add_parser(
+        "loadtest",
+        help="Benchmark a synthetic-backend `chirp serve` daemon with many clients, batching off vs on",
+        description=(
+            "Start a daemon backed by the synthetic backend's fixed latency model, drive it from "
+            "concurrent clients, and report throughput and p50/p95/p99 latency with request "
+            "batching off and on. Batching settings come from config.toml unless overridden."
+        ),
+    )
+    loadtest_parser.add_argument("--clients", type=int, default=8, help="Concurrent clients (default: 8)")
+    loadtest_parser.add_argument("--requests", type=int, default=20, help="Requests per client (default: 20)")
+    loadtest_parser.add_argument("--clip-seconds", type=float, default=4.0, help="Mean clip length (default: 4)")
+    loadtest_parser.add_argument(
+        "--think-ms", type=float, default=200.0, help="Mean pause between a client's requests (default: 200)"
+    )
+    loadtest_parser.add_argument("--batch-window-ms", type=float, default=None, help="Batch window for the 'on' run")
     return parser
 
 
 def main(argv: Optional[Sequence[str]] = None) -> None:
-    args = _build_parser().parse_args(argv)
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "transcribe":
+        if args.workers is not None and args.workers < 0:
+            parser.error("--workers must be non-negative")
+        _run_batch(args.paths, output=args.output, workers=args.workers, verbose=args.verbose)
+        return
+    if args.command == "tune":
+        _run_tune(args.clips, repeats=args.repeats, exhaustive=args.exhaustive, verbose=args.verbose)
+        return
+    if args.command == "quantize":
+        _run_quantize(
+            args.clips,
+            per_channel=args.per_channel,
+            repeats=args.repeats,
+            compare=not args.no_compare,
+            verbose=args.verbose,
+        )
+        return
+    if args.command == "loadtest":
+        if args.clients < 1 or args.requests < 1:
+            parser.error("--clients and --requests must be at least 1")
+        _run_loadtest(args, verbose=args.verbose)
+        return
+    if args.command == "serve":
+        _run_serve(args.address, verbose=args.verbose)
+        return
     if args.check:
         _run_smoke_check(verbose=args.verbose)
         return
@@ -211,17 +449,8 @@ def _run_smoke_check(*, verbose: bool = False) -> None:
     config_manager = ConfigManager()
     config = config_manager.load()
     try:
-        model_dir = config_manager.model_dir(config.parakeet_model, config.parakeet_quantization)
-        parakeet = ParakeetManager(
-            model_name=config.parakeet_model,
-            quantization=config.parakeet_quantization,
-            provider_key=config.onnx_providers,
-            threads=config.threads,
-            logger=logger,
-            model_dir=model_dir,
-            timeout=config.model_timeout,
-        )
-    except ModelNotPreparedError as exc:
+        stt = create_backend(config, config_manager, logger)
+    except (ModelNotPreparedError, ValueError) as exc:
         logger.error(str(exc))
         raise SystemExit(1) from exc
 
@@ -235,11 +464,151 @@ def _run_smoke_check(*, verbose: bool = False) -> None:
         clipboard_clear_delay=config.clipboard_clear_delay,
     )
 
-    dummy_audio = np.zeros(16_000, dtype=np.float32)
-    transcription = parakeet.transcribe(dummy_audio, sample_rate=16_000, language=config.language)
+    # A tone rather than silence, so the sample takes the same VAD path as a dictation and still reaches the model.
+    sample = (0.1 * np.sin(2 * np.pi * 440 * np.arange(16_000) / 16_000)).astype(np.float32)
+    if config.vad_trim:
+        sample = trim_silence(sample, sample_rate=16_000, threshold=config.silence_threshold).audio
+    transcription = stt.transcribe(sample, sample_rate=16_000, language=config.language)
     processed = text_injector.process(transcription or "test")
     logger.info("Smoke check passed. Processed sample: %s", processed)
 
 
+def _run_batch(
+    paths: Sequence[str], *, output: str, workers: Optional[int] = None, verbose: bool = False
+) -> None:
+    logger = get_logger(level=logging.DEBUG if verbose else logging.INFO)
+    config_manager = ConfigManager()
+    config = config_manager.load()
+    model_dir = config_manager.model_dir(config.parakeet_model, config.parakeet_quantization)
+    text_injector = TextInjector(
+        keyboard_manager=KeyboardShortcutManager(logger=logger),
+        logger=logger,
+        paste_mode=config.paste_mode,
+        word_overrides=config.word_overrides,
+        post_processing=config.post_processing,
+        clipboard_behavior=False,
+        clipboard_clear_delay=config.clipboard_clear_delay,
+    )
+    transcriber = BatchTranscriber(
+        manager_options=parakeet_options(config, model_dir),
+        post_process=text_injector.process,
+        logger=logger,
+        workers=config.long_audio_workers if workers is None else workers,
+        language=config.language,
+        chunk_seconds=config.long_audio_chunk,
+        overlap_seconds=config.long_audio_overlap,
+        threshold=config.silence_threshold,
+    )
+    try:
+        if output == "-":
+            summary = transcriber.run(paths, sys.stdout)
+        else:
+            with open(output, "w", encoding="utf-8") as handle:
+                summary = transcriber.run(paths, handle)
+    except ModelNotPreparedError as exc:
+        logger.error(str(exc))
+        raise SystemExit(1) from exc
+    except concurrent.futures.BrokenExecutor as exc:
+        logger.error("Decoding workers failed to start; run `chirp --check` to verify the model setup.")
+        raise SystemExit(1) from exc
+    if summary["failed"]:
+        raise SystemExit(1)
+
+
+def _run_tune(clips: Sequence[str], *, repeats: int, exhaustive: bool, verbose: bool = False) -> None:
+    logger = get_logger(level=logging.DEBUG if verbose else logging.INFO)
+    config_manager = ConfigManager()
+    config = config_manager.load()
+    model_dir = config_manager.model_dir(config.parakeet_model, config.parakeet_quantization)
+    try:
+        tune(
+            manager_options=parakeet_options(config, model_dir),
+            logger=logger,
+            clip_paths=clips,
+            repeats=repeats,
+            exhaustive=exhaustive,
+        )
+    except ModelNotPreparedError as exc:
+        logger.error(str(exc))
+        raise SystemExit(1) from exc
+
+
+def _run_quantize(
+    clips: Sequence[str], *, per_channel: bool, repeats: int, compare: bool, verbose: bool = False
+) -> None:
+    logger = get_logger(level=logging.DEBUG if verbose else logging.INFO)
+    config_manager = ConfigManager()
+    config = config_manager.load()
+    quantization = local_quantization(per_channel=per_channel)
+    source_dir = config_manager.model_dir(config.parakeet_model, None)
+    target_dir = config_manager.model_dir(config.parakeet_model, quantization)
+    try:
+        quantize_model(source_dir, target_dir, quantization=quantization, per_channel=per_channel, logger=logger)
+    except (FileNotFoundError, RuntimeError) as exc:
+        logger.error(str(exc))
+        raise SystemExit(1) from exc
+    logger.info("Wrote %s", target_dir)
+    if compare:
+        audio = [load_wav(Path(path)) for path in clips] if clips else synthetic_clips()
+        base = parakeet_options(config, source_dir)
+        reports = [
+            benchmark_variant(
+                label, dict(base, quantization=quant, model_dir=path), clips=audio, repeats=repeats, logger=logger
+            )
+            for label, quant, path in (("fp32", None, source_dir), (quantization, quantization, target_dir))
+        ]
+        log_comparison(reports, logger)
+    logger.info('Set parakeet_quantization = "%s" in config.toml to use it.', quantization)
+
+
+def _run_serve(address: Optional[str], *, verbose: bool = False) -> None:
+    logger = get_logger(level=logging.DEBUG if verbose else logging.INFO)
+    config_manager = ConfigManager()
+    config = config_manager.load()
+    try:
+        manager = create_backend(config, config_manager, logger)
+    except (ModelNotPreparedError, ValueError) as exc:
+        logger.error(str(exc))
+        raise SystemExit(1) from exc
+    long_audio = long_audio_transcriber(config, config_manager, manager, logger)
+    server = InferenceServer(
+        manager=manager,
+        logger=logger,
+        address=address or config.daemon_address or None,
+        long_audio=long_audio,
+        long_audio_threshold=config.long_audio_threshold,
+        batch_window_ms=config.daemon_batch_window_ms,
+        max_batch=config.daemon_max_batch,
+        max_latency_ms=config.daemon_max_latency_ms,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Interrupted, exiting.")
+    except (RuntimeError, PermissionError) as exc:
+        logger.error(str(exc))
+        raise SystemExit(1) from exc
+    finally:
+        manager.close()
+        if long_audio is not None:
+            long_audio.shutdown()
+
+
+def _run_loadtest(args: argparse.Namespace, *, verbose: bool = False) -> None:
+    logger = get_logger(level=logging.DEBUG if verbose else logging.INFO)
+    config = ConfigManager().load()
+    window = args.batch_window_ms if args.batch_window_ms is not None else config.daemon_batch_window_ms
+    benchmark(
+        logger=logger,
+        clients=args.clients,
+        requests=args.requests,
+        clip_seconds=args.clip_seconds,
+        think_ms=args.think_ms,
+        batch_window_ms=window or 15.0,
+        max_batch=config.daemon_max_batch,
+        max_latency_ms=config.daemon_max_latency_ms,
+    )
+
+
 if __name__ == "__main__":
     main()
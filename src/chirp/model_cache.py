@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import platform
+import shutil
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Sequence
+
+try:
+    import onnxruntime as ort
+except ImportError:  # pragma: no cover - optional dependency
+    ort = None  # type: ignore[assignment]
+
+MANIFEST = "manifest.json"
+# Bumped when the cache layout changes so old entries are rebuilt.
+CACHE_FORMAT = 1
+
+
+def model_files(model_dir: Path, quantization: Optional[str]) -> List[Path]:
+    """ONNX graphs onnx_asr will load for ``quantization`` (e.g. ``encoder-model.int8.onnx``)."""
+    suffix = f".{quantization}.onnx" if quantization else ".onnx"
+    return [
+        path
+        for path in sorted(model_dir.glob("*.onnx"))
+        if (path.name.endswith(suffix) if quantization else "." not in path.stem)
+    ]
+
+
+def external_weight_files(model_dir: Path, quantization: Optional[str]) -> List[Path]:
+    """External-data weight files (``<graph>.onnx.data``) next to the graphs for ``quantization``."""
+    return [
+        data
+        for data in (path.with_name(path.name + ".data") for path in model_files(model_dir, quantization))
+        if data.is_file()
+    ]
+
+
+class OptimizedModelCache:
+    """On-disk cache of ONNX Runtime-optimized copies of a model directory.
+
+    Entries live in ``<model_dir>.ort-cache/<key>/``, where the key hashes the
+    source graphs (name, size, mtime), the quantization, the ORT version, the
+    optimization level and the CPU architecture. An entry is only used once
+    its manifest exists; it is built in a private temporary directory and
+    renamed into place, so a crash or a concurrent build never exposes a
+    partial entry. Entries with any other key are stale and are deleted.
+    """
+
+    def __init__(self, model_dir: Path, *, quantization: Optional[str], logger: logging.Logger) -> None:
+        self._model_dir = model_dir
+        self._quantization = quantization
+        self._logger = logger
+
+    @property
+    def root(self) -> Path:
+        return self._model_dir.with_name(self._model_dir.name + ".ort-cache")
+
+    def key(self, optimization_level: int) -> str:
+        digest = hashlib.sha256()
+        parts: List[Any] = [
+            CACHE_FORMAT,
+            self._quantization or "",
+            getattr(ort, "__version__", ""),
+            int(optimization_level),
+            platform.machine(),
+        ]
+        for path in model_files(self._model_dir, self._quantization):
+            for file in (path, path.with_name(path.name + ".data")):
+                if file.exists():
+                    stat = file.stat()
+                    parts.append((file.name, stat.st_size, stat.st_mtime_ns))
+        digest.update(json.dumps(parts).encode("utf-8"))
+        return digest.hexdigest()[:20]
+
+    def lookup(self, optimization_level: int) -> Optional[Path]:
+        entry = self.root / self.key(optimization_level)
+        return entry if (entry / MANIFEST).is_file() else None
+
+    def build(
+        self,
+        optimization_level: int,
+        make_options: Callable[[], Any],
+        providers: Sequence[str],
+    ) -> Path:
+        """Optimize every model graph into a new cache entry and return its path."""
+        if ort is None:
+            raise RuntimeError("onnxruntime is required to build the optimized model cache")
+        key = self.key(optimization_level)
+        entry = self.root / key
+        staging = self.root / f"{key}.tmp-{os.getpid()}"
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        try:
+            for source in model_files(self._model_dir, self._quantization):
+                options = make_options()
+                options.graph_optimization_level = ort.GraphOptimizationLevel(optimization_level)
+                options.optimized_model_filepath = str(staging / source.name)
+                # Encoders exceed protobuf's 2 GB limit; keep weights in a side file.
+                options.add_session_config_entry(
+                    "session.optimized_model_external_initializers_file_name", source.name + ".data"
+                )
+                options.add_session_config_entry(
+                    "session.optimized_model_external_initializers_min_size_in_bytes", "1024"
+                )
+                ort.InferenceSession(str(source), sess_options=options, providers=list(providers))
+            for extra in self._model_dir.iterdir():
+                if extra.is_file() and extra.suffix not in (".onnx", ".data") and not extra.name.startswith("."):
+                    shutil.copy2(extra, staging / extra.name)
+            (staging / MANIFEST).write_text(
+                json.dumps({"key": key, "source": str(self._model_dir), "ort": getattr(ort, "__version__", "")}),
+                encoding="utf-8",
+            )
+            try:
+                staging.rename(entry)
+            except OSError:
+                # Another process finished the same entry first; use theirs.
+                shutil.rmtree(staging, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        self.prune(keep=key)
+        return entry
+
+    def prune(self, *, keep: Optional[str] = None) -> None:
+        """Delete every entry except ``keep`` (and other processes' in-progress builds)."""
+        if not self.root.is_dir():
+            return
+        for entry in self.root.iterdir():
+            if entry.name == keep or ".tmp-" in entry.name:
+                continue
+            self._logger.debug("Removing stale optimized model cache %s", entry)
+            shutil.rmtree(entry, ignore_errors=True)
+
+    def discard(self, entry: Path) -> None:
+        shutil.rmtree(entry, ignore_errors=True)
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .parakeet_manager import ModelNotPreparedError, ParakeetManager
+from .stt_backend import SttBackend
+
+FAST = "fast"
+ACCURATE = "accurate"
+
+
+@dataclass(frozen=True, slots=True)
+class ModelTier:
+    name: str
+    quantization: Optional[str]
+    model_dir: Path
+
+
+@dataclass(slots=True)
+class TierStats:
+    requests: int = 0
+    audio_seconds: float = 0.0
+    decode_seconds: float = 0.0
+    worst_rtf: float = 0.0
+
+    def record(self, audio_seconds: float, decode_seconds: float) -> None:
+        self.requests += 1
+        self.audio_seconds += audio_seconds
+        self.decode_seconds += decode_seconds
+        if audio_seconds > 0:
+            self.worst_rtf = max(self.worst_rtf, decode_seconds / audio_seconds)
+
+    @property
+    def rtf(self) -> float:
+        return self.decode_seconds / self.audio_seconds if self.audio_seconds else 0.0
+
+    def estimate_ms(self, audio_seconds: float) -> Optional[float]:
+        """Expected decode time for a clip of this length, once the tier has been measured."""
+        return self.rtf * audio_seconds * 1000 if self.requests else None
+
+
+class TieredModelRouter(SttBackend):
+    """Routes each utterance to a fast (int8) or accurate (full-precision) model.
+
+    Utterances up to ``threshold_seconds`` go to the fast tier, longer ones to
+    the accurate tier, unless ``latency_budget_ms`` is set and the accurate
+    tier's measured speed says it would miss the budget. Speeds are measured
+    on decodes that did not wait for a model load. Each tier is its own
+    ParakeetManager; all share ORT's global intra-op thread pool. When
+    ``max_resident`` leaves room for every tier, all start loading in the
+    background at construction, so the first long utterance does not wait
+    on a load; otherwise non-default tiers load on first use. At most
+    ``max_resident`` tiers stay loaded: the least recently used one is
+    unloaded when another is needed. Serves as the
+    "parakeet" backend when ``tiered_models`` is on.
+    """
+
+    name = "parakeet"
+
+    def __init__(
+        self,
+        *,
+        tiers: Sequence[ModelTier],
+        manager_options: Dict[str, Any],
+        logger: logging.Logger,
+        threshold_seconds: float,
+        latency_budget_ms: float = 0.0,
+        max_resident: int = 2,
+        manager_factory: Callable[..., Any] = ParakeetManager,
+    ) -> None:
+        self._tiers = {tier.name: tier for tier in tiers}
+        self._manager_options = dict(manager_options, shared_threads=True)
+        self._logger = logger
+        self._threshold = threshold_seconds
+        self._budget_ms = latency_budget_ms
+        self._max_resident = max(1, max_resident)
+        self._factory = manager_factory
+        self._lock = threading.Lock()
+        self._managers: Dict[str, Any] = {}
+        # Tier names in least- to most-recently-used order.
+        self._resident: "collections.OrderedDict[str, None]" = collections.OrderedDict()
+        self._unavailable: set[str] = set()
+        self.tier_stats: Dict[str, TierStats] = {name: TierStats() for name in self._tiers}
+        self._default = FAST if FAST in self._tiers else next(iter(self._tiers))
+        self._manager(self._default)
+        if len(self._tiers) <= self._max_resident:
+            for name in self._tiers:
+                if name != self._default:
+                    self._manager(name)
+            # Short dictation is the common case: if anything is evicted first, it is not the default.
+            self._resident.move_to_end(self._default)
+
+    def route(self, samples: int, sample_rate: int = 16_000) -> str:
+        seconds = samples / sample_rate
+        choice = FAST if seconds <= self._threshold else ACCURATE
+        if choice == ACCURATE and self._budget_ms > 0:
+            estimate = self.tier_stats[ACCURATE].estimate_ms(seconds) if ACCURATE in self.tier_stats else None
+            if estimate is not None and estimate > self._budget_ms:
+                self._logger.debug(
+                    "Accurate tier would take ~%.0f ms for %.1fs (budget %.0f ms); using fast tier",
+                    estimate,
+                    seconds,
+                    self._budget_ms,
+                )
+                choice = FAST
+        if choice not in self._tiers or choice in self._unavailable:
+            choice = next(name for name in self._tiers if name not in self._unavailable)
+        return choice
+
+    def _manager(self, name: str) -> Any:
+        with self._lock:
+            manager = self._managers.get(name)
+            if manager is None:
+                tier = self._tiers[name]
+                options = dict(self._manager_options, quantization=tier.quantization, model_dir=tier.model_dir)
+                try:
+                    manager = self._factory(logger=self._logger, background_load=True, **options)
+                except ModelNotPreparedError:
+                    if name == self._default:
+                        raise
+                    self._logger.warning("%s tier model is not downloaded; routing to the other tier", name)
+                    self._unavailable.add(name)
+                    return self._managers[self._default]
+                self._managers[name] = manager
+            self._resident[name] = None
+            self._resident.move_to_end(name)
+            evicted = []
+            while len(self._resident) > self._max_resident:
+                old, _ = self._resident.popitem(last=False)
+                evicted.append(self._managers[old])
+        for old_manager in evicted:
+            old_manager.unload()
+        return manager
+
+    @property
+    def ready(self) -> bool:
+        return any(self._managers[name].ready for name in list(self._resident))
+
+    def load(self) -> concurrent.futures.Future:
+        return self._manager(self._default).load()
+
+    def warm(self) -> None:
+        self._manager(self._default).warm()
+
+    def unload(self) -> None:
+        with self._lock:
+            managers = [self._managers[name] for name in self._resident]
+        for manager in managers:
+            manager.unload()
+
+    def prefetch(self) -> None:
+        for name in list(self._resident):
+            self._managers[name].prefetch()
+
+    def transcribe(self, audio: np.ndarray, *, sample_rate: int = 16_000, language: Optional[str] = None) -> str:
+        name, manager = self._select(audio.shape[0], sample_rate)
+        warm = manager.ready
+        started = time.perf_counter()
+        text = manager.transcribe(audio, sample_rate=sample_rate, language=language)
+        if warm:
+            self._record(name, audio.shape[0] / sample_rate, time.perf_counter() - started)
+        return text
+
+    def transcribe_batch(
+        self, audios: Sequence[np.ndarray], *, sample_rate: int = 16_000, language: Optional[str] = None
+    ) -> List[str]:
+        name, manager = self._select(max((audio.shape[0] for audio in audios), default=0), sample_rate)
+        warm = manager.ready
+        started = time.perf_counter()
+        texts = manager.transcribe_batch(audios, sample_rate=sample_rate, language=language)
+        if warm:
+            self._record(name, sum(audio.shape[0] for audio in audios) / sample_rate, time.perf_counter() - started)
+        return texts
+
+    def _select(self, samples: int, sample_rate: int):
+        name = self.route(samples, sample_rate)
+        manager = self._manager(name)
+        # A tier found missing on first use was just marked unavailable and replaced by the default.
+        return (self._default if name in self._unavailable else name), manager
+
+    def _record(self, name: str, audio_seconds: float, decode_seconds: float) -> None:
+        stats = self.tier_stats[name]
+        with self._lock:
+            stats.record(audio_seconds, decode_seconds)
+        self._logger.debug(
+            "%s tier: %.1fs of audio in %.0f ms (tier RTF %.3f over %s requests)",
+            name,
+            audio_seconds,
+            decode_seconds * 1000,
+            stats.rtf,
+            stats.requests,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            tiers = {
+                name: dict(asdict(stats), quantization=self._tiers[name].quantization or "none", rtf=stats.rtf)
+                for name, stats in self.tier_stats.items()
+            }
+        return {"backend": self.name, "tiers": tiers}
+
+    def log_stats(self) -> None:
+        for name, stats in self.tier_stats.items():
+            if stats.requests:
+                self._logger.info(
+                    "%s tier (%s): %s requests, %.1fs of audio, mean RTF %.3f, worst RTF %.3f",
+                    name,
+                    self._tiers[name].quantization or "full precision",
+                    stats.requests,
+                    stats.audio_seconds,
+                    stats.rtf,
+                    stats.worst_rtf,
+                )
+
+    def close(self) -> None:
+        self.log_stats()
+        for manager in self._managers.values():
+            manager.close()
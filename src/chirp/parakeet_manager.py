@@ -1,16 +1,24 @@
 from __future__ import annotations
 
+import concurrent.futures
 import gc
 import logging
 import threading
 import time
 from pathlib import Path
-from typing import Optional, Sequence
+from typing import Any, Dict, List, Optional, Sequence
 
 import numpy as np
 import onnx_asr
 from onnx_asr.loader import ModelFileNotFoundError, ModelPathNotFoundError
 
+from .arena import USE_ENV_ALLOCATORS, install_arena_shrink, register_shrinkable_arena
+from .model_cache import OptimizedModelCache, external_weight_files, model_files
+from .pcm import to_float32
+from .session_profile import SessionProfile, load_profile
+from .stt_backend import SttBackend
+from .unload_policy import IdleTimeoutPolicy, UnloadPolicy, process_rss
+
 try:
     import onnxruntime as ort
 except ImportError:  # pragma: no cover - optional dependency
@@ -18,13 +26,43 @@ except ImportError:  # pragma: no cover - optional dependency
 
 
 CPU_PROVIDERS: Sequence[str] = ("CPUExecutionProvider",)
+# Pre-packing copies each matmul weight into a private buffer, which would
+# undo memory-mapping; ORT maps external initializers itself when loading
+# from a path.
+DISABLE_PREPACKING = "session.disable_prepacking"
+# Longest first, so the arena grows once to its working size.
+DEFAULT_WARMUP_SECONDS: Sequence[float] = (8.0, 3.0)
 
 
 class ModelNotPreparedError(RuntimeError):
     pass
 
 
-class ParakeetManager:
+_thread_pool_lock = threading.Lock()
+_global_thread_pool: Optional[bool] = None
+
+
+def use_global_thread_pool(threads: int, logger: logging.Logger) -> bool:
+    """Create ORT's process-wide intra-op pool once so several sessions share it.
+
+    Must run before the first session in the process; afterwards the pools
+    exist and this returns whether the shared pool was set up.
+    """
+    global _global_thread_pool
+    with _thread_pool_lock:
+        if _global_thread_pool is None:
+            try:
+                ort.capi._pybind_state.set_global_thread_pool_sizes(max(0, threads), 1)
+                _global_thread_pool = True
+            except Exception as exc:
+                logger.warning("Could not create a shared ONNX Runtime thread pool: %s", exc)
+                _global_thread_pool = False
+        return _global_thread_pool
+
+
+class ParakeetManager(SttBackend):
+    name = "parakeet"
+
     def __init__(
         self,
         *,
@@ -35,48 +73,272 @@ class ParakeetManager:
         logger: logging.Logger,
         model_dir: Path,
         timeout: float = 300.0,
+        background_load: bool = False,
+        unload_policy: Optional[UnloadPolicy] = None,
+        optimized_cache: bool = False,
+        session_profile: Optional[SessionProfile] = None,
+        warmup_seconds: Sequence[float] = (),
+        shrink_arena: bool = False,
+        mmap_weights: bool = False,
+        shared_threads: bool = False,
     ) -> None:
         self._logger = logger
         self._model_name = model_name
         self._quantization = quantization
         self._providers = self._resolve_providers(provider_key)
+        self._threads = threads
+        # Return encoder activation memory after each run while keeping the weights loaded.
+        self._shrink_arena = shrink_arena and ort is not None and register_shrinkable_arena(logger)
+        # Weights stay file-backed pages: shared between processes and kept in the page cache across unloads.
+        self._mmap_weights = mmap_weights
+        self._warned_embedded_weights = False
+        # A profile written by `chirp tune` applies unless one is passed explicitly.
+        self._profile = session_profile if session_profile is not None else load_profile(model_dir, logger)
+        if self._profile is not None:
+            self._logger.debug("Using session profile: %s", self._profile.describe())
+            self._optimization_level = self._profile.optimization_level_value
+        else:
+            self._optimization_level = int(ort.GraphOptimizationLevel.ORT_ENABLE_ALL) if ort is not None else 99
+        # Several resident models (e.g. routing tiers) draw on one intra-op pool instead of one each.
+        self._shared_threads = (
+            shared_threads
+            and ort is not None
+            and use_global_thread_pool(threads or (self._profile.intra_op_threads if self._profile else 0), logger)
+        )
         self._session_options = self._build_session_options(threads)
         self._model_dir = model_dir
-        self._timeout = timeout  # 0 or negative means never unload
+        self._cache: Optional[OptimizedModelCache] = None
+        if optimized_cache and ort is not None:
+            self._cache = OptimizedModelCache(model_dir, quantization=quantization, logger=logger)
+        self._policy = unload_policy or IdleTimeoutPolicy(timeout)
         self._last_access = time.time()
         self._lock = threading.Lock()
-        self._model = self._load_model()
         self._stop_monitor = threading.Event()
+        # Set when the unload deadline may have moved (model loaded, shutdown).
+        self._wake_monitor = threading.Event()
+        self._model = None
+        # Set while a load is in flight or its model is current; cleared on unload.
+        self._load_future: Optional[concurrent.futures.Future] = None
+        # perf_counter() stamps used to report reload time hidden by prefetch().
+        self._prefetched_at: Optional[float] = None
+        self._loaded_at = 0.0
+        self._warmup_seconds = tuple(warmup_seconds)
+        # Cleared on every load; the first transcribe() after it is timed separately.
+        self._first_call_pending = True
+        self._warmed_up = False
+        # Callers blocked in ensure_loaded(); warm-up stops early rather than delay them.
+        self._waiters = 0
+        # Totals reported by stats(); updated under the lock.
+        self._loads = 0
+        self._decodes = 0
+        self._audio_seconds = 0.0
+        self._decode_seconds = 0.0
+        if background_load:
+            # Fail fast on a missing download; the slow session setup runs on a thread.
+            self._check_prepared()
+            self.load_async()
+        else:
+            model = self._load_model()
+            # Warm up before the first transcribe can compete with it for intra-op threads.
+            self._warmed_up = self._warm_up(model)
+            self._model = model
+            self._loads = 1
+            self._load_future = concurrent.futures.Future()
+            self._load_future.set_result(self._model)
         self._monitor_thread: Optional[threading.Thread] = None
-        if self._timeout > 0:
+        if self._policy.enabled:
             self._monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
             self._monitor_thread.start()
 
     def _monitor_loop(self) -> None:
+        # Sleep until the policy's deadline instead of polling. Accesses only
+        # push the deadline later, so waking at a stale one just re-computes.
         while not self._stop_monitor.is_set():
-            time.sleep(5)
-            with self._lock:
-                should_unload = (
-                    self._model is not None
-                    and self._timeout > 0
-                    and (time.time() - self._last_access > self._timeout)
-                )
-            if should_unload:
+            self._wake_monitor.clear()
+            now = time.time()
+            deadline = self._unload_deadline(now)
+            if deadline is not None and deadline <= now:
                 self._unload_model()
+                continue
+            waits = [deadline - now] if deadline is not None else []
+            if self._policy.recheck_interval:
+                waits.append(self._policy.recheck_interval)
+            self._wake_monitor.wait(min(waits) if waits else None)
+
+    def _unload_deadline(self, now: float) -> Optional[float]:
+        with self._lock:
+            if self._model is None:
+                return None
+            last_access = self._last_access
+        return self._policy.unload_at(last_access, now)
 
     def _unload_model(self) -> None:
+        now = time.time()
+        deadline = self._unload_deadline(now)
         with self._lock:
-            if self._model is not None and (time.time() - self._last_access > self._timeout):
+            if self._model is not None and deadline is not None and deadline <= now:
                 self._logger.info("Unloading Parakeet model to free memory.")
                 self._model = None
+                self._load_future = None
                 gc.collect()
 
-    def ensure_loaded(self):
+    def unload(self) -> None:
+        """Drop the model now, whatever the unload policy says; the next use reloads it."""
         with self._lock:
             if self._model is None:
+                return
+            self._logger.info("Unloading Parakeet model (%s) to free memory.", self._quantization or "full precision")
+            self._model = None
+            self._load_future = None
+        gc.collect()
+
+    def close(self) -> None:
+        """Stop the unload monitor; the model stays loaded until garbage collected."""
+        self._stop_monitor.set()
+        self._wake_monitor.set()
+
+    @property
+    def ready(self) -> bool:
+        return self._model is not None
+
+    def load(self) -> concurrent.futures.Future:
+        return self.load_async()
+
+    def load_async(self) -> concurrent.futures.Future:
+        """Start loading the model on a background thread unless it is loaded or loading.
+
+        Returns the future that resolves to the model; callers that need it block on it.
+        """
+        with self._lock:
+            if self._load_future is None:
+                self._load_future = concurrent.futures.Future()
+                threading.Thread(
+                    target=self._run_load, args=(self._load_future,), name="ParakeetLoader", daemon=True
+                ).start()
+            return self._load_future
+
+    def _run_load(self, future: concurrent.futures.Future) -> None:
+        started = time.perf_counter()
+        try:
+            model = self._load_model()
+        except BaseException as exc:
+            with self._lock:
+                if self._load_future is future:
+                    self._load_future = None  # let the next caller retry
+            future.set_exception(exc)
+            return
+        self._logger.debug("Parakeet model loaded in %.2fs", time.perf_counter() - started)
+        # The model is published only after warm-up, so no transcription runs
+        # alongside the warm-up decodes; warm-up is cut short once one waits.
+        warmed = self._warm_up(model)
+        with self._lock:
+            self._model = model
+            self._last_access = time.time()
+            self._loaded_at = time.perf_counter()
+            self._first_call_pending = True
+            self._warmed_up = warmed
+            self._loads += 1
+        self._wake_monitor.set()
+        future.set_result(model)
+
+    def _warm_up(self, model) -> bool:
+        """Run throwaway recognitions so arena growth and kernel selection happen now.
+
+        Returns whether every warm-up clip ran; stops before the next clip
+        when a transcription is waiting for the model.
+        """
+        if not self._warmup_seconds:
+            return False
+        started = time.perf_counter()
+        rng = np.random.default_rng(0)
+        try:
+            for seconds in self._warmup_seconds:
+                with self._lock:
+                    waiting = self._waiters
+                if waiting:
+                    self._logger.debug("Cutting warm-up short: a transcription is waiting for the model")
+                    return False
+                noise = (rng.standard_normal(int(seconds * 16_000)) * 0.01).astype(np.float32)
+                model.recognize(noise, sample_rate=16_000)
+        except Exception as exc:  # pragma: no cover - warm-up is best effort
+            self._logger.warning("Model warm-up failed: %s", exc)
+            return False
+        self._logger.debug(
+            "Warm-up on %s clip(s) finished in %.2fs", len(self._warmup_seconds), time.perf_counter() - started
+        )
+        return True
+
+    def warm(self) -> None:
+        """Warm up now, loading the model first if needed; a no-op once warmed or without warm-up clips."""
+        model = self.ensure_loaded()
+        with self._lock:
+            warmed = self._warmed_up
+        if not warmed and self._warm_up(model):
+            with self._lock:
+                self._warmed_up = self._model is model
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": self.name,
+                "quantization": self._quantization or "none",
+                "loaded": self._model is not None,
+                "warmed_up": self._warmed_up,
+                "loads": self._loads,
+                "decodes": self._decodes,
+                "audio_seconds": round(self._audio_seconds, 3),
+                "decode_seconds": round(self._decode_seconds, 3),
+            }
+
+    def prefetch(self) -> None:
+        """Start reloading an unloaded model so it overlaps the recording.
+
+        A no-op when the model is loaded or already loading.
+        """
+        with self._lock:
+            if self._model is not None or self._load_future is not None:
+                return
+            self._prefetched_at = time.perf_counter()
+        self._logger.debug("Model was unloaded; reloading in the background while recording")
+        self.load_async()
+
+    def ensure_loaded(self):
+        requested = time.perf_counter()
+        with self._lock:
+            model = self._model
+            loading = self._load_future is not None
+        if model is None:
+            if loading:
+                self._logger.info("Waiting for Parakeet model to finish loading...")
+            else:
                 self._logger.info("Reloading Parakeet model...")
-                self._model = self._load_model()
-            return self._model
+            with self._lock:
+                self._waiters += 1
+            try:
+                model = self.load_async().result()
+            finally:
+                with self._lock:
+                    self._waiters -= 1
+        self._report_prefetch(requested)
+        return model
+
+    def _report_prefetch(self, requested: float) -> None:
+        with self._lock:
+            started, self._prefetched_at = self._prefetched_at, None
+            finished = self._loaded_at
+        if started is None or finished < started:
+            return
+        hidden = min(requested, finished) - started
+        self._logger.info(
+            "Model reload took %.2fs; %.2fs hidden behind recording, %.2fs waited",
+            finished - started,
+            hidden,
+            max(0.0, finished - requested),
+        )
+
+    def _check_prepared(self) -> None:
+        if not (self._model_dir / "config.json").exists() or not any(self._model_dir.glob("*.onnx")):
+            raise ModelNotPreparedError(f"Model not found at {self._model_dir} — run: uv run chirp-setup")
 
     def _resolve_providers(self, key: str) -> Sequence[str]:
         normalized = key.lower()
@@ -97,12 +359,33 @@ class ParakeetManager:
         # Optimization: Force inter_op_num_threads to 1.
         # This minimizes overhead for sequential models like Parakeet.
         options.inter_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel(self._optimization_level)
+        if self._profile is not None:
+            self._profile.apply(options)
+        if self._shrink_arena:
+            options.add_session_config_entry(USE_ENV_ALLOCATORS, "1")
+        if self._mmap_weights:
+            options.add_session_config_entry(DISABLE_PREPACKING, "1")
+        if self._shared_threads:
+            options.use_per_session_threads = False
 
+        # An explicit `threads` setting still wins over the tuned thread count.
         if threads and threads > 0:
             options.intra_op_num_threads = threads
         return options
 
     def _load_model(self):
+        model = self._create_model()
+        if self._shrink_arena:
+            wrapped = install_arena_shrink(model)
+            self._logger.debug("Arena shrinking enabled on %s session(s)", wrapped)
+        if self._mmap_weights and self._logger.isEnabledFor(logging.DEBUG):
+            rss = process_rss()
+            if rss is not None:
+                self._logger.debug("Resident memory after load (weights memory-mapped): %.0f MB", rss / 2**20)
+        return model
+
+    def _create_model(self):
         self._logger.info(
             "Loading Parakeet model %s (quantization=%s, providers=%s)",
             self._model_name,
@@ -110,13 +393,54 @@ class ParakeetManager:
             ",".join(self._providers),
         )
         self._model_dir.mkdir(parents=True, exist_ok=True)
+        if self._cache is None or not model_files(self._model_dir, self._quantization):
+            return self._load_from(self._model_dir, self._session_options)
+
+        started = time.perf_counter()
+        entry = self._cache.lookup(self._optimization_level)
+        warm = entry is not None
+        if entry is None:
+            try:
+                entry = self._cache.build(
+                    self._optimization_level,
+                    lambda: self._build_session_options(self._threads),
+                    self._providers,
+                )
+            except Exception as exc:
+                self._logger.warning("Could not build optimized model cache (%s); using the original model", exc)
+                return self._load_from(self._model_dir, self._session_options)
+        # The cached graphs are already optimized; skip ORT's optimizer passes.
+        options = self._build_session_options(self._threads)
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+        try:
+            model = self._load_from(entry, options)
+        except Exception as exc:
+            self._logger.warning("Discarding unusable optimized model cache %s (%s)", entry, exc)
+            self._cache.discard(entry)
+            return self._load_from(self._model_dir, self._session_options)
+        self._logger.debug(
+            "Parakeet model %s in %.2fs",
+            "loaded from optimized cache (warm)" if warm else "optimized and cached (cold)",
+            time.perf_counter() - started,
+        )
+        return model
+
+    def _load_from(self, path: Path, session_options):
+        embedded = self._mmap_weights and not external_weight_files(path, self._quantization)
+        if embedded and not self._warned_embedded_weights:
+            self._warned_embedded_weights = True
+            self._logger.info(
+                "Weights in %s are embedded in the graphs and will be copied, not memory-mapped; "
+                "enable optimized_model_cache to store them in mappable files",
+                path,
+            )
         try:
             return onnx_asr.load_model(
                 self._model_name,
-                path=str(self._model_dir),
+                path=str(path),
                 quantization=self._quantization,
                 providers=self._providers,
-                sess_options=self._session_options,
+                sess_options=session_options,
             )
         except (ModelPathNotFoundError, ModelFileNotFoundError) as exc:
             raise ModelNotPreparedError(
@@ -126,11 +450,57 @@ class ParakeetManager:
     def transcribe(self, audio: np.ndarray, *, sample_rate: int = 16_000, language: Optional[str] = None) -> str:
         with self._lock:
             self._last_access = time.time()
+        self._policy.record_use(self._last_access)
         model = self.ensure_loaded()
         if audio.ndim > 1:
             audio = audio.reshape(-1)
-        waveform = audio.astype(np.float32, copy=False)
+        waveform = to_float32(audio)
         if waveform.size == 0:
             return ""
+        started = time.perf_counter()
         result = model.recognize(waveform, sample_rate=sample_rate, language=language)
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            first, self._first_call_pending = self._first_call_pending, False
+            warmed = self._warmed_up
+            self._record_decode(waveform.size / sample_rate, elapsed)
+        if first:
+            self._logger.debug(
+                "First recognize after load: %.0f ms for %.1fs of audio (warmed up: %s)",
+                elapsed * 1000,
+                waveform.size / sample_rate,
+                "yes" if warmed else "no",
+            )
+        if self._shrink_arena and self._logger.isEnabledFor(logging.DEBUG):
+            rss = process_rss()
+            if rss is not None:
+                self._logger.debug("Resident memory after recognize (arena shrunk): %.0f MB", rss / 2**20)
         return result if isinstance(result, str) else str(result)
+
+    def transcribe_batch(
+        self, audios: Sequence[np.ndarray], *, sample_rate: int = 16_000, language: Optional[str] = None
+    ) -> List[str]:
+        """Decode several clips in one padded ``recognize`` call; empty clips give ""."""
+        with self._lock:
+            self._last_access = time.time()
+        self._policy.record_use(self._last_access)
+        model = self.ensure_loaded()
+        waveforms = [to_float32(audio.reshape(-1) if audio.ndim > 1 else audio) for audio in audios]
+        voiced = [index for index, waveform in enumerate(waveforms) if waveform.size]
+        texts = [""] * len(waveforms)
+        started = time.perf_counter()
+        if voiced:
+            results = model.recognize([waveforms[i] for i in voiced], sample_rate=sample_rate, language=language)
+            for index, result in zip(voiced, results):
+                texts[index] = result if isinstance(result, str) else str(result)
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._first_call_pending = False
+            self._record_decode(sum(waveform.size for waveform in waveforms) / sample_rate, elapsed)
+        return texts
+
+    def _record_decode(self, audio_seconds: float, decode_seconds: float) -> None:
+        # Caller holds self._lock.
+        self._decodes += 1
+        self._audio_seconds += audio_seconds
+        self._decode_seconds += decode_seconds
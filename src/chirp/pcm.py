@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+def full_scale(dtype: np.dtype | str) -> float:
+    """Magnitude that maps to 1.0 when converting samples of ``dtype`` to float."""
+    dtype = np.dtype(dtype)
+    if np.issubdtype(dtype, np.integer):
+        return float(np.iinfo(dtype).max + 1)
+    return 1.0
+
+
+def to_float32(audio: np.ndarray) -> np.ndarray:
+    """Convert PCM samples to float32 in [-1, 1) in a single vectorized pass.
+
+    Float input is returned without copying when it is already float32.
+    """
+    if np.issubdtype(audio.dtype, np.integer):
+        return np.multiply(audio, np.float32(1.0 / full_scale(audio.dtype)), dtype=np.float32)
+    return audio.astype(np.float32, copy=False)
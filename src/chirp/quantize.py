@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import gc
+import logging
+import shutil
+import statistics
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from .model_cache import model_files
+from .parakeet_manager import ParakeetManager
+
+# Quantizations produced by `chirp quantize` rather than downloaded from the hub.
+LOCAL_PREFIX = "local-"
+# Dynamic int8 only pays off on the large matrix multiplies; int8 ConvInteger
+# kernels are missing on many CPU builds, so convolutions stay in float.
+QUANTIZED_OPS = ("MatMul", "Gemm")
+
+
+def local_quantization(*, per_channel: bool) -> str:
+    return f"{LOCAL_PREFIX}int8-pc" if per_channel else f"{LOCAL_PREFIX}int8"
+
+
+def quantize_model(
+    source_dir: Path,
+    target_dir: Path,
+    *,
+    quantization: str,
+    per_channel: bool = False,
+    logger: logging.Logger,
+) -> List[Path]:
+    """Write dynamically int8-quantized copies of the fp32 encoder/decoder to ``target_dir``.
+
+    Outputs are named ``<graph>.<quantization>.onnx`` so onnx_asr finds them
+    with ``quantization=<quantization>``; config and vocabulary files are
+    copied alongside. The directory is built under a temporary name and only
+    replaces ``target_dir`` once every graph has been written.
+    """
+    try:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+    except ImportError as exc:
+        raise RuntimeError("chirp quantize needs the `onnx` package: uv pip install onnx") from exc
+
+    sources = [path for path in model_files(source_dir, None) if path.stem.endswith("-model")]
+    if not sources:
+        raise FileNotFoundError(f"No fp32 encoder/decoder graphs in {source_dir} — run: uv run chirp-setup")
+    staging = target_dir.with_name(target_dir.name + ".tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    outputs = []
+    try:
+        for source in sources:
+            output = staging / f"{source.stem}.{quantization}.onnx"
+            logger.info("Quantizing %s (per_channel=%s)", source.name, per_channel)
+            started = time.perf_counter()
+            quantize_dynamic(
+                str(source),
+                str(output),
+                weight_type=QuantType.QInt8,
+                per_channel=per_channel,
+                op_types_to_quantize=list(QUANTIZED_OPS),
+            )
+            logger.debug("Quantized %s in %.1fs", source.name, time.perf_counter() - started)
+            outputs.append(target_dir / output.name)
+        for extra in source_dir.iterdir():
+            if extra.is_file() and extra.suffix not in (".onnx", ".data") and not extra.name.startswith("."):
+                shutil.copy2(extra, staging / extra.name)
+        shutil.rmtree(target_dir, ignore_errors=True)
+        staging.rename(target_dir)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return outputs
+
+
+def model_size(model_dir: Path, quantization: str | None) -> int:
+    """Bytes of ONNX graphs (including external weight files) loaded for ``quantization``."""
+    total = 0
+    for path in model_files(model_dir, quantization):
+        total += path.stat().st_size
+        data = path.with_name(path.name + ".data")
+        if data.exists():
+            total += data.stat().st_size
+    return total
+
+
+@dataclass(slots=True)
+class VariantReport:
+    label: str
+    size_mb: float
+    load_seconds: float
+    latency_ms: float
+    texts: List[str]
+
+
+def benchmark_variant(
+    label: str,
+    manager_options: Dict[str, Any],
+    *,
+    clips: Sequence[np.ndarray],
+    repeats: int,
+    logger: logging.Logger,
+) -> VariantReport:
+    options = dict(manager_options, timeout=0, optimized_cache=False, warmup_seconds=())
+    size = model_size(options["model_dir"], options["quantization"])
+    started = time.perf_counter()
+    manager = ParakeetManager(logger=logger, **options)
+    load_seconds = time.perf_counter() - started
+    try:
+        texts = [manager.transcribe(clip) for clip in clips]
+        passes = []
+        for _ in range(max(1, repeats)):
+            started = time.perf_counter()
+            for clip in clips:
+                manager.transcribe(clip)
+            passes.append(time.perf_counter() - started)
+    finally:
+        manager.close()
+        del manager
+        gc.collect()
+    return VariantReport(label, size / 2**20, load_seconds, statistics.median(passes) * 1000, texts)
+
+
+def log_comparison(reports: Sequence[VariantReport], logger: logging.Logger) -> None:
+    baseline = reports[0]
+    logger.info("%-14s %10s %9s %12s %8s", "model", "size MB", "load s", "latency ms", "speedup")
+    for report in reports:
+        logger.info(
+            "%-14s %10.1f %9.2f %12.1f %7.2fx",
+            report.label,
+            report.size_mb,
+            report.load_seconds,
+            report.latency_ms,
+            baseline.latency_ms / report.latency_ms if report.latency_ms else 0.0,
+        )
+    for report in reports[1:]:
+        same = sum(a.strip() == b.strip() for a, b in zip(baseline.texts, report.texts))
+        logger.info("%s: %s of %s transcripts identical to %s", report.label, same, len(report.texts), baseline.label)
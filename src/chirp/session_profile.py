@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+try:
+    import onnxruntime as ort
+except ImportError:  # pragma: no cover - optional dependency
+    ort = None  # type: ignore[assignment]
+
+EXECUTION_MODES = ("sequential", "parallel")
+OPTIMIZATION_LEVELS = {"disabled": 0, "basic": 1, "extended": 2, "all": 99}
+
+
+@dataclass(frozen=True, slots=True)
+class SessionProfile:
+    """ONNX Runtime session settings chosen by ``chirp tune`` for this machine."""
+
+    intra_op_threads: int
+    spin_wait: bool = True
+    execution_mode: str = "sequential"
+    optimization_level: str = "all"
+    latency_ms: Optional[float] = None
+
+    def describe(self) -> str:
+        return (
+            f"threads={self.intra_op_threads} spin={'on' if self.spin_wait else 'off'} "
+            f"mode={self.execution_mode} opt={self.optimization_level}"
+        )
+
+    def apply(self, options: Any) -> None:
+        """Set these values on an ``ort.SessionOptions``."""
+        options.intra_op_num_threads = self.intra_op_threads
+        options.add_session_config_entry("session.intra_op.allow_spinning", "1" if self.spin_wait else "0")
+        if self.execution_mode == "parallel":
+            options.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+            options.inter_op_num_threads = 0  # let ORT size the inter-op pool
+        else:
+            options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = ort.GraphOptimizationLevel(OPTIMIZATION_LEVELS[self.optimization_level])
+
+    @property
+    def optimization_level_value(self) -> int:
+        return OPTIMIZATION_LEVELS[self.optimization_level]
+
+
+def profile_path(model_dir: Path) -> Path:
+    """Profiles sit next to the model directory they were measured with."""
+    return model_dir.with_name(model_dir.name + ".tuning.json")
+
+
+def save_profile(model_dir: Path, profile: SessionProfile) -> Path:
+    path = profile_path(model_dir)
+    payload: Dict[str, Any] = asdict(profile)
+    payload["ort_version"] = getattr(ort, "__version__", "")
+    payload["cpu_count"] = os.cpu_count()
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    return path
+
+
+def load_profile(model_dir: Path, logger: logging.Logger) -> Optional[SessionProfile]:
+    """Return the saved profile, or None if absent, unreadable or measured elsewhere.
+
+    A profile recorded with a different ONNX Runtime version or core count no
+    longer describes this machine and is ignored until ``chirp tune`` re-runs.
+    """
+    path = profile_path(model_dir)
+    if not path.is_file():
+        return None
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        if payload.pop("ort_version", None) != getattr(ort, "__version__", "") or payload.pop(
+            "cpu_count", None
+        ) != os.cpu_count():
+            logger.info("Ignoring tuning profile %s: recorded on a different setup; re-run `chirp tune`", path)
+            return None
+        profile = SessionProfile(**payload)
+        if profile.execution_mode not in EXECUTION_MODES or profile.optimization_level not in OPTIMIZATION_LEVELS:
+            raise ValueError("unknown execution mode or optimization level")
+    except (OSError, TypeError, ValueError) as exc:
+        logger.warning("Ignoring unreadable tuning profile %s: %s", path, exc)
+        return None
+    return profile
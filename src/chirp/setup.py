@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Optional
 
 from huggingface_hub import snapshot_download
 
@@ -23,19 +24,34 @@ def _resolve_repo(model_name: str) -> str:
     return repo
 
 
-def main() -> None:
-    config_manager = ConfigManager()
-    config = config_manager.load()
-    model_dir = config_manager.model_dir(config.parakeet_model, config.parakeet_quantization)
-    repo_id = _resolve_repo(config.parakeet_model)
+def _prepare(config_manager: ConfigManager, model_name: str, quantization: Optional[str]) -> None:
+    model_dir = config_manager.model_dir(model_name, quantization)
+    repo_id = _resolve_repo(model_name)
+    local = (quantization or "").lower().startswith("local-")
+    if local and not _model_ready(model_dir):
+        # Local variants are built from the fp32 model by `chirp quantize`.
+        model_dir = config_manager.model_dir(model_name, None)
 
     if _model_ready(model_dir):
         print(f"Model already present at {model_dir}")
-        return
+    else:
+        model_dir.mkdir(parents=True, exist_ok=True)
+        snapshot_download(repo_id, local_dir=str(model_dir))
+        print(f"Downloaded model snapshot to {model_dir}")
+    if local and model_dir == config_manager.model_dir(model_name, None):
+        print("Now run `chirp quantize` to build the locally quantized model.")
+
 
-    model_dir.mkdir(parents=True, exist_ok=True)
-    snapshot_download(repo_id, local_dir=str(model_dir))
-    print(f"Downloaded model snapshot to {model_dir}")
+def main() -> None:
+    config_manager = ConfigManager()
+    config = config_manager.load()
+    if config.tiered_models:
+        # Both routing tiers stay resident, so both variants are needed.
+        quantizations = [config.fast_quantization or None, config.accurate_quantization or None]
+    else:
+        quantizations = [config.parakeet_quantization]
+    for quantization in quantizations:
+        _prepare(config_manager, config.parakeet_model, quantization)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import abc
+import concurrent.futures
+import random
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+class SttBackend(abc.ABC):
+    """Speech-to-text engine as seen by ChirpApp, the daemon and the smoke check.
+
+    Engines implement ``transcribe`` and usually ``load``; the other methods
+    have defaults for engines without a separate load step or batching.
+    """
+
+    name = "base"
+
+    def load(self) -> concurrent.futures.Future:
+        """Start loading (in the background if the engine supports it); resolves when ready."""
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        future.set_result(self)
+        return future
+
+    def warm(self) -> None:
+        """Run a throwaway decode so the first real one is not slower than the rest."""
+
+    @abc.abstractmethod
+    def transcribe(self, audio: np.ndarray, *, sample_rate: int = 16_000, language: Optional[str] = None) -> str:
+        """Decode one clip; blocks until the model is loaded."""
+
+    def transcribe_batch(
+        self, audios: Sequence[np.ndarray], *, sample_rate: int = 16_000, language: Optional[str] = None
+    ) -> List[str]:
+        return [self.transcribe(audio, sample_rate=sample_rate, language=language) for audio in audios]
+
+    def unload(self) -> None:
+        """Free the model; the next ``transcribe`` loads it again."""
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name}
+
+    @property
+    def ready(self) -> bool:
+        """Whether ``transcribe`` would run without waiting for a load."""
+        return True
+
+    def prefetch(self) -> None:
+        """Hint that a recording started; engines that unload can start reloading now."""
+
+    def close(self) -> None:
+        pass
+
+
+_SYNTHETIC_WORDS = (
+    "the quick brown fox jumps over lazy dog please send meeting notes today before lunch and check report again thanks"
+).split()
+
+# Roughly conversational dictation speed.
+SYNTHETIC_WORDS_PER_SECOND = 2.5
+
+
+class SyntheticBackend(SttBackend):
+    """Model-free engine with a fixed latency model, for benchmarking everything around the model.
+
+    A call costs ``latency_ms`` plus ``ms_per_audio_second`` for the longest
+    clip; each extra clip in a batch adds ``batch_cost`` of that audio cost,
+    since one padded run is cheaper than separate runs. The text is made of
+    words picked by a hash of the samples, about as many as real speech of
+    that length would give, so the same audio always yields the same text.
+    """
+
+    name = "synthetic"
+
+    def __init__(
+        self, *, latency_ms: float = 50.0, ms_per_audio_second: float = 0.0, batch_cost: float = 0.3
+    ) -> None:
+        self._latency = latency_ms / 1000
+        self._per_second = ms_per_audio_second / 1000
+        self._batch_cost = batch_cost
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._clips = 0
+        self._audio_seconds = 0.0
+
+    def transcribe(self, audio: np.ndarray, *, sample_rate: int = 16_000, language: Optional[str] = None) -> str:
+        return self.transcribe_batch([audio], sample_rate=sample_rate, language=language)[0]
+
+    def transcribe_batch(
+        self, audios: Sequence[np.ndarray], *, sample_rate: int = 16_000, language: Optional[str] = None
+    ) -> List[str]:
+        if not audios:
+            return []
+        longest = max(audio.shape[0] for audio in audios) / sample_rate
+        time.sleep(self._latency + self._per_second * longest * (1 + self._batch_cost * (len(audios) - 1)))
+        with self._lock:
+            self._calls += 1
+            self._clips += len(audios)
+            self._audio_seconds += sum(audio.shape[0] for audio in audios) / sample_rate
+        return [self._text(audio, sample_rate) for audio in audios]
+
+    @staticmethod
+    def _text(audio: np.ndarray, sample_rate: int) -> str:
+        if audio.size == 0:
+            return ""
+        count = max(1, round(audio.shape[0] / sample_rate * SYNTHETIC_WORDS_PER_SECOND))
+        rng = random.Random(zlib.crc32(np.ascontiguousarray(audio).tobytes()))
+        return " ".join(rng.choice(_SYNTHETIC_WORDS) for _ in range(count))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": self.name,
+                "calls": self._calls,
+                "clips": self._clips,
+                "audio_seconds": round(self._audio_seconds, 3),
+            }
@@ -11,6 +11,7 @@ from typing import Dict, Optional
 import pyperclip
 
 from .keyboard_shortcuts import KeyboardShortcutManager
+from .latency import span
 
 
 @dataclass(slots=True)
@@ -103,29 +104,33 @@ class TextInjector:
         return result.strip() if strip_text else result
 
     def inject(self, text: str) -> None:
-        processed = self.process(text)
+        with span("post_process"):
+            processed = self.process(text)
 
         # On Windows, type directly to avoid unnecessary clipboard exposure
         if sys.platform.startswith("win"):
-            time.sleep(0.12)  # Brief delay for focus settling
-            try:
-                self._keyboard.write(processed)
-            except Exception as exc:  # pragma: no cover - runtime safety
-                self._logger.error("Text injection failed: %s", exc)
+            with span("type"):
+                time.sleep(0.12)  # Brief delay for focus settling
+                try:
+                    self._keyboard.write(processed)
+                except Exception as exc:  # pragma: no cover - runtime safety
+                    self._logger.error("Text injection failed: %s", exc)
             return
 
         # Non-Windows: use clipboard + paste
         try:
-            pyperclip.copy(processed)
+            with span("clipboard"):
+                pyperclip.copy(processed)
         except pyperclip.PyperclipException as exc:  # pragma: no cover - clipboard edge cases
             self._logger.error("Clipboard copy failed: %s", exc)
             return
-        time.sleep(0.12)
-        try:
-            combo = "ctrl+v" if self._paste_mode == "ctrl" else "ctrl+shift+v"
-            self._keyboard.send(combo)
-        except Exception as exc:  # pragma: no cover - runtime safety
-            self._logger.error("Paste injection failed: %s", exc)
+        with span("paste"):
+            time.sleep(0.12)
+            try:
+                combo = "ctrl+v" if self._paste_mode == "ctrl" else "ctrl+shift+v"
+                self._keyboard.send(combo)
+            except Exception as exc:  # pragma: no cover - runtime safety
+                self._logger.error("Paste injection failed: %s", exc)
         if self._clipboard_behavior:
             self._schedule_clipboard_clear()
 
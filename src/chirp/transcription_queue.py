@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Deque, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .latency import Trace, activate
+from .pcm import to_float32
+
+OVERFLOW_POLICIES = ("merge", "drop")
+
+
+@dataclass(slots=True)
+class QueueStats:
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    cancelled: int = 0
+    dropped: int = 0
+    merged: int = 0
+    max_depth: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+    waits: int = 0
+
+    @property
+    def mean_wait(self) -> float:
+        return self.wait_total / self.waits if self.waits else 0.0
+
+
+@dataclass(slots=True, eq=False)
+class _Segment:
+    future: concurrent.futures.Future
+    waveform: np.ndarray
+    prepare: Optional[Callable[[np.ndarray], np.ndarray]] = None
+
+
+@dataclass(slots=True, eq=False)
+class _Job:
+    job_id: int
+    # Recorded audio and already-queued segment futures, in spoken order.
+    pieces: List[Union[np.ndarray, concurrent.futures.Future]]
+    submitted: float
+    cancelled: bool = False
+    segments: List[concurrent.futures.Future] = field(default_factory=list)
+    # (trace, submitted) per dictation; a merged job carries every recording's trace.
+    traces: List[Tuple[Trace, float]] = field(default_factory=list)
+
+    @property
+    def samples(self) -> int:
+        return sum(piece.shape[0] for piece in self.pieces if isinstance(piece, np.ndarray))
+
+
+class TranscriptionQueue:
+    """Ordered queue of finished recordings between capture and text injection.
+
+    One thread decodes streamed segments and recordings in submission order;
+    a second thread injects the results in the same order, so a slow paste
+    never delays the next decode. Once ``max_backlog`` recordings are waiting,
+    the overflow policy either merges the new recording into the newest
+    pending one (decoded together, text kept in order) or drops the oldest.
+    """
+
+    def __init__(
+        self,
+        *,
+        transcribe: Callable[[np.ndarray], str],
+        inject: Callable[[str], None],
+        logger: logging.Logger,
+        max_backlog: int = 0,
+        overflow: str = "merge",
+        on_error: Optional[Callable[[BaseException], None]] = None,
+        merge_gap_seconds: float = 0.3,
+        sample_rate: int = 16_000,
+    ) -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}, got {overflow!r}")
+        self._transcribe = transcribe
+        self._inject = inject
+        self._logger = logger
+        self._max_backlog = max(0, max_backlog)
+        self._overflow = overflow
+        self._on_error = on_error
+        self._sample_rate = sample_rate
+        self._gap = np.zeros(int(merge_gap_seconds * sample_rate), dtype=np.float32)
+        self._cond = threading.Condition()
+        self._items: Deque[Union[_Segment, _Job]] = collections.deque()
+        self._current: Optional[_Job] = None
+        self._next_id = 0
+        self._closing = False
+        # (job, text) pairs in decode order; None stops the injector.
+        self._results: queue.Queue = queue.Queue()
+        self.stats = QueueStats()
+        self._decoder = threading.Thread(target=self._decode_loop, name="Transcriber", daemon=True)
+        self._injector = threading.Thread(target=self._inject_loop, name="Injector", daemon=True)
+        self._decoder.start()
+        self._injector.start()
+
+    @property
+    def depth(self) -> int:
+        """Recordings waiting to be decoded (not counting the one in progress)."""
+        with self._cond:
+            return self._pending_jobs_locked()
+
+    def submit_segment(
+        self, waveform: np.ndarray, *, prepare: Optional[Callable[[np.ndarray], np.ndarray]] = None
+    ) -> concurrent.futures.Future:
+        """Queue a streamed segment for decoding; its text is returned, not injected.
+
+        ``prepare`` (e.g. resampling) runs on the decoding thread first, so
+        callers on the audio callback thread do no more than queue the audio.
+        """
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        with self._cond:
+            self._items.append(_Segment(future, waveform, prepare))
+            self._cond.notify()
+        return future
+
+    def submit(
+        self,
+        waveform: np.ndarray,
+        segments: Sequence[concurrent.futures.Future] = (),
+        *,
+        trace: Optional[Trace] = None,
+    ) -> int:
+        """Queue a finished recording; ``segments`` are its earlier streamed parts.
+
+        ``trace`` gets the queue wait, is active while the recording is decoded
+        and injected, and is finished once the text is injected.
+        """
+        with self._cond:
+            if self._closing:
+                raise RuntimeError("transcription queue is closed")
+            self._next_id += 1
+            now = time.perf_counter()
+            job = _Job(
+                self._next_id,
+                [*segments, waveform],
+                now,
+                segments=list(segments),
+                traces=[(trace, now)] if trace is not None else [],
+            )
+            self.stats.submitted += 1
+            if self._max_backlog and self._pending_jobs_locked() >= self._max_backlog:
+                self._overflow_locked(job)
+            self._items.append(job)
+            self.stats.max_depth = max(self.stats.max_depth, self._pending_jobs_locked())
+            self._cond.notify()
+            return job.job_id
+
+    def cancel_current(self) -> bool:
+        """Discard the recording being decoded, or else the oldest waiting one."""
+        with self._cond:
+            target = self._current if self._current is not None and not self._current.cancelled else None
+            if target is None:
+                target = next((item for item in self._items if isinstance(item, _Job)), None)
+            if target is None:
+                return False
+            self._cancel_locked(target)
+            self.stats.cancelled += 1
+            self._logger.info(
+                "Cancelled transcription %s (%.1fs of audio)", target.job_id, target.samples / self._sample_rate
+            )
+            return True
+
+    def close(self, *, wait: bool = True) -> None:
+        """Stop accepting work; with ``wait`` the backlog is decoded and injected first."""
+        with self._cond:
+            self._closing = True
+            if not wait:
+                for item in list(self._items):
+                    if isinstance(item, _Job):
+                        self._cancel_locked(item)
+                    else:
+                        item.future.cancel()
+                self._items.clear()
+            self._cond.notify_all()
+        self._decoder.join()
+        self._results.put(None)
+        self._injector.join()
+        if self.stats.submitted:
+            self._logger.debug(
+                "Transcription queue: %s done, %s failed, %s cancelled, %s dropped, %s merged; "
+                "wait mean %.2fs max %.2fs; max depth %s",
+                self.stats.completed,
+                self.stats.failed,
+                self.stats.cancelled,
+                self.stats.dropped,
+                self.stats.merged,
+                self.stats.mean_wait,
+                self.stats.wait_max,
+                self.stats.max_depth,
+            )
+
+    def _pending_jobs_locked(self) -> int:
+        return sum(isinstance(item, _Job) for item in self._items)
+
+    def _cancel_locked(self, job: _Job) -> None:
+        job.cancelled = True
+        for future in job.segments:
+            future.cancel()
+        try:
+            self._items.remove(job)
+        except ValueError:
+            pass
+
+    def _overflow_locked(self, job: _Job) -> None:
+        pending = [item for item in self._items if isinstance(item, _Job)]
+        if self._overflow == "drop":
+            oldest = pending[0]
+            self._cancel_locked(oldest)
+            self.stats.dropped += 1
+            self._logger.warning(
+                "Transcription backlog full (%s waiting); dropped the oldest recording (%.1fs of audio)",
+                len(pending),
+                oldest.samples / self._sample_rate,
+            )
+            return
+        # The newest pending job moves to the new job's slot: everything it
+        # depends on is still ahead of it, and no other recording is in between.
+        newest = pending[-1]
+        self._items.remove(newest)
+        job.pieces[:0] = newest.pieces
+        job.segments[:0] = newest.segments
+        job.submitted = newest.submitted
+        job.traces[:0] = newest.traces
+        self.stats.merged += 1
+        self._logger.info(
+            "Transcription backlog full (%s waiting); merged the new recording into the last one", len(pending)
+        )
+
+    def _decode_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._items and not self._closing:
+                    self._cond.wait()
+                if not self._items:
+                    return
+                item = self._items.popleft()
+                if isinstance(item, _Job):
+                    self._current = item
+            if isinstance(item, _Segment):
+                self._decode_segment(item)
+                continue
+            self._decode_job(item)
+            with self._cond:
+                self._current = None
+
+    def _decode_segment(self, segment: _Segment) -> None:
+        if not segment.future.set_running_or_notify_cancel():
+            return
+        try:
+            waveform = segment.waveform if segment.prepare is None else segment.prepare(segment.waveform)
+            segment.future.set_result(self._transcribe(waveform))
+        except BaseException as exc:
+            segment.future.set_exception(exc)
+
+    def _decode_job(self, job: _Job) -> None:
+        started = time.perf_counter()
+        waited = started - job.submitted
+        with self._cond:
+            self.stats.waits += 1
+            self.stats.wait_total += waited
+            self.stats.wait_max = max(self.stats.wait_max, waited)
+        self._logger.debug("Transcription %s started after %.2fs queued (%s waiting)", job.job_id, waited, self.depth)
+        for trace, submitted in job.traces:
+            trace.add("queue_wait", submitted, started)
+        with activate(*(trace for trace, _ in job.traces)):
+            text = self._decode_pieces(job)
+        if text is None:
+            return
+        self._logger.debug(
+            "Transcription %s finished in %.2fs (chars=%s)", job.job_id, time.perf_counter() - started, len(text)
+        )
+        if job.cancelled:
+            self._logger.debug("Discarding cancelled transcription %s", job.job_id)
+            return
+        self._results.put((job, text))
+
+    def _decode_pieces(self, job: _Job) -> Optional[str]:
+        """The job's text, or None if decoding failed (already reported)."""
+        try:
+            parts = []
+            audio: List[np.ndarray] = []
+            for piece in [*job.pieces, None]:
+                if isinstance(piece, np.ndarray):
+                    if piece.size:
+                        audio.append(piece)
+                    continue
+                if audio:
+                    parts.append(self._transcribe(self._join(audio)))
+                    audio = []
+                if piece is not None and not job.cancelled:
+                    # Segments were queued before this job, so they are already done.
+                    parts.append(piece.result())
+            return " ".join(part.strip() for part in parts if part.strip())
+        except BaseException as exc:
+            if job.cancelled:
+                return None
+            with self._cond:
+                self.stats.failed += 1
+            if self._on_error is not None:
+                self._on_error(exc)
+            else:
+                self._logger.exception("Transcription failed: %s", exc)
+            return None
+
+    def _join(self, audio: List[np.ndarray]) -> np.ndarray:
+        """Merged recordings separated by short silences; int16 capture is scaled to float first."""
+        if len(audio) == 1:
+            return audio[0]
+        joined: List[np.ndarray] = []
+        for piece in audio:
+            joined.extend((self._gap, to_float32(piece)) if joined else (to_float32(piece),))
+        return np.concatenate(joined)
+
+    def _inject_loop(self) -> None:
+        while True:
+            result = self._results.get()
+            if result is None:
+                return
+            job, text = result
+            if job.cancelled:
+                continue
+            try:
+                with activate(*(trace for trace, _ in job.traces)):
+                    self._inject(text)
+            except Exception as exc:
+                self._logger.exception("Text injection failed: %s", exc)
+                continue
+            with self._cond:
+                self.stats.completed += 1
+            # Empty results paste nothing, so there is no stop-to-paste latency to record.
+            if text.strip():
+                for trace, _ in job.traces:
+                    trace.finish()
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import gc
+import logging
+import os
+import statistics
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from .batch import load_wav
+from .parakeet_manager import ParakeetManager
+from .session_profile import EXECUTION_MODES, SessionProfile, save_profile
+
+SYNTHETIC_SECONDS = (2.0, 5.0, 10.0)
+
+
+def synthetic_clips(seconds: Sequence[float] = SYNTHETIC_SECONDS, sample_rate: int = 16_000) -> List[np.ndarray]:
+    """Deterministic speech-like clips: a gliding harmonic tone with a syllable envelope plus noise."""
+    rng = np.random.default_rng(0)
+    clips = []
+    for length in seconds:
+        t = np.arange(int(length * sample_rate)) / sample_rate
+        pitch = 120 + 30 * np.sin(2 * np.pi * 0.5 * t)
+        phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+        voiced = sum(np.sin(k * phase) / k for k in range(1, 6))
+        envelope = 0.5 * (1 + np.sin(2 * np.pi * 4 * t))
+        clip = 0.1 * voiced * envelope + 0.005 * rng.standard_normal(t.size)
+        clips.append(clip.astype(np.float32))
+    return clips
+
+
+def thread_counts(cores: int) -> List[int]:
+    return sorted({count for count in (1, 2, 4, cores // 2, cores) if 1 <= count <= cores})
+
+
+def candidate_profiles(cores: int) -> List[SessionProfile]:
+    """Full matrix of thread count x spin-wait x execution mode x optimization level."""
+    return [
+        SessionProfile(intra_op_threads=threads, spin_wait=spin, execution_mode=mode, optimization_level=level)
+        for threads in thread_counts(cores)
+        for spin in (True, False)
+        for mode in EXECUTION_MODES
+        for level in ("basic", "extended", "all")
+    ]
+
+
+class SessionTuner:
+    """Times ParakeetManager under different session settings and keeps the fastest.
+
+    The default search tunes one setting at a time (thread count first, then
+    spin-wait, execution mode and optimization level), which needs a handful
+    of model loads instead of the full matrix; ``exhaustive`` runs them all.
+    """
+
+    def __init__(
+        self,
+        *,
+        manager_options: Dict[str, Any],
+        logger: logging.Logger,
+        clips: Sequence[np.ndarray],
+        repeats: int = 3,
+    ) -> None:
+        # Tuning measures inference only: no idle unload, no optimized-graph cache churn
+        # and no background warm-up competing with the timed passes.
+        self._manager_options = dict(
+            manager_options, threads=None, timeout=0, optimized_cache=False, warmup_seconds=()
+        )
+        self._logger = logger
+        self._clips = list(clips)
+        self._repeats = max(1, repeats)
+        self.results: List[SessionProfile] = []
+
+    def measure(self, profile: SessionProfile) -> SessionProfile:
+        manager = ParakeetManager(logger=self._logger, session_profile=profile, **self._manager_options)
+        try:
+            for clip in self._clips:  # first runs pay for allocation and lazy init
+                manager.transcribe(clip)
+            passes = []
+            for _ in range(self._repeats):
+                started = time.perf_counter()
+                for clip in self._clips:
+                    manager.transcribe(clip)
+                passes.append(time.perf_counter() - started)
+        finally:
+            manager.close()
+            del manager
+            gc.collect()
+        measured = replace(profile, latency_ms=round(statistics.median(passes) * 1000, 1))
+        self._logger.info("%-48s %8.1f ms", measured.describe(), measured.latency_ms)
+        self.results.append(measured)
+        return measured
+
+    def run(self, *, exhaustive: bool = False) -> SessionProfile:
+        cores = os.cpu_count() or 1
+        if exhaustive:
+            return min((self.measure(p) for p in candidate_profiles(cores)), key=_latency)
+        best = min(
+            (self.measure(SessionProfile(intra_op_threads=count)) for count in thread_counts(cores)),
+            key=_latency,
+        )
+        for change in (
+            {"spin_wait": False},
+            {"execution_mode": "parallel"},
+            *({"optimization_level": level} for level in ("basic", "extended")),
+        ):
+            best = min(best, self.measure(replace(best, **change)), key=_latency)
+        return best
+
+
+def _latency(profile: SessionProfile) -> float:
+    return profile.latency_ms if profile.latency_ms is not None else float("inf")
+
+
+def tune(
+    *,
+    manager_options: Dict[str, Any],
+    logger: logging.Logger,
+    clip_paths: Sequence[str] = (),
+    repeats: int = 3,
+    exhaustive: bool = False,
+) -> Path:
+    """Run the tuner and save the fastest settings next to the model directory."""
+    clips = [load_wav(Path(path)) for path in clip_paths] if clip_paths else synthetic_clips()
+    total = sum(clip.size for clip in clips) / 16_000
+    logger.info("Tuning on %s clip(s), %.1fs of audio, %s timed pass(es) each", len(clips), total, repeats)
+    tuner = SessionTuner(manager_options=manager_options, logger=logger, clips=clips, repeats=repeats)
+    best = tuner.run(exhaustive=exhaustive)
+    slowest = max(tuner.results, key=_latency)
+    path = save_profile(Path(manager_options["model_dir"]), best)
+    logger.info(
+        "Fastest: %s (%.1f ms per pass; slowest tried: %.1f ms)", best.describe(), best.latency_ms, slowest.latency_ms
+    )
+    logger.info("Saved tuning profile to %s; Chirp will use it on the next start.", path)
+    return path
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import abc
+import ctypes
+import os
+import sys
+import time
+from typing import Callable, List, Optional
+
+MIB = 1024 * 1024
+# Uses needed before time-of-day rates influence the timeout.
+MIN_USAGE_SAMPLES = 20
+
+
+def process_rss() -> Optional[int]:
+    """Resident set size of this process in bytes, or None if unknown."""
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/self/statm", "rb") as handle:
+                return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            return None
+    if sys.platform == "win32":
+        return _windows_rss()
+    return None
+
+
+def available_memory() -> Optional[int]:
+    """Memory the OS can hand out without swapping, in bytes, or None if unknown."""
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/meminfo", "rb") as handle:
+                for line in handle:
+                    if line.startswith(b"MemAvailable:"):
+                        return int(line.split()[1]) * 1024
+        except (OSError, ValueError, IndexError):
+            return None
+        return None
+    if sys.platform == "win32":
+        return _windows_available()
+    return None
+
+
+def _windows_rss() -> Optional[int]:  # pragma: no cover - Windows only
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ("cb", ctypes.c_uint32),
+            ("PageFaultCount", ctypes.c_uint32),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    process = ctypes.windll.kernel32.GetCurrentProcess()
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+        return None
+    return int(counters.WorkingSetSize)
+
+
+def _windows_available() -> Optional[int]:  # pragma: no cover - Windows only
+    class MemoryStatusEx(ctypes.Structure):
+        _fields_ = [
+            ("dwLength", ctypes.c_uint32),
+            ("dwMemoryLoad", ctypes.c_uint32),
+            ("ullTotalPhys", ctypes.c_uint64),
+            ("ullAvailPhys", ctypes.c_uint64),
+            ("ullTotalPageFile", ctypes.c_uint64),
+            ("ullAvailPageFile", ctypes.c_uint64),
+            ("ullTotalVirtual", ctypes.c_uint64),
+            ("ullAvailVirtual", ctypes.c_uint64),
+            ("ullAvailExtendedVirtual", ctypes.c_uint64),
+        ]
+
+    status = MemoryStatusEx()
+    status.dwLength = ctypes.sizeof(status)
+    if not ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+        return None
+    return int(status.ullAvailPhys)
+
+
+class UsageStats:
+    """Counts transcriptions per local hour of day."""
+
+    def __init__(self) -> None:
+        self._hours: List[int] = [0] * 24
+
+    def record(self, timestamp: float) -> None:
+        self._hours[time.localtime(timestamp).tm_hour] += 1
+
+    def weight(self, timestamp: float) -> float:
+        """How busy this hour is relative to an average hour, clamped to [0.5, 2].
+
+        Returns 1.0 until enough uses have been seen to say anything.
+        """
+        total = sum(self._hours)
+        if total < MIN_USAGE_SAMPLES:
+            return 1.0
+        relative = self._hours[time.localtime(timestamp).tm_hour] * 24 / total
+        return min(2.0, max(0.5, relative))
+
+
+class UnloadPolicy(abc.ABC):
+    """Decides when an idle model should be unloaded.
+
+    ``unload_at`` returns the wall-clock time at which the model should go, or
+    None to keep it loaded. The monitor sleeps until that deadline; policies
+    whose answer depends on more than ``last_access`` (such as free memory)
+    set ``recheck_interval`` so the monitor also wakes to re-evaluate.
+    """
+
+    recheck_interval: Optional[float] = None
+
+    @property
+    def enabled(self) -> bool:
+        return True
+
+    def record_use(self, timestamp: float) -> None:
+        pass
+
+    @abc.abstractmethod
+    def unload_at(self, last_access: float, now: float) -> Optional[float]:
+        """Deadline for unloading given the last use, or None to stay loaded."""
+
+
+class IdleTimeoutPolicy(UnloadPolicy):
+    """Unload after a fixed idle period; ``timeout <= 0`` never unloads."""
+
+    def __init__(self, timeout: float) -> None:
+        self._timeout = timeout
+
+    @property
+    def enabled(self) -> bool:
+        return self._timeout > 0
+
+    def unload_at(self, last_access: float, now: float) -> Optional[float]:
+        if self._timeout <= 0:
+            return None
+        return last_access + self._timeout
+
+
+class MemoryAwarePolicy(UnloadPolicy):
+    """Scale the idle timeout by memory headroom and how busy the hour usually is.
+
+    With at least ``high_water`` bytes available the model stays loaded. Below
+    ``low_water``, or when the process holds more than is still available, it
+    is freed after ``grace`` seconds. In between the timeout scales linearly
+    from a quarter to twice ``timeout``, then by the time-of-day usage weight.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: float,
+        low_water: int,
+        high_water: int,
+        grace: float = 30.0,
+        recheck_interval: float = 30.0,
+        usage: Optional[UsageStats] = None,
+        rss_probe: Callable[[], Optional[int]] = process_rss,
+        available_probe: Callable[[], Optional[int]] = available_memory,
+    ) -> None:
+        self._timeout = timeout
+        self._low_water = low_water
+        self._high_water = max(high_water, low_water + 1)
+        self._grace = grace
+        self.recheck_interval = recheck_interval
+        self._usage = usage or UsageStats()
+        self._rss_probe = rss_probe
+        self._available_probe = available_probe
+
+    @property
+    def enabled(self) -> bool:
+        return self._timeout > 0
+
+    def record_use(self, timestamp: float) -> None:
+        self._usage.record(timestamp)
+
+    def unload_at(self, last_access: float, now: float) -> Optional[float]:
+        if self._timeout <= 0:
+            return None
+        available = self._available_probe()
+        if available is None:
+            return last_access + self._timeout
+        if available >= self._high_water:
+            return None
+        rss = self._rss_probe() or 0
+        if available < self._low_water or rss > available:
+            return last_access + min(self._grace, self._timeout)
+        headroom = (available - self._low_water) / (self._high_water - self._low_water)
+        timeout = self._timeout * (0.25 + 1.75 * headroom) * self._usage.weight(now)
+        return last_access + max(self._grace, timeout)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from .pcm import full_scale
+
+FRAMES_PER_PASS = 4_096
+
+
+@dataclass(slots=True)
+class TrimResult:
+    audio: np.ndarray
+    removed_samples: int
+
+    @property
+    def is_silent(self) -> bool:
+        return self.audio.size == 0
+
+
+def speech_frames(
+    audio: np.ndarray,
+    *,
+    frame_length: int,
+    threshold: float,
+    zcr_threshold: float = 0.25,
+) -> np.ndarray:
+    """Classify fixed-size frames as speech using energy and zero-crossing rate.
+
+    A frame is speech when its RMS reaches ``threshold`` (relative to full scale,
+    so the same value works for float and integer PCM), or when it reaches half
+    of it with a high zero-crossing rate (unvoiced consonants such as "s" or "f"
+    are quiet but noisy). A trailing partial frame is classified on its own.
+    """
+    samples = audio.reshape(-1)
+    full = samples.size // frame_length
+    flags = np.empty(-(-samples.size // frame_length), dtype=bool)
+    # Work through the signal in slices so temporaries stay small even for
+    # memory-mapped multi-hour recordings.
+    for start in range(0, full, FRAMES_PER_PASS):
+        stop = min(full, start + FRAMES_PER_PASS)
+        frames = samples[start * frame_length : stop * frame_length].reshape(-1, frame_length)
+        flags[start:stop] = _classify(frames, threshold, zcr_threshold)
+    if flags.size > full:
+        flags[full] = _classify(samples[full * frame_length :].reshape(1, -1), threshold, zcr_threshold)[0]
+    return flags
+
+
+def _classify(frames: np.ndarray, threshold: float, zcr_threshold: float) -> np.ndarray:
+    length = frames.shape[1]
+    rms = np.sqrt(np.einsum("ij,ij->i", frames, frames, dtype=np.float64) / length)
+    rms /= full_scale(frames.dtype)
+    crossings = np.count_nonzero(np.diff(np.signbit(frames), axis=1), axis=1) / length
+    return (rms >= threshold) | ((rms >= threshold / 2) & (crossings >= zcr_threshold))
+
+
+def trim_silence(
+    audio: np.ndarray,
+    *,
+    sample_rate: int = 16_000,
+    threshold: float = 0.01,
+    frame_ms: float = 20.0,
+    padding_ms: float = 200.0,
+) -> TrimResult:
+    """Drop leading and trailing non-speech, keeping ``padding_ms`` around speech.
+
+    Returns a view into ``audio``; an empty result means no speech was found.
+    """
+    samples = audio.reshape(-1)
+    if not samples.size:
+        return TrimResult(samples, 0)
+    frame_length = max(1, int(sample_rate * frame_ms / 1000))
+    voiced = np.flatnonzero(speech_frames(samples, frame_length=frame_length, threshold=threshold))
+    if not voiced.size:
+        return TrimResult(samples[:0], samples.size)
+    padding = int(sample_rate * padding_ms / 1000)
+    start = max(0, int(voiced[0]) * frame_length - padding)
+    end = min(samples.size, (int(voiced[-1]) + 1) * frame_length + padding)
+    trimmed = samples[start:end]
+    return TrimResult(trimmed, samples.size - trimmed.size)
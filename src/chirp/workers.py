@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, Optional, Tuple
+
+from .logger import get_logger
+from .parakeet_manager import ParakeetManager
+
+_manager: Optional[ParakeetManager] = None
+
+
+def resolve_workers(workers: int) -> Tuple[int, int]:
+    """Return ``(processes, intra_op_threads)`` for a worker count (0 = auto).
+
+    Auto uses half the cores, capped at four: every worker holds its own copy
+    of the model. Threads are split so processes x threads ~= cores.
+    """
+    cores = os.cpu_count() or 1
+    processes = workers if workers > 0 else max(1, min(4, cores // 2))
+    return processes, max(1, cores // processes)
+
+
+def init_worker(options: Dict[str, Any]) -> None:
+    """Process-pool initializer: load one ParakeetManager per worker process."""
+    global _manager
+    _manager = ParakeetManager(logger=get_logger(), **options)
+
+
+def worker_manager() -> ParakeetManager:
+    assert _manager is not None, "worker not initialized"
+    return _manager
@@ -0,0 +1,59 @@
+import logging
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import onnxruntime as ort
+
+from chirp.arena import SHRINK_RUN_ENTRY, USE_ENV_ALLOCATORS, ShrinkingSession, install_arena_shrink
+from chirp.parakeet_manager import ParakeetManager
+
+
+def _session(*inputs):
+    session = MagicMock(spec=ort.InferenceSession)
+    session.get_inputs.return_value = [SimpleNamespace(name=name) for name in inputs]
+    return session
+
+
+class TestArenaShrink(unittest.TestCase):
+    def test_run_adds_shrink_option(self):
+        inner = _session("audio_signal", "length")
+        ShrinkingSession(inner).run(["outputs"], {"audio_signal": 1})
+
+        run_options = inner.run.call_args.args[2]
+        self.assertEqual(run_options.get_run_config_entry(SHRINK_RUN_ENTRY), "cpu:0")
+
+    def test_only_audio_sessions_are_wrapped(self):
+        encoder, decoder = _session("audio_signal", "length"), _session("encoder_outputs", "targets")
+        asr = SimpleNamespace(_encoder=encoder, _decoder_joint=decoder, config={})
+        model = SimpleNamespace(asr=asr)
+
+        self.assertEqual(install_arena_shrink(model), 1)
+        self.assertIsInstance(asr._encoder, ShrinkingSession)
+        self.assertIs(asr._decoder_joint, decoder)
+        # Attribute access still reaches the real session.
+        self.assertEqual(asr._encoder.get_inputs()[0].name, "audio_signal")
+
+    @patch("chirp.parakeet_manager.onnx_asr")
+    def test_manager_opts_sessions_into_env_allocator(self, mock_onnx):
+        encoder = _session("audio_signal", "length")
+        mock_onnx.load_model.return_value = SimpleNamespace(asr=SimpleNamespace(_encoder=encoder))
+        manager = ParakeetManager(
+            model_name="test",
+            quantization=None,
+            provider_key="cpu",
+            threads=1,
+            logger=MagicMock(spec=logging.Logger),
+            model_dir=Path("/tmp/dummy_model_dir"),
+            timeout=0,
+            shrink_arena=True,
+        )
+
+        options = mock_onnx.load_model.call_args.kwargs["sess_options"]
+        self.assertEqual(options.get_session_config_entry(USE_ENV_ALLOCATORS), "1")
+        self.assertIsInstance(manager._model.asr._encoder, ShrinkingSession)
+
+
+if __name__ == "__main__":
+    unittest.main()
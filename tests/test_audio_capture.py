@@ -0,0 +1,451 @@
+import sys
+import threading
+import time
+import types
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+# sounddevice needs the PortAudio shared library at import time, which is not
+# available in every test environment; the tests patch it per case anyway.
+try:
+    import sounddevice  # noqa: F401
+except (ImportError, OSError):
+    mock_sd = types.ModuleType("sounddevice")
+    mock_sd.InputStream = MagicMock()
+    sys.modules["sounddevice"] = mock_sd
+
+from chirp.audio_capture import (
+    AudioCapture,
+    CaptureBuffer,
+    PauseSegmenter,
+    PreRollBuffer,
+    SilenceEndpointer,
+)
+
+
+class TestCaptureBuffer(unittest.TestCase):
+    def test_append_and_view(self):
+        buffer = CaptureBuffer(channels=1, dtype="float32", reserve_frames=8, chunk_frames=8)
+        buffer.append(np.ones((3, 1), dtype=np.float32))
+        buffer.append(np.full((2, 1), 2.0, dtype=np.float32))
+
+        self.assertEqual(len(buffer), 5)
+        np.testing.assert_array_equal(buffer.view().reshape(-1), [1, 1, 1, 2, 2])
+
+    def test_long_reservation_starts_at_one_chunk(self):
+        buffer = CaptureBuffer(channels=1, dtype="float32", reserve_frames=7200 * 16_000, chunk_frames=16_000)
+        self.assertEqual([chunk.shape[0] for chunk in buffer._chunks], [16_000])
+        buffer.append(np.ones((16_001, 1), dtype=np.float32))
+        self.assertEqual([chunk.shape[0] for chunk in buffer._chunks], [16_000, 16_000])
+        self.assertEqual(len(buffer), 16_001)
+
+    def test_grows_in_chunks_without_moving_data(self):
+        buffer = CaptureBuffer(channels=1, dtype="float32", reserve_frames=4, chunk_frames=10)
+        buffer.append(np.arange(4, dtype=np.float32).reshape(-1, 1))
+        first_chunk = buffer._chunks[0]
+        old_view = buffer.frames(0, 4)
+
+        buffer.append(np.arange(4, 9, dtype=np.float32).reshape(-1, 1))
+
+        self.assertEqual(len(buffer), 9)
+        self.assertEqual([chunk.shape[0] for chunk in buffer._chunks], [4, 10])
+        self.assertIs(buffer._chunks[0], first_chunk)
+        self.assertTrue(np.shares_memory(old_view, first_chunk))
+        np.testing.assert_array_equal(buffer.view().reshape(-1), np.arange(9))
+        np.testing.assert_array_equal(buffer.view(3).reshape(-1), np.arange(3, 9))
+
+    def test_frames_across_chunks(self):
+        buffer = CaptureBuffer(channels=1, dtype="int16", reserve_frames=3, chunk_frames=3)
+        buffer.append(np.arange(10, dtype=np.int16).reshape(-1, 1))
+        self.assertTrue(np.shares_memory(buffer.frames(3, 5), buffer._chunks[1]))
+        np.testing.assert_array_equal(buffer.frames(2, 8).reshape(-1), np.arange(2, 8))
+        self.assertEqual(buffer.frames(6, 6).shape, (0, 1))
+
+    def test_spills_to_memmap_past_threshold(self):
+        # 4 bytes per frame; the threshold allows 8 frames in RAM.
+        buffer = CaptureBuffer(
+            channels=1, dtype="float32", reserve_frames=20, chunk_frames=4, spill_bytes=32
+        )
+        buffer.append(np.arange(6, dtype=np.float32).reshape(-1, 1))
+        self.assertFalse(buffer.spilled)
+        early_view = buffer.frames(0, 4)
+
+        buffer.append(np.arange(6, 12, dtype=np.float32).reshape(-1, 1))
+        self.assertTrue(buffer.spilled)
+        deadline = time.monotonic() + 5
+        while buffer._written < 2 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        # Completed chunks are replaced by maps of the file; the current one stays in RAM.
+        self.assertIsInstance(buffer._chunks[0], np.memmap)
+        self.assertIsInstance(buffer._chunks[1], np.memmap)
+        self.assertNotIsInstance(buffer._chunks[2], np.memmap)
+
+        buffer.append(np.arange(12, 30, dtype=np.float32).reshape(-1, 1))
+        np.testing.assert_array_equal(buffer.frames(2, 14).reshape(-1), np.arange(2, 14))
+        audio = buffer.view()
+        self.assertIsInstance(audio, np.memmap)
+        np.testing.assert_array_equal(audio.reshape(-1), np.arange(30))
+        np.testing.assert_array_equal(buffer.view(25).reshape(-1), np.arange(25, 30))
+        np.testing.assert_array_equal(early_view.reshape(-1), np.arange(4))
+
+    def test_spill_writes_stay_off_the_callback(self):
+        buffer = CaptureBuffer(channels=1, dtype="float32", reserve_frames=4, chunk_frames=4, spill_bytes=32)
+        release = threading.Event()
+        spill_chunk = buffer._spill_chunk
+
+        def slow_disk(index):
+            release.wait(5)
+            spill_chunk(index)
+
+        with patch.object(buffer, "_spill_chunk", side_effect=slow_disk):
+            started = time.perf_counter()
+            for start in range(0, 40, 2):
+                buffer.append(np.arange(start, start + 2, dtype=np.float32).reshape(-1, 1))
+            elapsed = time.perf_counter() - started
+            self.assertTrue(buffer.spilled)
+            # Nothing reached the disk yet, but appends past the threshold returned at once.
+            self.assertLess(elapsed, 1.0)
+            self.assertEqual(buffer._written, 0)
+            release.set()
+            audio = buffer.view()
+
+        self.assertIsInstance(audio, np.memmap)
+        np.testing.assert_array_equal(audio.reshape(-1), np.arange(40))
+
+    def test_failed_spill_keeps_audio_in_ram(self):
+        buffer = CaptureBuffer(channels=1, dtype="float32", reserve_frames=4, chunk_frames=4, spill_bytes=16)
+        with patch("chirp.audio_capture.tempfile.TemporaryFile", side_effect=OSError("disk full")):
+            buffer.append(np.arange(20, dtype=np.float32).reshape(-1, 1))
+            audio = buffer.view()
+        self.assertNotIsInstance(audio, np.memmap)
+        np.testing.assert_array_equal(audio.reshape(-1), np.arange(20))
+
+    def test_spill_disabled_by_default(self):
+        buffer = CaptureBuffer(channels=1, dtype="int16", reserve_frames=2, chunk_frames=2)
+        buffer.append(np.zeros((10, 1), dtype=np.int16))
+        self.assertFalse(buffer.spilled)
+
+
+class TestPauseSegmenter(unittest.TestCase):
+    def _feed(self, segmenter, buffer, level, blocks, block_frames=100):
+        for _ in range(blocks):
+            block = np.full((block_frames, 1), level, dtype=np.float32)
+            buffer.append(block)
+            segmenter.feed(buffer, block_frames, level)
+
+    def test_emits_segment_at_pause(self):
+        segments = []
+        buffer = CaptureBuffer(channels=1, dtype="float32", reserve_frames=10_000, chunk_frames=1000)
+        segmenter = PauseSegmenter(
+            threshold=0.01, pause_frames=400, min_segment_frames=300, on_segment=segments.append
+        )
+
+        self._feed(segmenter, buffer, 0.5, 5)  # speech
+        self._feed(segmenter, buffer, 0.0, 4)  # pause long enough to cut
+        self._feed(segmenter, buffer, 0.5, 3)  # next phrase
+
+        self.assertEqual(len(segments), 1)
+        # Cut lands in the middle of the 400-frame pause.
+        self.assertEqual(segments[0].shape, (700,))
+        self.assertEqual(segments[0].ndim, 1)
+
+    def test_silence_without_speech_is_not_emitted(self):
+        segments = []
+        buffer = CaptureBuffer(channels=1, dtype="float32", reserve_frames=10_000, chunk_frames=1000)
+        segmenter = PauseSegmenter(
+            threshold=0.01, pause_frames=200, min_segment_frames=100, on_segment=segments.append
+        )
+
+        self._feed(segmenter, buffer, 0.0, 20)
+
+        self.assertEqual(segments, [])
+
+    def test_short_segments_are_held_back(self):
+        segments = []
+        buffer = CaptureBuffer(channels=1, dtype="float32", reserve_frames=10_000, chunk_frames=1000)
+        segmenter = PauseSegmenter(
+            threshold=0.01, pause_frames=200, min_segment_frames=5_000, on_segment=segments.append
+        )
+
+        self._feed(segmenter, buffer, 0.5, 2)
+        self._feed(segmenter, buffer, 0.0, 3)
+
+        self.assertEqual(segments, [])
+
+
+class TestSilenceEndpointer(unittest.TestCase):
+    def test_fires_once_after_trailing_silence(self):
+        on_endpoint = MagicMock()
+        endpointer = SilenceEndpointer(threshold=0.01, silence_frames=300, on_endpoint=on_endpoint)
+
+        for level in (0.0, 0.0, 0.0, 0.0):  # leading silence never ends the recording
+            endpointer.feed(100, level)
+        on_endpoint.assert_not_called()
+
+        endpointer.feed(100, 0.2)
+        endpointer.feed(100, 0.0)
+        endpointer.feed(100, 0.0)
+        on_endpoint.assert_not_called()
+        endpointer.feed(100, 0.0)
+        endpointer.feed(100, 0.0)
+
+        on_endpoint.assert_called_once()
+
+    def test_speech_resets_silence_run(self):
+        on_endpoint = MagicMock()
+        endpointer = SilenceEndpointer(threshold=0.01, silence_frames=300, on_endpoint=on_endpoint)
+
+        for level in (0.2, 0.0, 0.0, 0.2, 0.0, 0.0):
+            endpointer.feed(100, level)
+
+        on_endpoint.assert_not_called()
+
+
+class TestPreRollBuffer(unittest.TestCase):
+    def test_keeps_most_recent_frames_in_order(self):
+        pre_roll = PreRollBuffer(channels=1, dtype="float32", frames=5)
+        pre_roll.append(np.arange(3, dtype=np.float32).reshape(-1, 1))
+        np.testing.assert_array_equal(pre_roll.snapshot().reshape(-1), [0, 1, 2])
+
+        pre_roll.append(np.arange(3, 7, dtype=np.float32).reshape(-1, 1))
+        np.testing.assert_array_equal(pre_roll.snapshot().reshape(-1), [2, 3, 4, 5, 6])
+
+    def test_block_larger_than_capacity(self):
+        pre_roll = PreRollBuffer(channels=1, dtype="float32", frames=4)
+        pre_roll.append(np.arange(10, dtype=np.float32).reshape(-1, 1))
+        np.testing.assert_array_equal(pre_roll.snapshot().reshape(-1), [6, 7, 8, 9])
+
+
+class TestAudioCapture(unittest.TestCase):
+    @patch("chirp.audio_capture.sd")
+    def test_stop_returns_zero_copy_view(self, mock_sd):
+        capture = AudioCapture(reserve_seconds=1.0)
+        capture.start()
+        callback = mock_sd.InputStream.call_args.kwargs["callback"]
+        for value in (0.1, 0.2, 0.3):
+            callback(np.full((160, 1), value, dtype=np.float32), 160, None, None)
+
+        audio = capture.stop()
+
+        self.assertEqual(audio.shape, (480,))
+        self.assertEqual(audio.dtype, np.float32)
+        self.assertIsNotNone(audio.base)  # a view, not a concatenated copy
+        np.testing.assert_allclose(audio[::160], [0.1, 0.2, 0.3])
+        mock_sd.InputStream.return_value.close.assert_called_once()
+
+    @patch("chirp.audio_capture.sd")
+    def test_each_recording_gets_fresh_buffer(self, mock_sd):
+        capture = AudioCapture(reserve_seconds=1.0)
+        capture.start()
+        callback = mock_sd.InputStream.call_args.kwargs["callback"]
+        callback(np.ones((10, 1), dtype=np.float32), 10, None, None)
+        first = capture.stop()
+
+        capture.start()
+        callback = mock_sd.InputStream.call_args.kwargs["callback"]
+        callback(np.zeros((10, 1), dtype=np.float32), 10, None, None)
+        capture.stop()
+
+        np.testing.assert_array_equal(first, np.ones(10, dtype=np.float32))
+
+    @patch("chirp.audio_capture.sd")
+    def test_segment_callback_receives_pauses(self, mock_sd):
+        segments = []
+        capture = AudioCapture(
+            sample_rate=1_000,
+            target_rate=1_000,
+            segment_pause=0.2,
+            min_segment_seconds=0.1,
+            segment_callback=segments.append,
+        )
+        capture.start()
+        callback = mock_sd.InputStream.call_args.kwargs["callback"]
+        for level in (0.5, 0.5, 0.0, 0.0, 0.0, 0.5):
+            callback(np.full((100, 1), level, dtype=np.float32), 100, None, None)
+        audio = capture.stop()
+
+        self.assertEqual(len(segments), 1)
+        self.assertEqual(audio.size, 600)
+        np.testing.assert_array_equal(segments[0], audio[: segments[0].size])
+
+    @patch("chirp.audio_capture.sd")
+    def test_segments_are_emitted_as_captured(self, mock_sd):
+        segments = []
+        capture = AudioCapture(
+            sample_rate=2_000,
+            target_rate=1_000,
+            dtype="int16",
+            segment_pause=0.2,
+            min_segment_seconds=0.1,
+            segment_callback=segments.append,
+        )
+        capture.start()
+        callback = mock_sd.InputStream.call_args.kwargs["callback"]
+        with patch("chirp.audio_capture.resample") as mock_resample:
+            for level in (16_384, 16_384, 0, 0, 0, 0):
+                callback(np.full((200, 1), level, dtype=np.int16), 200, None, None)
+        # Conversion is left to the consumer; the callback only slices the buffer.
+        mock_resample.assert_not_called()
+        capture.stop()
+
+        self.assertEqual(len(segments), 1)
+        self.assertEqual((segments[0].dtype, segments[0].size), (np.int16, 600))
+        converted = capture.to_target_rate(segments[0])
+        self.assertEqual((converted.dtype, converted.size), (np.float32, 300))
+
+    @patch("chirp.audio_capture.sd")
+    def test_stop_tail_skips_streamed_segments(self, mock_sd):
+        segments = []
+        capture = AudioCapture(
+            sample_rate=1_000,
+            target_rate=1_000,
+            segment_pause=0.2,
+            min_segment_seconds=0.1,
+            segment_callback=segments.append,
+        )
+        capture.start()
+        callback = mock_sd.InputStream.call_args.kwargs["callback"]
+        for level in (0.5, 0.5, 0.0, 0.0, 0.0, 0.5):
+            callback(np.full((100, 1), level, dtype=np.float32), 100, None, None)
+        tail = capture.stop(tail=True)
+
+        self.assertEqual(segments[0].size + tail.size, 600)
+
+    @patch("chirp.audio_capture.sd")
+    def test_warm_stop_tail_covers_every_emitted_segment(self, mock_sd):
+        segments = []
+        capture = AudioCapture(
+            sample_rate=1_000,
+            target_rate=1_000,
+            segment_pause=0.2,
+            min_segment_seconds=0.1,
+            segment_callback=segments.append,
+            warm=True,
+            pre_roll_seconds=0,
+        )
+        capture.start()
+        callback = mock_sd.InputStream.call_args.kwargs["callback"]
+        self.assertEqual(capture.stop(tail=True).size, 0)  # no segments: tail is the whole (empty) recording
+        capture.start()
+        for level in (0.5, 0.5, 0.0, 0.0, 0.0, 0.5):
+            callback(np.full((100, 1), level, dtype=np.float32), 100, None, None)
+        tail = capture.stop(tail=True)
+        # The stream keeps running after stop; later blocks must not emit segments for this recording.
+        for level in (0.5, 0.0, 0.0, 0.0):
+            callback(np.full((100, 1), level, dtype=np.float32), 100, None, None)
+
+        self.assertEqual(len(segments), 1)
+        self.assertEqual(segments[0].size + tail.size, 600)
+
+    @patch("chirp.audio_capture.sd")
+    def test_int16_capture_keeps_compact_samples(self, mock_sd):
+        segments = []
+        capture = AudioCapture(
+            sample_rate=1_000,
+            target_rate=1_000,
+            dtype="int16",
+            segment_pause=0.2,
+            min_segment_seconds=0.1,
+            segment_callback=segments.append,
+        )
+        capture.start()
+        self.assertEqual(mock_sd.InputStream.call_args.kwargs["dtype"], "int16")
+        callback = mock_sd.InputStream.call_args.kwargs["callback"]
+        # 0.5 of full scale is speech; the level check must not overflow int16.
+        for level in (16_384, 16_384, 0, 0, 0):
+            callback(np.full((100, 1), level, dtype=np.int16), 100, None, None)
+        audio = capture.stop()
+
+        self.assertEqual(len(segments), 1)
+        self.assertEqual(audio.dtype, np.int16)
+        self.assertEqual(segments[0].dtype, np.int16)
+
+    @patch("chirp.audio_capture.sd")
+    def test_int16_capture_is_scaled_when_resampled(self, mock_sd):
+        capture = AudioCapture(sample_rate=32_000, dtype="int16")
+        capture.start()
+        callback = mock_sd.InputStream.call_args.kwargs["callback"]
+        callback(np.full((3_200, 1), 8_192, dtype=np.int16), 3_200, None, None)
+        audio = capture.stop()
+
+        self.assertEqual(audio.dtype, np.float32)
+        np.testing.assert_allclose(audio[200:-200], 0.25, rtol=1e-4)
+
+    @patch("chirp.audio_capture.sd")
+    def test_native_rate_is_resampled_to_target(self, mock_sd):
+        mock_sd.query_devices.return_value = {"default_samplerate": 48_000.0}
+        capture = AudioCapture(sample_rate=None)
+        self.assertEqual(capture.sample_rate, 48_000)
+
+        capture.start()
+        self.assertEqual(mock_sd.InputStream.call_args.kwargs["samplerate"], 48_000)
+        callback = mock_sd.InputStream.call_args.kwargs["callback"]
+        callback(np.full((4_800, 1), 0.25, dtype=np.float32), 4_800, None, None)
+        audio = capture.stop()
+
+        self.assertEqual(audio.size, 1_600)
+        self.assertEqual(audio.dtype, np.float32)
+        np.testing.assert_allclose(audio[200:-200], 0.25, rtol=1e-4)
+
+    @patch("chirp.audio_capture.sd")
+    def test_endpoint_callback(self, mock_sd):
+        on_endpoint = MagicMock()
+        capture = AudioCapture(
+            sample_rate=1_000, target_rate=1_000, endpoint_silence=0.2, endpoint_callback=on_endpoint
+        )
+        capture.start()
+        callback = mock_sd.InputStream.call_args.kwargs["callback"]
+        for level in (0.5, 0.0, 0.0):
+            callback(np.full((100, 1), level, dtype=np.float32), 100, None, None)
+
+        on_endpoint.assert_called_once()
+        capture.stop()
+
+    @patch("chirp.audio_capture.sd")
+    def test_warm_stream_prepends_pre_roll(self, mock_sd):
+        capture = AudioCapture(sample_rate=1_000, target_rate=1_000, warm=True, pre_roll_seconds=0.2)
+        capture.open()
+        callback = mock_sd.InputStream.call_args.kwargs["callback"]
+        for value in range(5):  # idle audio; only the last 200 frames are kept
+            callback(np.full((100, 1), value, dtype=np.float32), 100, None, None)
+
+        capture.start()
+        callback(np.full((100, 1), 9.0, dtype=np.float32), 100, None, None)
+        audio = capture.stop()
+
+        np.testing.assert_array_equal(audio[::100], [3, 4, 9])
+        # The stream stays open between recordings.
+        mock_sd.InputStream.assert_called_once()
+        mock_sd.InputStream.return_value.stop.assert_not_called()
+
+        callback(np.full((100, 1), 7.0, dtype=np.float32), 100, None, None)
+        capture.start()
+        audio = capture.stop()  # stopped before the callback picked up the recording
+        np.testing.assert_array_equal(audio[::100], [7])
+
+        capture.close()
+        mock_sd.InputStream.return_value.close.assert_called_once()
+
+    @patch("chirp.audio_capture.sd")
+    def test_stop_without_audio(self, mock_sd):
+        capture = AudioCapture()
+        self.assertEqual(capture.stop().size, 0)
+
+        capture.start()
+        self.assertEqual(capture.stop().size, 0)
+
+    @patch("chirp.audio_capture.sd")
+    def test_status_callback(self, mock_sd):
+        status_callback = MagicMock()
+        capture = AudioCapture(status_callback=status_callback)
+        capture.start()
+        callback = mock_sd.InputStream.call_args.kwargs["callback"]
+        callback(np.zeros((4, 1), dtype=np.float32), 4, None, "input overflow")
+        status_callback.assert_called_once_with("input overflow")
+        capture.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
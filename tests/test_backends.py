@@ -0,0 +1,91 @@
+import logging
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from chirp import backends
+from chirp.backends import create_backend, long_audio_transcriber, register_backend
+from chirp.config_manager import ChirpConfig
+from chirp.stt_backend import SttBackend, SyntheticBackend
+
+
+class TestSyntheticBackend(unittest.TestCase):
+    def test_text_is_deterministic_and_scales_with_length(self):
+        backend = SyntheticBackend(latency_ms=0)
+        rng = np.random.default_rng(1)
+        speech = rng.standard_normal(16_000 * 4).astype(np.float32)
+        first = backend.transcribe(speech)
+        self.assertEqual(backend.transcribe(speech.copy()), first)
+        self.assertEqual(len(first.split()), 10)  # 2.5 words per second
+        self.assertNotEqual(backend.transcribe(speech[::-1].copy()), first)
+        self.assertEqual(backend.transcribe(np.zeros(0, dtype=np.float32)), "")
+
+    def test_latency_model(self):
+        backend = SyntheticBackend(latency_ms=20, ms_per_audio_second=10, batch_cost=0.5)
+        clips = [np.zeros(16_000 * 2, dtype=np.float32)] * 3
+        started = time.perf_counter()
+        texts = backend.transcribe_batch(clips)
+        # 20 ms + 10 ms/s * 2 s * (1 + 0.5 * 2) = 60 ms
+        self.assertGreaterEqual(time.perf_counter() - started, 0.06)
+        self.assertEqual(len(texts), 3)
+        self.assertEqual(backend.stats(), {"backend": "synthetic", "calls": 1, "clips": 3, "audio_seconds": 6.0})
+
+    def test_base_requires_transcribe(self):
+        with self.assertRaises(TypeError):
+            SttBackend()
+
+    def test_interface_defaults(self):
+        backend = SyntheticBackend(latency_ms=0)
+        self.assertIs(backend.load().result(timeout=1), backend)
+        backend.warm()
+        backend.unload()
+        self.assertTrue(backend.ready)
+
+
+class TestRegistry(unittest.TestCase):
+    def setUp(self):
+        self.logger = MagicMock(spec=logging.Logger)
+        self.config_manager = MagicMock()
+
+    def test_synthetic_backend_needs_no_model_files(self):
+        config = ChirpConfig(stt_backend="synthetic", synthetic_latency_ms=5, synthetic_ms_per_audio_second=1)
+        backend = create_backend(config, self.config_manager, self.logger)
+        self.assertIsInstance(backend, SyntheticBackend)
+        self.config_manager.model_dir.assert_not_called()
+        self.assertIsNone(long_audio_transcriber(config, self.config_manager, backend, self.logger))
+
+    def test_unknown_backend_lists_available(self):
+        with self.assertRaisesRegex(ValueError, "available: .*parakeet.*synthetic"):
+            create_backend(ChirpConfig(stt_backend="whisper"), self.config_manager, self.logger)
+
+    def test_registered_backend_is_selectable(self):
+        class Engine(SttBackend):
+            def transcribe(self, audio, *, sample_rate=16_000, language=None):
+                return "custom"
+
+        engine = Engine()
+        factory = MagicMock(return_value=engine)
+        with patch.dict(backends._BACKENDS):
+            register_backend("Custom", factory)
+            config = ChirpConfig.from_dict({"stt_backend": "CUSTOM"})
+            self.assertIs(create_backend(config, self.config_manager, self.logger), engine)
+        factory.assert_called_once_with(config, self.config_manager, self.logger)
+
+    @patch("chirp.backends.ParakeetManager")
+    def test_parakeet_backend_loads_in_background(self, manager):
+        config = ChirpConfig(parakeet_quantization="int8", unload_policy="idle")
+        self.config_manager.model_dir.return_value = "models/int8"
+        self.assertIs(create_backend(config, self.config_manager, self.logger), manager.return_value)
+        kwargs = manager.call_args.kwargs
+        self.assertTrue(kwargs["background_load"])
+        self.assertEqual((kwargs["quantization"], kwargs["model_dir"]), ("int8", "models/int8"))
+
+    def test_negative_synthetic_latency_is_rejected(self):
+        with self.assertRaisesRegex(ValueError, "synthetic_latency_ms must be non-negative"):
+            ChirpConfig(synthetic_latency_ms=-1).validate()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import io
+import json
+import logging
+import tempfile
+import unittest
+import wave
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from chirp.batch import BatchTranscriber, collect_wav_files, read_wav
+
+
+def _write_wav(path, samples, sample_rate=16_000, channels=1):
+    with wave.open(str(path), "wb") as handle:
+        handle.setnchannels(channels)
+        handle.setsampwidth(2)
+        handle.setframerate(sample_rate)
+        handle.writeframes(np.asarray(samples, dtype="<i2").tobytes())
+
+
+class TestReadWav(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_mono_int16_is_memory_mapped(self):
+        samples = np.arange(-500, 500, dtype=np.int16)
+        _write_wav(self.root / "a.wav", samples, sample_rate=22_050)
+
+        wav = read_wav(self.root / "a.wav")
+
+        self.assertIsInstance(wav.samples, np.memmap)
+        self.assertEqual(wav.sample_rate, 22_050)
+        np.testing.assert_array_equal(wav.samples, samples)
+        del wav
+
+    def test_stereo_frames_keep_channels(self):
+        samples = np.array([1, 2, 3, 4, 5, 6], dtype=np.int16)
+        _write_wav(self.root / "s.wav", samples, channels=2)
+
+        wav = read_wav(self.root / "s.wav")
+
+        self.assertEqual(wav.samples.shape, (3, 2))
+        self.assertAlmostEqual(wav.duration, 3 / 16_000)
+        del wav
+
+    def test_rejects_non_wave(self):
+        (self.root / "x.wav").write_bytes(b"not a wave file at all")
+        with self.assertRaises(ValueError):
+            read_wav(self.root / "x.wav")
+
+    def test_collects_directories_recursively(self):
+        (self.root / "sub").mkdir()
+        for name in ("b.wav", "sub/a.WAV", "notes.txt"):
+            (self.root / name).write_bytes(b"")
+        files = collect_wav_files([self.root])
+        self.assertEqual([p.name for p in files], ["b.wav", "a.WAV"])
+
+
+class TestBatchTranscriber(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    @patch("chirp.batch.ParakeetManager")
+    def test_duplicates_are_decoded_once_and_output_is_jsonl(self, mock_manager_cls):
+        tone = (np.sin(np.arange(16_000) / 5) * 8_000).astype(np.int16)
+        _write_wav(self.root / "one.wav", tone)
+        _write_wav(self.root / "copy.wav", tone)
+        _write_wav(self.root / "two.wav", tone[::-1])
+        manager = mock_manager_cls.return_value
+        manager.transcribe.side_effect = ["hello world", "second file"]
+        output = io.StringIO()
+
+        transcriber = BatchTranscriber(
+            manager_options={"threads": 0, "timeout": 300},
+            post_process=str.upper,
+            logger=MagicMock(spec=logging.Logger),
+            workers=1,
+        )
+        paths = [self.root / "one.wav", self.root / "copy.wav", self.root / "two.wav"]
+        summary = transcriber.run(paths, output)
+
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(manager.transcribe.call_count, 2)
+        self.assertEqual([r["text"] for r in records], ["HELLO WORLD", "HELLO WORLD", "SECOND FILE"])
+        self.assertEqual(records[1]["duplicate_of"], str(paths[0]))
+        self.assertEqual(records[0]["sha256"], records[1]["sha256"])
+        self.assertAlmostEqual(records[0]["duration"], 1.0)
+        self.assertIn("rtf", records[0])
+        self.assertEqual(summary["unique"], 2)
+        self.assertEqual(summary["failed"], 0)
+        self.assertEqual(mock_manager_cls.call_args.kwargs["timeout"], 0)
+
+    @patch("chirp.batch.ParakeetManager")
+    def test_bad_file_is_reported_and_batch_continues(self, mock_manager_cls):
+        (self.root / "bad.wav").write_bytes(b"garbage" * 10)
+        _write_wav(self.root / "good.wav", np.full(8_000, 5_000, dtype=np.int16), sample_rate=8_000)
+        mock_manager_cls.return_value.transcribe.return_value = "ok"
+        output = io.StringIO()
+
+        transcriber = BatchTranscriber(
+            manager_options={}, post_process=lambda text: text, logger=MagicMock(spec=logging.Logger), workers=1
+        )
+        summary = transcriber.run([self.root / "bad.wav", self.root / "good.wav"], output)
+
+        bad, good = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertIn("error", bad)
+        self.assertEqual(good["text"], "ok")
+        self.assertEqual(summary["failed"], 1)
+        # 8 kHz input is resampled to 16 kHz before decoding.
+        decoded = mock_manager_cls.return_value.transcribe.call_args.args[0]
+        self.assertEqual(decoded.dtype, np.float32)
+        self.assertEqual(decoded.size, 16_000)
+
+    @patch("chirp.batch.ParakeetManager")
+    def test_decoder_error_is_recorded_per_file(self, mock_manager_cls):
+        tone = (np.sin(np.arange(16_000) / 5) * 8_000).astype(np.int16)
+        _write_wav(self.root / "one.wav", tone)
+        _write_wav(self.root / "two.wav", tone[::-1])
+        mock_manager_cls.return_value.transcribe.side_effect = [RuntimeError("onnx failed"), "second file"]
+        output = io.StringIO()
+
+        transcriber = BatchTranscriber(
+            manager_options={}, post_process=lambda text: text, logger=MagicMock(spec=logging.Logger), workers=1
+        )
+        summary = transcriber.run([self.root / "one.wav", self.root / "two.wav"], output)
+
+        first, second = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(first["error"], "onnx failed")
+        self.assertEqual(second["text"], "second file")
+        self.assertEqual(summary["failed"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
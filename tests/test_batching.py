@@ -0,0 +1,124 @@
+import logging
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from chirp.batching import DynamicBatcher
+from chirp.loadgen import LoadReport, run_load
+from chirp.parakeet_manager import ParakeetManager
+
+
+class TestDynamicBatcher(unittest.TestCase):
+    def setUp(self):
+        self.batches = []
+        self.gate = threading.Event()
+
+    def _decode(self, audios, sample_rate, language):
+        self.gate.wait(5)
+        self.batches.append([int(a[0]) for a in audios])
+        return [f"{language}:{int(a[0])}" for a in audios]
+
+    def _batcher(self, **kwargs):
+        batcher = DynamicBatcher(transcribe_batch=self._decode, logger=MagicMock(), **kwargs)
+        self.addCleanup(batcher.close)
+        return batcher
+
+    def test_requests_within_window_share_a_batch(self):
+        batcher = self._batcher(window_ms=200, max_batch=3)
+        self.gate.set()
+        futures = [batcher.submit(client, np.full(10, client, dtype=np.float32)) for client in (1, 2, 3)]
+
+        self.assertEqual([f.result(5) for f in futures], ["None:1", "None:2", "None:3"])
+        self.assertEqual(self.batches, [[1, 2, 3]])
+
+    def test_round_robin_keeps_a_busy_client_from_starving_others(self):
+        batcher = self._batcher(window_ms=50, max_batch=2)
+        # Hold the first batch so the queues fill up behind it.
+        first = batcher.submit(9, np.full(10, 9, dtype=np.float32))
+        busy = [batcher.submit(1, np.full(10, 1, dtype=np.float32)) for _ in range(4)]
+        quiet = batcher.submit(2, np.full(10, 2, dtype=np.float32))
+        self.gate.set()
+        for future in [first, *busy, quiet]:
+            future.result(5)
+
+        # FIFO order would give [9, 1], [1, 1], [1, 2].
+        self.assertIn(2, self.batches[0] + self.batches[1])
+
+    def test_languages_are_not_mixed(self):
+        batcher = self._batcher(window_ms=100, max_batch=4)
+        self.gate.set()
+        en = batcher.submit(1, np.full(10, 1, dtype=np.float32), language="en")
+        de = batcher.submit(2, np.full(10, 2, dtype=np.float32), language="de")
+
+        self.assertEqual((en.result(5), de.result(5)), ("en:1", "de:2"))
+        self.assertEqual(sorted(self.batches), [[1], [2]])
+
+    def test_latency_budget_cuts_the_window_short(self):
+        batcher = self._batcher(window_ms=10_000, max_batch=8, max_latency_ms=50)
+        self.gate.set()
+        future = batcher.submit(1, np.full(10, 1, dtype=np.float32))
+
+        self.assertEqual(future.result(2), "None:1")
+
+    def test_errors_reach_every_request_in_the_batch(self):
+        def fail(audios, sample_rate, language):
+            raise RuntimeError("decoder crashed")
+
+        batcher = DynamicBatcher(transcribe_batch=fail, logger=MagicMock(), window_ms=100, max_batch=2)
+        self.addCleanup(batcher.close)
+        futures = [batcher.submit(c, np.zeros(10, dtype=np.float32)) for c in (1, 2)]
+        for future in futures:
+            with self.assertRaisesRegex(RuntimeError, "decoder crashed"):
+                future.result(5)
+
+
+class TestTranscribeBatch(unittest.TestCase):
+    @patch("chirp.parakeet_manager.onnx_asr")
+    def test_empty_clips_are_skipped(self, mock_onnx):
+        model = mock_onnx.load_model.return_value
+        model.recognize.return_value = ["one", "two"]
+        manager = ParakeetManager(
+            model_name="test",
+            quantization=None,
+            provider_key="cpu",
+            threads=1,
+            logger=MagicMock(spec=logging.Logger),
+            model_dir=Path("/tmp/dummy_model_dir"),
+            timeout=0,
+        )
+        clips = [np.ones(4, dtype=np.float32), np.zeros(0, dtype=np.float32), np.full(4, 100, dtype=np.int16)]
+
+        self.assertEqual(manager.transcribe_batch(clips), ["one", "", "two"])
+        batch = model.recognize.call_args.args[0]
+        self.assertEqual(len(batch), 2)
+        self.assertEqual(batch[1].dtype, np.float32)
+
+
+class TestLoadReport(unittest.TestCase):
+    def test_percentiles_and_throughput(self):
+        report = LoadReport("on", 100, 0, 4.0, [float(v) for v in range(1, 101)])
+        self.assertEqual(report.throughput, 25.0)
+        self.assertAlmostEqual(report.percentile(50), 50.5)
+        self.assertAlmostEqual(report.percentile(99), 99.01)
+
+    def test_run_load_without_daemon_reports_errors_instead_of_hanging(self):
+        logger = MagicMock(spec=logging.Logger)
+        with patch("chirp.loadgen.DaemonClient.connect", side_effect=[MagicMock(), None]):
+            report = run_load(
+                "/nonexistent/chirp.sock",
+                label="off",
+                clients=2,
+                requests=3,
+                clip_seconds=0.1,
+                think_ms=0,
+                logger=logger,
+            )
+        self.assertEqual((report.requests, report.errors), (0, 3))
+        logger.warning.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
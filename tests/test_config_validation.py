@@ -74,6 +74,68 @@ class TestConfigValidation(unittest.TestCase):
             conf = ChirpConfig(audio_feedback_volume=vol)
             conf.validate()  # Should not raise
 
+    def test_validate_silence_threshold_out_of_range(self):
+        """silence_threshold outside 0.0-1.0 should fail validation."""
+        conf = ChirpConfig(silence_threshold=1.5)
+        with self.assertRaisesRegex(ValueError, "silence_threshold must be between 0.0 and 1.0"):
+            conf.validate()
+
+    def test_validate_auto_stop_silence_negative(self):
+        """Negative auto_stop_silence should fail validation."""
+        conf = ChirpConfig(auto_stop_silence=-1.0)
+        with self.assertRaisesRegex(ValueError, "auto_stop_silence must be non-negative"):
+            conf.validate()
+
+    def test_validate_capture_dtype_invalid(self):
+        """Unsupported capture_dtype should fail validation."""
+        conf = ChirpConfig.from_dict({"capture_dtype": "INT8"})
+        self.assertEqual(conf.capture_dtype, "int8")
+        with self.assertRaisesRegex(ValueError, "capture_dtype must be 'float32' or 'int16'"):
+            conf.validate()
+
+    def test_validate_spill_threshold_negative(self):
+        """Negative spill_threshold_mb should fail validation."""
+        conf = ChirpConfig(spill_threshold_mb=-1)
+        with self.assertRaisesRegex(ValueError, "spill_threshold_mb must be non-negative"):
+            conf.validate()
+
+    def test_validate_pre_roll_out_of_range(self):
+        """pre_roll outside 0-5 seconds should fail validation."""
+        conf = ChirpConfig(pre_roll=10.0)
+        with self.assertRaisesRegex(ValueError, "pre_roll must be between"):
+            conf.validate()
+
+    def test_validate_segment_pause_non_positive(self):
+        """Non-positive segment_pause should fail validation."""
+        conf = ChirpConfig(segment_pause=0)
+        with self.assertRaisesRegex(ValueError, "segment_pause must be positive"):
+            conf.validate()
+
+    def test_validate_unload_policy_invalid(self):
+        """Unknown unload_policy should fail validation."""
+        conf = ChirpConfig.from_dict({"unload_policy": "Sometimes"})
+        with self.assertRaisesRegex(ValueError, "unload_policy must be 'idle' or 'adaptive'"):
+            conf.validate()
+
+    def test_validate_queue_overflow_invalid(self):
+        """Unknown queue_overflow should fail validation; the value is case-insensitive."""
+        self.assertEqual(ChirpConfig.from_dict({"queue_overflow": "DROP"}).queue_overflow, "drop")
+        conf = ChirpConfig.from_dict({"queue_overflow": "newest"})
+        with self.assertRaisesRegex(ValueError, "queue_overflow must be 'merge' or 'drop'"):
+            conf.validate()
+
+    def test_validate_unload_memory_marks_inverted(self):
+        """unload_low_memory_mb must stay below unload_high_memory_mb."""
+        conf = ChirpConfig(unload_low_memory_mb=4096, unload_high_memory_mb=2048)
+        with self.assertRaisesRegex(ValueError, "unload_low_memory_mb must be non-negative and less than"):
+            conf.validate()
+
+    def test_validate_latency_log_path_missing_directory(self):
+        """latency_log_path must point into an existing directory."""
+        conf = ChirpConfig(latency_log_path="/nonexistent-chirp-dir/latency.jsonl")
+        with self.assertRaisesRegex(ValueError, "latency_log_path directory does not exist"):
+            conf.validate()
+
     def test_valid_default_config(self):
         """Default config should pass validation."""
         conf = ChirpConfig()
@@ -0,0 +1,106 @@
+import logging
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from chirp.daemon import DaemonClient, InferenceServer, _secure_directory, default_address, key_path
+
+
+class FakeManager:
+    ready = True
+
+    def __init__(self):
+        self.prefetched = 0
+
+    def prefetch(self):
+        self.prefetched += 1
+
+    def stats(self):
+        return {"backend": "fake", "prefetched": self.prefetched}
+
+    def transcribe(self, audio, *, sample_rate=16_000, language=None):
+        if audio.size and audio[0] < 0:
+            raise ValueError("negative audio")
+        return f"{audio.dtype} {audio.shape[0]} {float(audio.sum()):.1f} {language}"
+
+
+@unittest.skipIf(sys.platform == "win32", "Unix socket transport")
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        # Client and server share this process's resource tracker; keep the client's registration.
+        tracker = patch("chirp.daemon.resource_tracker")
+        tracker.start()
+        self.addCleanup(tracker.stop)
+        self.address = os.path.join(self._tmp.name, "chirp.sock")
+        self.logger = MagicMock(spec=logging.Logger)
+        self.manager = FakeManager()
+        self.server = InferenceServer(manager=self.manager, logger=self.logger, address=self.address)
+        self.server.start()
+        self.client = DaemonClient.connect(self.address, logger=self.logger)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.close()
+        self._tmp.cleanup()
+
+    def test_audio_round_trips_through_shared_memory(self):
+        self.assertTrue(self.client.load().result(timeout=5))
+        text = self.client.transcribe(np.ones(16_000, dtype=np.float32), language="en")
+        self.assertEqual(text, "float32 16000 16000.0 en")
+        # Smaller recordings reuse the block; int16 audio is sent as-is.
+        self.assertEqual(self.client.transcribe(np.full(10, 3, dtype=np.int16)), "int16 10 30.0 None")
+        self.client.prefetch()
+        self.assertEqual(self.manager.prefetched, 1)
+        self.assertEqual(self.client.stats()["server"], {"backend": "fake", "prefetched": 1})
+
+    def test_server_errors_are_raised_in_client(self):
+        with self.assertRaisesRegex(RuntimeError, "negative audio"):
+            self.client.transcribe(np.full(4, -1.0, dtype=np.float32))
+        self.assertEqual(self.client.transcribe(np.zeros(4, dtype=np.float32)), "float32 4 0.0 None")
+
+    def test_key_is_private_and_second_daemon_is_refused(self):
+        self.assertEqual(os.stat(key_path(self.address)).st_mode & 0o777, 0o600)
+        with self.assertRaisesRegex(RuntimeError, "already listening"):
+            InferenceServer(manager=self.manager, logger=self.logger, address=self.address).start()
+
+    def test_client_reconnects_after_daemon_restart(self):
+        self.server.close()
+        self.server = InferenceServer(manager=self.manager, logger=self.logger, address=self.address)
+        self.server.start()
+        self.assertEqual(self.client.transcribe(np.zeros(2, dtype=np.float32)), "float32 2 0.0 None")
+
+    def test_client_refuses_key_owned_by_another_user(self):
+        with patch("chirp.daemon.os.getuid", return_value=os.getuid() + 1):
+            self.assertIsNone(DaemonClient.connect(self.address, logger=self.logger))
+            with self.assertRaisesRegex(PermissionError, "owned by another user"):
+                InferenceServer(manager=self.manager, logger=self.logger, address=self.address).start()
+        self.logger.warning.assert_called()
+
+    def test_socket_directory_must_be_private(self):
+        shared = Path(self._tmp.name) / "shared"
+        shared.mkdir(mode=0o777)
+        os.chmod(shared, 0o777)
+        with self.assertRaisesRegex(PermissionError, "writable by other users"):
+            _secure_directory(shared)
+        fresh = Path(self._tmp.name) / "fresh" / "run"
+        _secure_directory(fresh)
+        self.assertEqual(os.stat(fresh).st_mode & 0o777, 0o700)
+
+    def test_default_address_without_runtime_dir_is_in_private_directory(self):
+        with patch.dict(os.environ, {"XDG_RUNTIME_DIR": ""}):
+            address = default_address()
+        self.assertEqual(Path(address).parent.name, f"chirp-{os.getuid()}")
+
+    def test_connect_returns_none_without_daemon(self):
+        address = str(Path(self._tmp.name) / "missing.sock")
+        self.assertIsNone(DaemonClient.connect(address, logger=self.logger))
+
+
+if __name__ == "__main__":
+    unittest.main()
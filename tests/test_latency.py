@@ -0,0 +1,82 @@
+import json
+import logging
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from chirp.latency import Histogram, LatencyTracker, activate, span
+
+
+class TestHistogram(unittest.TestCase):
+    def test_percentiles_stay_within_one_percent(self):
+        values = np.random.default_rng(0).lognormal(mean=4, sigma=1.5, size=5000)
+        histogram = Histogram()
+        for value in values:
+            histogram.record(float(value))
+        for q in (50, 95, 99):
+            exact = float(np.percentile(values, q, method="inverted_cdf"))
+            self.assertAlmostEqual(histogram.percentile(q), exact, delta=exact * 0.01 + 0.001)
+        self.assertEqual(histogram.percentile(100), histogram.max_ms)
+        self.assertEqual(histogram.count, 5000)
+
+    def test_empty_and_small_values(self):
+        histogram = Histogram()
+        self.assertEqual(histogram.percentile(50), 0.0)
+        histogram.record(0.05)
+        self.assertAlmostEqual(histogram.percentile(50), 0.05)
+
+
+class TestLatencyTracker(unittest.TestCase):
+    def test_span_is_a_no_op_without_active_trace(self):
+        with span("recognize"):
+            pass  # must not raise
+        tracker = LatencyTracker(logger=MagicMock(), summary_interval=0)
+        trace = tracker.start()
+        with activate(trace):
+            with span("recognize"):
+                pass
+        with span("paste"):
+            pass
+        self.assertEqual([s.stage for s in trace.spans], ["recognize"])
+
+    def test_finished_traces_feed_histograms_sink_and_summary(self):
+        logger = MagicMock(spec=logging.Logger)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "latency.jsonl"
+            tracker = LatencyTracker(logger=logger, summary_interval=0, sink_path=path)
+            for _ in range(2):
+                trace = tracker.start(at=10.0)
+                trace.add("stop_hotkey", 10.0, 10.001)
+                trace.mark_stop(12.0)
+                trace.add("recognize", 12.1, 12.3)
+                tracker.record(trace, finished=12.5)
+            logger.info.assert_not_called()  # summaries only on close when the interval is 0
+            tracker.close()
+            lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+        self.assertEqual(tracker.histograms["recognize"].count, 2)
+        self.assertAlmostEqual(tracker.histograms["stop_to_paste"].percentile(50), 500, delta=5)
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[1]["dictation"], 2)
+        self.assertEqual(lines[0]["stop_to_paste_ms"], 500.0)
+        self.assertEqual(lines[0]["spans"][1], {"stage": "recognize", "start_ms": 2100.0, "ms": 200.0})
+        rows = [call.args[1] for call in logger.info.call_args_list if len(call.args) > 2]
+        self.assertEqual(rows[1:], ["stop_hotkey", "recognize", "stop_to_paste"])
+
+    def test_periodic_summary(self):
+        logger = MagicMock(spec=logging.Logger)
+        tracker = LatencyTracker(logger=logger, summary_interval=1e-9)
+        trace = tracker.start()
+        trace.add("paste", 0.0, 0.1)
+        trace.finish()
+        self.assertTrue(logger.info.called)
+        logger.reset_mock()
+        tracker.close()  # nothing new since the last summary
+        logger.info.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
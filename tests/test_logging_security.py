@@ -20,7 +20,7 @@ if sys.platform == "win32" and "winsound" not in sys.modules:
 from chirp.main import ChirpApp
 
 class TestLoggingSecurity(unittest.TestCase):
-    @patch("chirp.main.ParakeetManager")
+    @patch("chirp.backends.ParakeetManager")
     @patch("chirp.main.AudioCapture")
     @patch("chirp.main.AudioFeedback")
     @patch("chirp.main.KeyboardShortcutManager")
@@ -29,6 +29,7 @@ class TestLoggingSecurity(unittest.TestCase):
         """Verify that sensitive transcription text is NOT logged at INFO level."""
         # Setup mocks
         mock_config_instance = mock_config.return_value
+        mock_config_instance.load.return_value.stt_backend = "parakeet"
         mock_config_instance.load.return_value.parakeet_model = "test-model"
         mock_config_instance.load.return_value.parakeet_quantization = None
         mock_config_instance.load.return_value.onnx_providers = "cpu"
@@ -44,6 +45,14 @@ class TestLoggingSecurity(unittest.TestCase):
         mock_config_instance.load.return_value.start_sound_path = None
         mock_config_instance.load.return_value.stop_sound_path = None
         mock_config_instance.load.return_value.model_timeout = 300.0
+        mock_config_instance.load.return_value.vad_trim = False
+        mock_config_instance.load.return_value.long_audio_threshold = 0
+        mock_config_instance.load.return_value.max_queue_backlog = 0
+        mock_config_instance.load.return_value.use_daemon = False
+        mock_config_instance.load.return_value.tiered_models = False
+        mock_config_instance.load.return_value.queue_overflow = "merge"
+        mock_config_instance.load.return_value.latency_summary_interval = 0
+        mock_config_instance.load.return_value.latency_log_path = None
         mock_config_instance.model_dir.return_value = "models/test-model"
 
         # Capture logs
@@ -61,12 +70,13 @@ class TestLoggingSecurity(unittest.TestCase):
 
         # Simulate transcription
         sensitive_text = "My secret password is hunter2"
-        app.parakeet.transcribe.return_value = sensitive_text
+        app.stt.transcribe.return_value = sensitive_text
 
         # Simulate stop recording which triggers transcribe
         import numpy as np
         waveform = np.zeros(16000)
-        app._transcribe_and_inject(waveform)
+        app._queue.submit(waveform)
+        app._queue.close()
 
         # Check logs
         log_contents = log_capture.getvalue()
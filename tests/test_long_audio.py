@@ -0,0 +1,93 @@
+import logging
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from chirp.long_audio import Chunk, ChunkedTranscriber, merge_texts, plan_chunks
+
+
+def _speech(seconds, sample_rate=1_000):
+    return np.full(int(seconds * sample_rate), 0.3, dtype=np.float32)
+
+
+def _silence(seconds, sample_rate=1_000):
+    return np.zeros(int(seconds * sample_rate), dtype=np.float32)
+
+
+class TestPlanChunks(unittest.TestCase):
+    def test_short_audio_is_one_chunk(self):
+        chunks = plan_chunks(_speech(10), sample_rate=1_000, chunk_seconds=30)
+        self.assertEqual(chunks, [Chunk(0, 10_000, False)])
+
+    def test_cuts_at_silence_without_overlap(self):
+        audio = np.concatenate([_speech(25), _silence(1), _speech(20)])
+        chunks = plan_chunks(audio, sample_rate=1_000, chunk_seconds=30, search_seconds=8)
+
+        self.assertEqual(len(chunks), 2)
+        first, second = chunks
+        self.assertTrue(25_000 <= first.end <= 26_000)
+        self.assertEqual(second.start, first.end)
+        self.assertFalse(second.overlaps_previous)
+        self.assertEqual(second.end, audio.size)
+
+    def test_overlaps_when_no_silence(self):
+        chunks = plan_chunks(_speech(70), sample_rate=1_000, chunk_seconds=30, overlap_seconds=1)
+
+        self.assertEqual([(c.start, c.end) for c in chunks], [(0, 30_000), (29_000, 59_000), (58_000, 70_000)])
+        self.assertEqual([c.overlaps_previous for c in chunks], [False, True, True])
+
+
+class TestMergeTexts(unittest.TestCase):
+    def test_plain_join(self):
+        self.assertEqual(merge_texts([("hello there", False), ("general kenobi", False)]), "hello there general kenobi")
+
+    def test_overlap_duplicates_removed(self):
+        merged = merge_texts([("we should meet on Tuesday", False), ("on tuesday, at noon", True)])
+        self.assertEqual(merged, "we should meet on Tuesday at noon")
+
+    def test_clipped_edge_words_are_ignored(self):
+        merged = merge_texts([("the quick brown fo", False), ("ick brown fox jumps", True)])
+        self.assertEqual(merged, "the quick brown fox jumps")
+
+    def test_no_match_keeps_everything(self):
+        self.assertEqual(merge_texts([("alpha beta", False), ("gamma delta", True)]), "alpha beta gamma delta")
+
+
+class TestChunkedTranscriber(unittest.TestCase):
+    def test_single_worker_decodes_in_process(self):
+        fallback = MagicMock()
+        fallback.transcribe.side_effect = ["first part", "second part"]
+        transcriber = ChunkedTranscriber(
+            manager_options={},
+            fallback=fallback,
+            logger=MagicMock(spec=logging.Logger),
+            workers=1,
+            chunk_seconds=30,
+        )
+        audio = np.concatenate([_speech(25, 16_000), _silence(1, 16_000), _speech(20, 16_000)])
+        audio = (audio * 32767).astype(np.int16)
+
+        with patch("chirp.long_audio.concurrent.futures.ProcessPoolExecutor") as mock_pool:
+            text = transcriber.transcribe(audio, sample_rate=16_000)
+
+        mock_pool.assert_not_called()
+        self.assertEqual(text, "first part second part")
+        self.assertEqual(fallback.transcribe.call_count, 2)
+        # Chunks are passed through in the capture dtype; conversion happens per chunk.
+        self.assertEqual(fallback.transcribe.call_args_list[0].args[0].dtype, np.int16)
+
+    def test_worker_threads_split_cores(self):
+        with patch("chirp.workers.os.cpu_count", return_value=8):
+            transcriber = ChunkedTranscriber(
+                manager_options={"threads": 0, "timeout": 300},
+                fallback=MagicMock(),
+                logger=MagicMock(spec=logging.Logger),
+                workers=0,
+            )
+        self.assertEqual(transcriber._workers, 4)
+        self.assertEqual(transcriber._manager_options, {"threads": 2, "timeout": 0, "warmup_seconds": ()})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from chirp.model_cache import MANIFEST, OptimizedModelCache, model_files
+from chirp.parakeet_manager import DISABLE_PREPACKING, ParakeetManager
+
+
+def _fake_session(path, sess_options=None, providers=None):
+    # ORT writes the optimized graph while creating the session.
+    Path(sess_options.optimized_model_filepath).write_bytes(b"optimized:" + Path(path).read_bytes())
+    return MagicMock()
+
+
+class TestOptimizedModelCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.model_dir = Path(self._tmp.name) / "parakeet-int8"
+        self.model_dir.mkdir()
+        for name in ("encoder-model.int8.onnx", "decoder_joint-model.int8.onnx", "encoder-model.onnx", "nemo128.onnx"):
+            (self.model_dir / name).write_bytes(name.encode())
+        (self.model_dir / "config.json").write_text("{}")
+        (self.model_dir / "vocab.txt").write_text("a\nb\n")
+        self.cache = OptimizedModelCache(self.model_dir, quantization="int8", logger=MagicMock())
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _build(self, level=99):
+        import onnxruntime as ort
+
+        with patch("chirp.model_cache.ort.InferenceSession", side_effect=_fake_session):
+            return self.cache.build(level, ort.SessionOptions, ["CPUExecutionProvider"])
+
+    def test_model_files_follow_quantization(self):
+        self.assertEqual(
+            [p.name for p in model_files(self.model_dir, "int8")],
+            ["decoder_joint-model.int8.onnx", "encoder-model.int8.onnx"],
+        )
+        self.assertEqual([p.name for p in model_files(self.model_dir, None)], ["encoder-model.onnx", "nemo128.onnx"])
+
+    def test_build_then_lookup(self):
+        self.assertIsNone(self.cache.lookup(99))
+        entry = self._build()
+
+        self.assertEqual(self.cache.lookup(99), entry)
+        self.assertEqual(entry.parent.name, "parakeet-int8.ort-cache")
+        self.assertTrue((entry / MANIFEST).is_file())
+        self.assertEqual((entry / "encoder-model.int8.onnx").read_bytes(), b"optimized:encoder-model.int8.onnx")
+        self.assertEqual((entry / "vocab.txt").read_text(), "a\nb\n")
+        self.assertIsNone(self.cache.lookup(1))  # other optimization level
+
+    def test_changed_model_invalidates_and_prunes(self):
+        old = self._build()
+        (self.model_dir / "encoder-model.int8.onnx").write_bytes(b"retrained weights")
+
+        self.assertIsNone(self.cache.lookup(99))
+        new = self._build()
+        self.assertNotEqual(old, new)
+        self.assertFalse(old.exists())
+
+    @patch("chirp.parakeet_manager.onnx_asr")
+    def test_mmap_weights_disables_prepacking_and_flags_embedded_weights(self, mock_onnx):
+        logger = MagicMock()
+        ParakeetManager(
+            model_name="test",
+            quantization="int8",
+            provider_key="cpu",
+            threads=1,
+            logger=logger,
+            model_dir=self.model_dir,
+            timeout=0,
+            mmap_weights=True,
+        )
+
+        options = mock_onnx.load_model.call_args.kwargs["sess_options"]
+        self.assertEqual(options.get_session_config_entry(DISABLE_PREPACKING), "1")
+        self.assertIn("memory-mapped", logger.info.call_args.args[0])
+
+        logger.reset_mock()
+        (self.model_dir / "encoder-model.int8.onnx.data").write_bytes(b"weights")
+        ParakeetManager(
+            model_name="test",
+            quantization="int8",
+            provider_key="cpu",
+            threads=1,
+            logger=logger,
+            model_dir=self.model_dir,
+            timeout=0,
+            mmap_weights=True,
+        )
+        self.assertFalse(any("memory-mapped" in call.args[0] for call in logger.info.call_args_list))
+
+    @patch("chirp.parakeet_manager.onnx_asr")
+    def test_manager_reports_cold_then_warm_load(self, mock_onnx):
+        logger = MagicMock()
+        options = dict(
+            model_name="test",
+            quantization="int8",
+            provider_key="cpu",
+            threads=1,
+            logger=logger,
+            model_dir=self.model_dir,
+            timeout=0,
+            optimized_cache=True,
+        )
+        with patch("chirp.model_cache.ort.InferenceSession", side_effect=_fake_session) as session:
+            ParakeetManager(**options)
+            self.assertEqual(session.call_count, 2)
+            ParakeetManager(**options)
+            self.assertEqual(session.call_count, 2)
+
+        entry = self.cache.lookup(99)
+        self.assertEqual(mock_onnx.load_model.call_args.kwargs["path"], str(entry))
+        messages = [c.args[1] for c in logger.debug.call_args_list if c.args[0].startswith("Parakeet model %s")]
+        self.assertEqual(messages, ["optimized and cached (cold)", "loaded from optimized cache (warm)"])
+
+    @patch("chirp.parakeet_manager.onnx_asr")
+    def test_unusable_cache_falls_back_and_is_discarded(self, mock_onnx):
+        entry = self._build()
+        mock_onnx.load_model.side_effect = [RuntimeError("corrupt"), MagicMock()]
+
+        ParakeetManager(
+            model_name="test",
+            quantization="int8",
+            provider_key="cpu",
+            threads=1,
+            logger=MagicMock(),
+            model_dir=self.model_dir,
+            timeout=0,
+            optimized_cache=True,
+        )
+
+        self.assertFalse(entry.exists())
+        self.assertEqual(mock_onnx.load_model.call_args.kwargs["path"], str(self.model_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
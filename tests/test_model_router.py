@@ -0,0 +1,90 @@
+import logging
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from chirp.model_router import ACCURATE, FAST, ModelTier, TieredModelRouter
+from chirp.parakeet_manager import ModelNotPreparedError
+
+
+class FakeManager:
+    def __init__(self, *, logger, quantization, model_dir, background_load, **options):
+        self.quantization = quantization
+        self.options = options
+        self.ready = True
+        self.unloaded = 0
+
+    def transcribe(self, audio, *, sample_rate=16_000, language=None):
+        return self.quantization or "fp32"
+
+    def unload(self):
+        self.unloaded += 1
+
+    def close(self):
+        pass
+
+
+TIERS = [ModelTier(FAST, "int8", Path("/m/int8")), ModelTier(ACCURATE, None, Path("/m/fp32"))]
+
+
+def _router(factory=FakeManager, **kwargs):
+    kwargs.setdefault("threshold_seconds", 5.0)
+    return TieredModelRouter(
+        tiers=TIERS,
+        manager_options={"threads": 2},
+        logger=MagicMock(spec=logging.Logger),
+        manager_factory=factory,
+        **kwargs,
+    )
+
+
+def _seconds(value):
+    return np.zeros(int(value * 16_000), dtype=np.float32)
+
+
+class TestTieredModelRouter(unittest.TestCase):
+    def test_routes_by_length_and_shares_threads(self):
+        router = _router()
+        self.assertEqual(router.transcribe(_seconds(2)), "int8")
+        self.assertEqual(router.transcribe(_seconds(12)), "fp32")
+        self.assertEqual((router.tier_stats[FAST].requests, router.tier_stats[ACCURATE].requests), (1, 1))
+        self.assertTrue(all(m.options["shared_threads"] for m in router._managers.values()))
+
+    def test_every_tier_loads_at_startup_when_all_fit(self):
+        router = _router()
+        self.assertEqual(set(router._managers), {FAST, ACCURATE})
+        self.assertEqual(list(router._resident), [ACCURATE, FAST])
+        self.assertEqual(list(_router(max_resident=1)._managers), [FAST])
+
+    def test_latency_budget_sends_long_clips_to_fast_tier(self):
+        router = _router(threshold_seconds=3.0, latency_budget_ms=500)
+        self.assertEqual(router.route(_seconds(6).size), ACCURATE)  # not measured yet
+        router.tier_stats[ACCURATE].record(audio_seconds=10.0, decode_seconds=1.0)  # 100 ms per second of audio
+
+        self.assertEqual(router.route(_seconds(4).size), ACCURATE)  # ~400 ms fits the budget
+        self.assertEqual(router.route(_seconds(6).size), FAST)  # ~600 ms does not
+
+    def test_lru_unloads_least_recently_used_tier(self):
+        router = _router(max_resident=1)
+        fast = router._managers[FAST]
+        router.transcribe(_seconds(12))
+
+        self.assertEqual(fast.unloaded, 1)
+        self.assertEqual(list(router._resident), [ACCURATE])
+
+    def test_missing_accurate_model_falls_back_to_fast(self):
+        def factory(**kwargs):
+            if kwargs["quantization"] is None:
+                raise ModelNotPreparedError("missing")
+            return FakeManager(**kwargs)
+
+        router = _router(factory)
+        self.assertEqual(router.transcribe(_seconds(12)), "int8")
+        self.assertEqual(router.route(_seconds(12).size), FAST)
+        self.assertEqual(router.tier_stats[FAST].requests, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
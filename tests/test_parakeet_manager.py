@@ -1,3 +1,5 @@
+import tempfile
+import threading
 import time
 import unittest
 from pathlib import Path
@@ -5,7 +7,7 @@ from unittest.mock import MagicMock, patch
 
 import numpy as np
 
-from chirp.parakeet_manager import ParakeetManager
+from chirp.parakeet_manager import ModelNotPreparedError, ParakeetManager
 
 
 class TestParakeetManager(unittest.TestCase):
@@ -88,6 +90,28 @@ class TestParakeetManager(unittest.TestCase):
         manager._stop_monitor.set()
         time.sleep(0.05)
 
+    @patch("chirp.parakeet_manager.onnx_asr")
+    def test_transcribe_scales_int16_input(self, mock_onnx):
+        """int16 capture is converted to float32 in [-1, 1) before recognition."""
+        mock_model_instance = MagicMock()
+        mock_model_instance.recognize.return_value = "hi"
+        mock_onnx.load_model.return_value = mock_model_instance
+
+        manager = ParakeetManager(
+            model_name="test",
+            quantization=None,
+            provider_key="cpu",
+            threads=1,
+            logger=self.logger,
+            model_dir=self.model_dir,
+            timeout=0,
+        )
+        manager.transcribe(np.array([16384, -32768], dtype=np.int16))
+
+        waveform = mock_model_instance.recognize.call_args.args[0]
+        self.assertEqual(waveform.dtype, np.float32)
+        np.testing.assert_allclose(waveform, [0.5, -1.0])
+
     @patch("chirp.parakeet_manager.onnx_asr")
     def test_timeout_zero_disables_monitor(self, mock_onnx):
         """Test that timeout=0 disables the monitor thread."""
@@ -107,6 +131,169 @@ class TestParakeetManager(unittest.TestCase):
         self.assertIsNone(manager._monitor_thread)
         self.assertIsNotNone(manager._model)
 
+    @patch("chirp.parakeet_manager.onnx_asr")
+    def test_background_load_defers_transcribe_until_ready(self, mock_onnx):
+        """A background load returns at once; transcribe blocks on the load future."""
+        release = threading.Event()
+        mock_model_instance = MagicMock()
+        mock_model_instance.recognize.return_value = "ready"
+
+        def slow_load(*args, **kwargs):
+            release.wait(5)
+            return mock_model_instance
+
+        mock_onnx.load_model.side_effect = slow_load
+        with tempfile.TemporaryDirectory() as tmp:
+            model_dir = Path(tmp)
+            (model_dir / "config.json").write_text("{}")
+            (model_dir / "encoder-model.onnx").write_bytes(b"")
+
+            manager = ParakeetManager(
+                model_name="test",
+                quantization=None,
+                provider_key="cpu",
+                threads=1,
+                logger=self.logger,
+                model_dir=model_dir,
+                timeout=0,
+                background_load=True,
+            )
+            self.assertFalse(manager.ready)
+
+            results = []
+            worker = threading.Thread(target=lambda: results.append(manager.transcribe(np.ones(160, np.float32))))
+            worker.start()
+            time.sleep(0.05)
+            self.assertEqual(results, [])
+
+            release.set()
+            worker.join(timeout=5)
+            self.assertEqual(results, ["ready"])
+            self.assertTrue(manager.ready)
+            self.assertEqual(mock_onnx.load_model.call_count, 1)
+
+    @patch("chirp.parakeet_manager.onnx_asr")
+    @patch("chirp.parakeet_manager.time.time")
+    def test_prefetch_reloads_unloaded_model_and_reports_hidden_time(self, mock_time, mock_onnx):
+        mock_model_instance = MagicMock()
+        mock_model_instance.recognize.return_value = "again"
+        mock_onnx.load_model.return_value = mock_model_instance
+        mock_time.return_value = 1000.0
+        manager = ParakeetManager(
+            model_name="test",
+            quantization=None,
+            provider_key="cpu",
+            threads=1,
+            logger=self.logger,
+            model_dir=self.model_dir,
+            timeout=100.0,
+        )
+        manager._stop_monitor.set()
+
+        manager.prefetch()  # loaded: nothing to do
+        self.assertEqual(mock_onnx.load_model.call_count, 1)
+
+        mock_time.return_value = 1200.0
+        manager._unload_model()
+        manager.prefetch()
+        manager.load_async().result(timeout=5)
+        self.assertEqual(mock_onnx.load_model.call_count, 2)
+
+        self.assertEqual(manager.transcribe(np.ones(160, np.float32)), "again")
+        self.assertEqual(mock_onnx.load_model.call_count, 2)
+        messages = [call.args[0] for call in self.logger.info.call_args_list]
+        self.assertIn("Model reload took %.2fs; %.2fs hidden behind recording, %.2fs waited", messages)
+
+    @patch("chirp.parakeet_manager.onnx_asr")
+    def test_warm_up_runs_after_load_and_first_call_is_reported(self, mock_onnx):
+        mock_model_instance = MagicMock()
+        mock_model_instance.recognize.return_value = "warm"
+        mock_onnx.load_model.return_value = mock_model_instance
+        manager = ParakeetManager(
+            model_name="test",
+            quantization=None,
+            provider_key="cpu",
+            threads=1,
+            logger=self.logger,
+            model_dir=self.model_dir,
+            timeout=0,
+            warmup_seconds=(0.5, 0.25),
+        )
+        deadline = time.monotonic() + 5
+        while not manager._warmed_up and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        warmup_sizes = [c.args[0].size for c in mock_model_instance.recognize.call_args_list]
+        self.assertEqual(warmup_sizes, [8_000, 4_000])
+
+        manager.transcribe(np.ones(160, np.float32))
+        manager.transcribe(np.ones(160, np.float32))
+        first_calls = [
+            c.args for c in self.logger.debug.call_args_list if c.args[0].startswith("First recognize after load")
+        ]
+        self.assertEqual(len(first_calls), 1)
+        self.assertEqual(first_calls[0][-1], "yes")
+
+    @patch("chirp.parakeet_manager.onnx_asr")
+    def test_waiting_transcription_cuts_warm_up_short(self, mock_onnx):
+        in_warm_up = threading.Event()
+        release = threading.Event()
+
+        def recognize(waveform, **kwargs):
+            if waveform.size == 8_000:
+                in_warm_up.set()
+                release.wait(5)
+            return "text"
+
+        mock_onnx.load_model.return_value.recognize.side_effect = recognize
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        model_dir = Path(tmp.name)
+        (model_dir / "config.json").write_text("{}")
+        (model_dir / "encoder-model.onnx").write_bytes(b"")
+        manager = ParakeetManager(
+            model_name="test",
+            quantization=None,
+            provider_key="cpu",
+            threads=1,
+            logger=self.logger,
+            model_dir=model_dir,
+            timeout=0,
+            background_load=True,
+            warmup_seconds=(0.5, 0.25),
+        )
+        self.assertTrue(in_warm_up.wait(5))
+        self.assertFalse(manager.ready)  # not published while warming up
+        result = []
+        caller = threading.Thread(target=lambda: result.append(manager.transcribe(np.ones(160, np.float32))))
+        caller.start()
+        deadline = time.monotonic() + 5
+        while not manager._waiters and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        caller.join(5)
+
+        self.assertEqual(result, ["text"])
+        sizes = [c.args[0].size for c in mock_onnx.load_model.return_value.recognize.call_args_list]
+        self.assertEqual(sizes, [8_000, 160])  # the second warm-up clip was skipped
+        self.assertFalse(manager._warmed_up)
+
+    @patch("chirp.parakeet_manager.onnx_asr")
+    def test_background_load_fails_fast_without_model_files(self, mock_onnx):
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaises(ModelNotPreparedError):
+                ParakeetManager(
+                    model_name="test",
+                    quantization=None,
+                    provider_key="cpu",
+                    threads=1,
+                    logger=self.logger,
+                    model_dir=Path(tmp),
+                    timeout=0,
+                    background_load=True,
+                )
+        mock_onnx.load_model.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
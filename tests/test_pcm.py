@@ -0,0 +1,29 @@
+import unittest
+
+import numpy as np
+
+from chirp.pcm import full_scale, to_float32
+
+
+class TestPcm(unittest.TestCase):
+    def test_full_scale(self):
+        self.assertEqual(full_scale("int16"), 32768.0)
+        self.assertEqual(full_scale(np.int32), 2147483648.0)
+        self.assertEqual(full_scale("float32"), 1.0)
+
+    def test_int16_to_float32(self):
+        audio = np.array([-32768, 0, 16384, 32767], dtype=np.int16)
+        result = to_float32(audio)
+        self.assertEqual(result.dtype, np.float32)
+        np.testing.assert_allclose(result, [-1.0, 0.0, 0.5, 32767 / 32768])
+
+    def test_float32_is_not_copied(self):
+        audio = np.zeros(10, dtype=np.float32)
+        self.assertIs(to_float32(audio), audio)
+
+    def test_float64_is_narrowed(self):
+        self.assertEqual(to_float32(np.zeros(3)).dtype, np.float32)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import logging
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from chirp.config_manager import ConfigManager
+from chirp.quantize import VariantReport, local_quantization, log_comparison, model_size, quantize_model
+
+
+class TestQuantizeModel(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        self.source = root / "parakeet"
+        self.target = root / "parakeet-local-int8"
+        self.source.mkdir()
+        for name in ("encoder-model.onnx", "decoder_joint-model.onnx", "nemo128.onnx", "encoder-model.int8.onnx"):
+            (self.source / name).write_bytes(b"x" * 100)
+        (self.source / "encoder-model.onnx.data").write_bytes(b"x" * 1000)
+        (self.source / "config.json").write_text("{}")
+        (self.source / "vocab.txt").write_text("a\n")
+        self.logger = MagicMock(spec=logging.Logger)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _fake_quantization_module(self):
+        def quantize_dynamic(model_input, model_output, **kwargs):
+            Path(model_output).write_bytes(b"q" * 25)
+
+        module = types.ModuleType("onnxruntime.quantization")
+        module.QuantType = types.SimpleNamespace(QInt8="QInt8")
+        module.quantize_dynamic = MagicMock(side_effect=quantize_dynamic)
+        return module
+
+    def test_writes_loadable_local_variant(self):
+        module = self._fake_quantization_module()
+        with patch.dict(sys.modules, {"onnxruntime.quantization": module}):
+            outputs = quantize_model(
+                self.source, self.target, quantization="local-int8-pc", per_channel=True, logger=self.logger
+            )
+
+        self.assertEqual(
+            sorted(p.name for p in outputs),
+            ["decoder_joint-model.local-int8-pc.onnx", "encoder-model.local-int8-pc.onnx"],
+        )
+        self.assertTrue(all(p.exists() for p in outputs))
+        self.assertTrue((self.target / "vocab.txt").exists())
+        self.assertFalse(self.target.with_name(self.target.name + ".tmp").exists())
+        kwargs = module.quantize_dynamic.call_args.kwargs
+        self.assertTrue(kwargs["per_channel"])
+        self.assertEqual(kwargs["op_types_to_quantize"], ["MatMul", "Gemm"])
+        self.assertEqual(model_size(self.target, "local-int8-pc"), 50)
+        self.assertEqual(model_size(self.source, None), 100 + 1000 + 100 + 100)
+
+    def test_missing_onnx_package_is_reported(self):
+        with patch.dict(sys.modules, {"onnxruntime.quantization": None}):
+            with self.assertRaisesRegex(RuntimeError, "needs the `onnx` package"):
+                quantize_model(self.source, self.target, quantization="local-int8", logger=self.logger)
+
+    def test_local_variants_get_their_own_model_dir(self):
+        manager = ConfigManager()
+        self.assertEqual(local_quantization(per_channel=False), "local-int8")
+        self.assertEqual(manager.model_dir("parakeet", "local-int8").name, "parakeet-local-int8")
+        self.assertEqual(manager.model_dir("parakeet", "int8").name, "parakeet-int8")
+
+    def test_comparison_reports_speedup(self):
+        logger = MagicMock(spec=logging.Logger)
+        log_comparison(
+            [VariantReport("fp32", 2400.0, 5.0, 200.0, ["hi"]), VariantReport("local-int8", 650.0, 2.0, 100.0, ["hi"])],
+            logger,
+        )
+        rows = [c.args for c in logger.info.call_args_list]
+        self.assertEqual(rows[2][-1], 2.0)
+        self.assertEqual(rows[3][2:4], (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+import numpy as np
+
+from chirp.resampler import filter_bank, resample
+
+
+def _sine(frequency, sample_rate, seconds=1.0):
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    return np.sin(2 * np.pi * frequency * t).astype(np.float32)
+
+
+class TestResampler(unittest.TestCase):
+    def test_common_rates_preserve_in_band_tone(self):
+        for rate in (8_000, 22_050, 32_000, 44_100, 48_000):
+            with self.subTest(rate=rate):
+                result = resample(_sine(1_000, rate), rate)
+                self.assertEqual(result.size, 16_000)
+                self.assertEqual(result.dtype, np.float32)
+                expected = _sine(1_000, 16_000)
+                np.testing.assert_allclose(result[500:-500], expected[500:-500], atol=1e-4)
+
+    def test_out_of_band_tone_is_rejected(self):
+        # 10 kHz would alias to 6 kHz without the anti-aliasing filter.
+        result = resample(_sine(10_000, 48_000), 48_000)
+        rms = np.sqrt(np.mean(result[500:-500] ** 2))
+        self.assertLess(rms, 1e-3)
+
+    def test_same_rate_is_passthrough(self):
+        audio = _sine(440, 16_000)
+        self.assertTrue(np.shares_memory(resample(audio, 16_000), audio))
+
+    def test_empty_input(self):
+        self.assertEqual(resample(np.empty(0, dtype=np.float32), 48_000).size, 0)
+
+    def test_output_length_rounds_up(self):
+        self.assertEqual(resample(np.ones(100, dtype=np.float32), 44_100).size, 37)
+
+    def test_filter_bank_is_cached_and_read_only(self):
+        bank = filter_bank(160, 441)
+        self.assertIs(filter_bank(160, 441), bank)
+        self.assertFalse(bank.flags.writeable)
+        np.testing.assert_allclose(bank.sum(axis=1), 1.0, rtol=1e-5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,199 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from chirp.latency import LatencyTracker, span
+from chirp.transcription_queue import TranscriptionQueue
+
+
+def _clip(value, samples=160):
+    return np.full(samples, value, dtype=np.float32)
+
+
+class TestTranscriptionQueue(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.decoding = threading.Event()
+        self.decoded = []
+        self.injected = []
+
+    def _transcribe(self, waveform):
+        # Recordings start at 1.0; blocking on the first one lets a backlog build up.
+        if waveform[0] == 1.0:
+            self.decoding.set()
+            self.release.wait(5)
+        values = sorted({int(v) for v in waveform if v})
+        self.decoded.append(values)
+        return " ".join(f"w{v}" for v in values)
+
+    def _queue(self, **kwargs):
+        kwargs.setdefault("inject", self.injected.append)
+        return TranscriptionQueue(transcribe=self._transcribe, logger=MagicMock(), **kwargs)
+
+    def test_results_are_injected_in_order_with_segments(self):
+        q = self._queue()
+        self.release.set()
+        segment = q.submit_segment(_clip(2))
+        q.submit(_clip(3), [segment])
+        q.submit(_clip(4))
+        q.close()
+
+        self.assertEqual(self.injected, ["w2 w3", "w4"])
+        self.assertEqual(q.stats.completed, 2)
+
+    def test_segment_is_prepared_on_the_decoding_thread(self):
+        threads = []
+
+        def prepare(waveform):
+            threads.append(threading.current_thread().name)
+            return waveform * 2
+
+        q = self._queue()
+        self.release.set()
+        segment = q.submit_segment(_clip(2), prepare=prepare)
+        q.submit(_clip(5), [segment])
+        q.close()
+
+        self.assertEqual(threads, ["Transcriber"])
+        self.assertEqual(self.injected, ["w4 w5"])
+
+    def test_slow_injection_does_not_block_decoding(self):
+        injecting = threading.Event()
+        q = self._queue(inject=lambda text: injecting.wait(5))
+        self.release.set()
+        q.submit(_clip(1))
+        q.submit(_clip(2))
+        for _ in range(500):
+            if len(self.decoded) == 2:
+                break
+            time.sleep(0.01)
+        self.assertEqual(self.decoded, [[1], [2]])
+        injecting.set()
+        q.close()
+
+    def test_cancel_discards_the_recording_being_decoded(self):
+        q = self._queue()
+        q.submit(_clip(1))
+        q.submit(_clip(2))
+        self.decoding.wait(5)
+
+        self.assertTrue(q.cancel_current())
+        self.release.set()
+        q.close()
+
+        self.assertEqual(self.injected, ["w2"])
+        self.assertEqual(q.stats.cancelled, 1)
+
+    def test_merge_policy_decodes_backlog_together(self):
+        q = self._queue(max_backlog=1, overflow="merge")
+        q.submit(_clip(1))
+        self.decoding.wait(5)
+        q.submit(_clip(2))
+        q.submit(_clip(3))
+        self.assertEqual(q.depth, 1)
+        self.release.set()
+        q.close()
+
+        self.assertEqual(self.injected, ["w1", "w2 w3"])
+        self.assertEqual(q.stats.merged, 1)
+
+    def test_merged_int16_recordings_are_scaled_to_float(self):
+        release = threading.Event()
+        seen = []
+
+        def transcribe(waveform):
+            self.decoding.set()
+            release.wait(5)
+            seen.append(waveform)
+            return "ok"
+
+        q = TranscriptionQueue(transcribe=transcribe, inject=self.injected.append, logger=MagicMock(), max_backlog=1)
+        q.submit(np.full(160, 16_000, dtype=np.int16))
+        self.decoding.wait(5)
+        q.submit(np.full(160, 16_000, dtype=np.int16))
+        q.submit(np.full(160, -16_000, dtype=np.int16))
+        release.set()
+        q.close()
+
+        self.assertEqual(seen[0].dtype, np.int16)  # a lone recording is passed through unconverted
+        merged = seen[1]
+        self.assertEqual(merged.dtype, np.float32)
+        self.assertAlmostEqual(float(merged.max()), 16_000 / 32_768, places=4)
+        self.assertAlmostEqual(float(merged.min()), -16_000 / 32_768, places=4)
+
+    def test_merge_keeps_every_recordings_trace(self):
+        tracker = LatencyTracker(logger=MagicMock(), summary_interval=0)
+        q = self._queue(max_backlog=1, overflow="merge")
+        q.submit(_clip(1))
+        self.decoding.wait(5)
+        traces = [tracker.start() for _ in range(2)]
+        q.submit(_clip(2), trace=traces[0])
+        q.submit(_clip(3), trace=traces[1])
+        self.release.set()
+        q.close()
+
+        self.assertEqual(tracker.dictations, 2)
+        for trace in traces:
+            self.assertEqual([s.stage for s in trace.spans], ["queue_wait"])
+        self.assertLess(traces[0].spans[0].start, traces[1].spans[0].start)
+
+    def test_drop_policy_discards_oldest_waiting(self):
+        q = self._queue(max_backlog=1, overflow="drop")
+        q.submit(_clip(1))
+        self.decoding.wait(5)
+        q.submit(_clip(2))
+        q.submit(_clip(3))
+        self.release.set()
+        q.close()
+
+        self.assertEqual(self.injected, ["w1", "w3"])
+        self.assertEqual(q.stats.dropped, 1)
+
+    def test_errors_are_reported_and_queue_continues(self):
+        errors = []
+
+        def transcribe(waveform):
+            if waveform[0] == 5.0:
+                raise RuntimeError("boom")
+            return "ok"
+
+        q = TranscriptionQueue(
+            transcribe=transcribe, inject=self.injected.append, on_error=errors.append, logger=MagicMock()
+        )
+        q.submit(_clip(5))
+        q.submit(_clip(6))
+        q.close()
+
+        self.assertEqual([str(e) for e in errors], ["boom"])
+        self.assertEqual(self.injected, ["ok"])
+        self.assertEqual(q.stats.failed, 1)
+
+    def test_trace_covers_queue_wait_decode_and_injection(self):
+        tracker = LatencyTracker(logger=MagicMock(), summary_interval=0)
+
+        def transcribe(waveform):
+            with span("recognize"):
+                return "" if waveform[0] == 0 else "text"
+
+        def inject(text):
+            with span("paste"):
+                self.injected.append(text)
+
+        q = TranscriptionQueue(transcribe=transcribe, inject=inject, logger=MagicMock())
+        trace = tracker.start()
+        trace.mark_stop()
+        q.submit(_clip(1), trace=trace)
+        # Nothing is pasted for an empty result, so that dictation is not recorded.
+        q.submit(_clip(0), trace=tracker.start())
+        q.close()
+
+        self.assertEqual([s.stage for s in trace.spans], ["queue_wait", "recognize", "paste"])
+        self.assertEqual(tracker.dictations, 1)
+        self.assertEqual(tracker.histograms["stop_to_paste"].count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
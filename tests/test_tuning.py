@@ -0,0 +1,104 @@
+import json
+import logging
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import onnxruntime as ort
+
+from chirp.parakeet_manager import ParakeetManager
+from chirp.session_profile import SessionProfile, load_profile, profile_path, save_profile
+from chirp.tuning import SessionTuner, candidate_profiles, synthetic_clips
+
+
+class TestSessionProfile(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.model_dir = Path(self._tmp.name) / "parakeet"
+        self.logger = MagicMock(spec=logging.Logger)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_round_trip(self):
+        profile = SessionProfile(intra_op_threads=3, spin_wait=False, optimization_level="extended", latency_ms=12.5)
+        path = save_profile(self.model_dir, profile)
+        self.assertEqual(path, profile_path(self.model_dir))
+        self.assertEqual(load_profile(self.model_dir, self.logger), profile)
+
+    def test_profile_from_other_runtime_is_ignored(self):
+        path = save_profile(self.model_dir, SessionProfile(intra_op_threads=3))
+        payload = json.loads(path.read_text())
+        payload["ort_version"] = "0.0.1"
+        path.write_text(json.dumps(payload))
+        self.assertIsNone(load_profile(self.model_dir, self.logger))
+
+    def test_apply_sets_session_options(self):
+        options = ort.SessionOptions()
+        SessionProfile(intra_op_threads=3, execution_mode="parallel", optimization_level="basic").apply(options)
+        self.assertEqual(options.intra_op_num_threads, 3)
+        self.assertEqual(options.execution_mode, ort.ExecutionMode.ORT_PARALLEL)
+        self.assertEqual(options.graph_optimization_level, ort.GraphOptimizationLevel.ORT_ENABLE_BASIC)
+
+    @patch("chirp.parakeet_manager.onnx_asr")
+    def test_manager_uses_saved_profile_unless_threads_set(self, mock_onnx):
+        save_profile(self.model_dir, SessionProfile(intra_op_threads=3, optimization_level="extended"))
+        options = dict(
+            model_name="test",
+            quantization=None,
+            provider_key="cpu",
+            logger=self.logger,
+            model_dir=self.model_dir,
+            timeout=0,
+        )
+
+        tuned = ParakeetManager(threads=0, **options)
+        self.assertEqual(tuned._session_options.intra_op_num_threads, 3)
+        self.assertEqual(tuned._session_options.graph_optimization_level, ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED)
+
+        pinned = ParakeetManager(threads=2, **options)
+        self.assertEqual(pinned._session_options.intra_op_num_threads, 2)
+
+
+class TestSessionTuner(unittest.TestCase):
+    def test_matrix_covers_every_setting(self):
+        profiles = candidate_profiles(4)
+        self.assertEqual(len(profiles), 3 * 2 * 2 * 3)
+        self.assertEqual({p.intra_op_threads for p in profiles}, {1, 2, 4})
+
+    def test_synthetic_clips_are_deterministic(self):
+        first, second = synthetic_clips((1.0,)), synthetic_clips((1.0,))
+        self.assertEqual(first[0].size, 16_000)
+        self.assertTrue((first[0] == second[0]).all())
+
+    @patch("chirp.tuning.os.cpu_count", return_value=4)
+    @patch("chirp.tuning.ParakeetManager")
+    def test_coordinate_search_keeps_fastest(self, mock_manager_cls, _cpu_count):
+        clock = [0.0]
+
+        def build(*, session_profile, **kwargs):
+            manager = MagicMock()
+            # Two threads with spin-wait off is fastest on this pretend machine.
+            cost = abs(session_profile.intra_op_threads - 2) + 1 + (1 if session_profile.spin_wait else 0)
+            manager.transcribe.side_effect = lambda clip: clock.__setitem__(0, clock[0] + cost)
+            return manager
+
+        mock_manager_cls.side_effect = build
+        tuner = SessionTuner(
+            manager_options={"threads": 8, "timeout": 300},
+            logger=MagicMock(spec=logging.Logger),
+            clips=synthetic_clips((0.1,)),
+            repeats=1,
+        )
+        with patch("chirp.tuning.time.perf_counter", side_effect=lambda: clock[0]):
+            best = tuner.run()
+
+        self.assertEqual((best.intra_op_threads, best.spin_wait), (2, False))
+        self.assertIsNotNone(best.latency_ms)
+        self.assertEqual(len(tuner.results), 3 + 4)
+        self.assertIsNone(mock_manager_cls.call_args.kwargs["threads"])
+
+
+if __name__ == "__main__":
+    unittest.main()
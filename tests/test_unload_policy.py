@@ -0,0 +1,92 @@
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from chirp.parakeet_manager import ParakeetManager
+from chirp.unload_policy import IdleTimeoutPolicy, MemoryAwarePolicy, UnloadPolicy, UsageStats
+
+GIB = 1024 ** 3
+
+
+def _policy(available, rss=GIB, usage=None):
+    return MemoryAwarePolicy(
+        timeout=300.0,
+        low_water=1 * GIB,
+        high_water=9 * GIB,
+        grace=30.0,
+        usage=usage,
+        rss_probe=lambda: rss,
+        available_probe=lambda: available,
+    )
+
+
+class TestIdleTimeoutPolicy(unittest.TestCase):
+    def test_deadline_is_last_access_plus_timeout(self):
+        self.assertEqual(IdleTimeoutPolicy(100.0).unload_at(1000.0, 1010.0), 1100.0)
+
+    def test_zero_timeout_never_unloads(self):
+        policy = IdleTimeoutPolicy(0)
+        self.assertFalse(policy.enabled)
+        self.assertIsNone(policy.unload_at(1000.0, 5000.0))
+
+    def test_base_requires_unload_at(self):
+        with self.assertRaises(TypeError):
+            UnloadPolicy()
+
+
+class TestMemoryAwarePolicy(unittest.TestCase):
+    def test_plenty_of_memory_keeps_model_hot(self):
+        self.assertIsNone(_policy(available=16 * GIB).unload_at(1000.0, 1000.0))
+
+    def test_memory_pressure_frees_quickly(self):
+        self.assertEqual(_policy(available=GIB // 2).unload_at(1000.0, 1000.0), 1030.0)
+        # The process holding more than what is left also counts as pressure.
+        self.assertEqual(_policy(available=2 * GIB, rss=3 * GIB).unload_at(1000.0, 1000.0), 1030.0)
+
+    def test_timeout_scales_with_headroom(self):
+        tight = _policy(available=2 * GIB).unload_at(0.0, 0.0)
+        roomy = _policy(available=8 * GIB).unload_at(0.0, 0.0)
+        self.assertLess(tight, 300.0)
+        self.assertGreater(roomy, 300.0)
+
+    def test_unknown_memory_falls_back_to_timeout(self):
+        self.assertEqual(_policy(available=None).unload_at(1000.0, 1000.0), 1300.0)
+
+    def test_busy_hour_keeps_model_longer(self):
+        now = time.time()
+        usage = UsageStats()
+        for _ in range(30):
+            usage.record(now)
+        busy = _policy(available=5 * GIB, usage=usage).unload_at(0.0, now)
+        quiet = _policy(available=5 * GIB, usage=usage).unload_at(0.0, now + 6 * 3600)
+        self.assertGreater(busy, quiet)
+
+
+class _ExpiredPolicy(UnloadPolicy):
+    def unload_at(self, last_access, now):
+        return now - 1
+
+
+class TestEventDrivenMonitor(unittest.TestCase):
+    @patch("chirp.parakeet_manager.onnx_asr")
+    def test_monitor_unloads_at_deadline_without_polling(self, mock_onnx):
+        mock_onnx.load_model.return_value = MagicMock()
+        manager = ParakeetManager(
+            model_name="test",
+            quantization=None,
+            provider_key="cpu",
+            threads=1,
+            logger=MagicMock(),
+            model_dir=Path("/tmp/dummy_model_dir"),
+            unload_policy=_ExpiredPolicy(),
+        )
+        deadline = time.monotonic() + 2
+        while manager.ready and time.monotonic() < deadline:
+            time.sleep(0.01)
+        manager.close()
+        self.assertFalse(manager.ready)
+
+
+if __name__ == "__main__":
+    unittest.main()
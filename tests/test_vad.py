@@ -0,0 +1,58 @@
+import unittest
+
+import numpy as np
+
+from chirp.vad import speech_frames, trim_silence
+
+
+def _tone(seconds, amplitude=0.3, sample_rate=16_000):
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+class TestVad(unittest.TestCase):
+    def test_trims_leading_and_trailing_silence(self):
+        silence = np.zeros(16_000, dtype=np.float32)
+        speech = _tone(0.5)
+        audio = np.concatenate([silence, speech, silence])
+
+        result = trim_silence(audio, padding_ms=100)
+
+        self.assertFalse(result.is_silent)
+        # 0.5 s of speech plus 100 ms padding on each side.
+        self.assertEqual(result.audio.size, 8_000 + 2 * 1_600)
+        self.assertEqual(result.removed_samples, audio.size - result.audio.size)
+        self.assertTrue(np.shares_memory(result.audio, audio))
+
+    def test_silent_clip_is_empty(self):
+        audio = np.zeros(16_000, dtype=np.float32)
+        result = trim_silence(audio)
+
+        self.assertTrue(result.is_silent)
+        self.assertEqual(result.removed_samples, 16_000)
+
+    def test_empty_input(self):
+        result = trim_silence(np.empty(0, dtype=np.float32))
+        self.assertTrue(result.is_silent)
+        self.assertEqual(result.removed_samples, 0)
+
+    def test_speech_to_the_edges_is_kept(self):
+        audio = _tone(0.3)
+        result = trim_silence(audio)
+        self.assertEqual(result.removed_samples, 0)
+
+    def test_quiet_high_zcr_frames_count_as_speech(self):
+        # Alternating-sign noise just above half the threshold mimics fricatives.
+        fricative = np.tile(np.array([0.007, -0.007], dtype=np.float32), 160)
+        hum = np.full(320, 0.007, dtype=np.float32)
+        flags = speech_frames(np.concatenate([fricative, hum]), frame_length=320, threshold=0.01)
+        np.testing.assert_array_equal(flags, [True, False])
+
+    def test_int16_input(self):
+        audio = np.concatenate([np.zeros(8_000), _tone(0.3) * 32767, np.zeros(8_000)]).astype(np.int16)
+        result = trim_silence(audio, threshold=0.01, padding_ms=0)
+        self.assertEqual(result.audio.size, 4_800)
+
+
+if __name__ == "__main__":
+    unittest.main()